@@ -0,0 +1 @@
+"""Off-farm benchmarks for the shared test library."""
@@ -0,0 +1,140 @@
+"""Latency and throughput of the ACS use cases against the in-process ACS.
+
+``get_parameter_values``, ``set_parameter_values`` and
+``is_dut_online_on_acs`` are called the way the tests call them, with
+:class:`lib.tr069.local_acs.LocalACS` as the ACS and
+:class:`lib.tr069.local_acs.SimulatedCPE` as the board, so every RPC runs a
+full CWMP session over localhost (connection request, Inform, RPC, session
+close). Needs boardfarm3 installed, no farm. The benchmark reports
+p50/p95/p99 latency and RPCs/sec per parameter-list size and can compare
+the throughput with a saved baseline to fail CI on regressions::
+
+    python -m benchmarks.bench_acs_rpc --sizes 1 10 100 --json current.json
+    python -m benchmarks.bench_acs_rpc --baseline current.json --tolerance 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from boardfarm3.use_cases.tr069 import (
+    get_parameter_values,
+    is_dut_online_on_acs,
+    set_parameter_values,
+)
+
+from lib.tr069.local_acs import LocalACS, SimulatedCPE
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def _measure(rpc: Callable[[], object], iterations: int) -> dict[str, float]:
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        begin = time.perf_counter()
+        rpc()
+        latencies.append(time.perf_counter() - begin)
+    elapsed = time.perf_counter() - start
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50_ms": cuts[49] * 1e3,
+        "p95_ms": cuts[94] * 1e3,
+        "p99_ms": cuts[98] * 1e3,
+        "rpc_per_s": iterations / elapsed,
+    }
+
+
+def run(sizes: list[int], iterations: int) -> dict[str, dict[str, float]]:
+    """Run the boot Inform, online check, GPV and SPV measurements.
+
+    :param sizes: parameter-list sizes to measure
+    :type sizes: list[int]
+    :param iterations: RPCs per measurement
+    :type iterations: int
+    :return: results keyed by ``<rpc>/<size>``
+    :rtype: dict[str, dict[str, float]]
+    """
+    names = [f"Device.Bench.Param.{idx}.Value" for idx in range(1, max(sizes) + 1)]
+    model: dict[str, str | int | bool] = dict.fromkeys(names, 0)
+    model["Device.DeviceInfo.SoftwareVersion"] = "bench"
+    results = {}
+    with LocalACS() as acs, SimulatedCPE(acs.url, model) as cpe:
+        cpe.boot()
+        cpe_id = cpe.tr69_cpe_id
+
+        def _boot() -> None:
+            since = time.monotonic()
+            cpe.boot()
+            acs.wait_for_inform(cpe_id, since)
+
+        # the simulated CPE stands in for the CPE device of the use cases
+        results["inform/1"] = _measure(_boot, iterations)
+        results["online/1"] = _measure(
+            partial(is_dut_online_on_acs, acs, cpe),  # type: ignore[arg-type]
+            iterations,
+        )
+        for size in sizes:
+            subset = names[:size]
+            values = [{name: size} for name in subset]
+            results[f"gpv/{size}"] = _measure(
+                partial(get_parameter_values, subset, acs, cpe),  # type: ignore[arg-type]
+                iterations,
+            )
+            results[f"spv/{size}"] = _measure(
+                partial(set_parameter_values, values, acs, cpe),  # type: ignore[arg-type]
+                iterations,
+            )
+    return results
+
+
+def _regressions(
+    results: dict[str, dict[str, float]], baseline: Path, tolerance: float
+) -> list[str]:
+    reference = json.loads(baseline.read_text(encoding="utf-8"))
+    return [
+        f"{key}: {res['rpc_per_s']:.1f} RPC/s < {reference[key]['rpc_per_s']:.1f}"
+        for key, res in results.items()
+        if key in reference
+        and res["rpc_per_s"] < reference[key]["rpc_per_s"] * (1 - tolerance)
+    ]
+
+
+def main() -> None:
+    """Run the benchmark, print the results and check the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--json", type=Path, help="save the results to this file")
+    parser.add_argument("--baseline", type=Path, help="results to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.iterations)
+    sys.stdout.write(
+        f"{'rpc/params':>12} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'RPC/s':>8}\n"
+    )
+    for key, res in results.items():
+        sys.stdout.write(
+            f"{key:>12} {res['p50_ms']:>8.2f} {res['p95_ms']:>8.2f}"
+            f" {res['p99_ms']:>8.2f} {res['rpc_per_s']:>8.1f}\n"
+        )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=4), encoding="utf-8")
+    if args.baseline and (
+        failures := _regressions(results, args.baseline, args.tolerance)
+    ):
+        sys.stdout.write("Throughput regressions:\n  " + "\n  ".join(failures) + "\n")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
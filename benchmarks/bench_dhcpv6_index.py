@@ -0,0 +1,209 @@
+"""Compare nested_lookup scans of a DHCPv6 trace with the indexed model.
+
+Builds a synthetic multi-boot capture of relayed Solicit/Advertise/
+Request/Reply exchanges, the CPE under test plus other clients on every
+boot, and runs the queries of the DHCPv6 gateway tests on it: DUID of the
+Solicit and Request, IA_PD of every message and the vendor options of the
+Advertise. ``scan`` re-walks every packet per query like the tests used
+to; ``build`` is the one walk indexing the capture, done once per capture
+and shared by all tests, and ``query`` the same queries on the index::
+
+    python -m benchmarks.bench_dhcpv6_index --boots 10 100 1000 --clients 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from functools import partial
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+
+from nested_lookup import nested_lookup
+
+from lib.dhcpv6 import ADVERTISE, IA_NA, IA_PD, REPLY, REQUEST, SOLICIT, Dhcpv6Index
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+RELAY = "2001:db8::1"
+SERVER = "2001:db8::2"
+ACS_URL = "http://acs_server.boardfarm.com:9675/"
+
+
+def _message(msg_type: int, xid: str, mac: str, client: int) -> dict[str, Any]:
+    return {
+        "dhcpv6.msgtype": str(msg_type),
+        "dhcpv6.xid": xid,
+        "Client Identifier": {
+            "dhcpv6.option.type": "1",
+            "dhcpv6.duid.type": "3",
+            "dhcpv6.duidll.hwtype": "1",
+            "dhcpv6.duidll.link_layer_addr": mac,
+        },
+        "Elapsed time": {"dhcpv6.option.type": "8", "dhcpv6.elapsed_time": "0"},
+        IA_NA: {
+            "dhcpv6.option.type": "3",
+            "dhcpv6.ia_na.iaid": str(client),
+            "IA Address": {"dhcpv6.iaaddr.ip": f"2001:db8:1::{client:x}"},
+        },
+        IA_PD: {
+            "dhcpv6.option.type": "25",
+            "dhcpv6.ia_pd.iaid": str(client),
+            "IA Prefix": {"dhcpv6.iaprefix.pref_addr": f"2001:db8:{client:x}::"},
+        },
+        "Vendor-specific Information": {
+            "dhcpv6.option.type": "17",
+            "dhcpv6.vendoropts.enterprise": "3561",
+            "option": {
+                "dhcpv6.vendoropts.enterprise.option_code": "1",
+                "dhcpv6.vendoropts.enterprise.option_data": ACS_URL.encode().hex(":"),
+            },
+        },
+    }
+
+
+def synthetic_trace(boots: int, clients: int) -> list[SimpleNamespace]:
+    """Build the parsed trace of a capture across several boots.
+
+    Client 0 is the CPE under test, every client does one relayed SARR
+    exchange per boot.
+
+    :param boots: number of boots in the capture
+    :type boots: int
+    :param clients: DHCPv6 clients per boot, including the CPE under test
+    :type clients: int
+    :return: packets shaped like ``parse_dhcpv6_trace`` output
+    :rtype: list[SimpleNamespace]
+    """
+    trace = []
+    for boot in range(boots):
+        for client in range(clients):
+            peer = f"fe80::{client + 1:x}"
+            mac = ":".join(f"{byte:02x}" for byte in (0, 0x10, 0x18, 0, 0, client))
+            xid = f"0x{boot:03x}{client:03x}"
+            for msg_type in (SOLICIT, ADVERTISE, REQUEST, REPLY):
+                relay_type = "12" if msg_type in (SOLICIT, REQUEST) else "13"
+                source, destination = (
+                    (RELAY, SERVER) if relay_type == "12" else (SERVER, RELAY)
+                )
+                packet = {
+                    "dhcpv6.msgtype": relay_type,
+                    "dhcpv6.hopcount": "0",
+                    "dhcpv6.linkaddr": "::",
+                    "dhcpv6.peeraddr": peer,
+                    "Relay Message": {
+                        "dhcpv6.option.type": "9",
+                        "DHCPv6": _message(msg_type, xid, mac, client),
+                    },
+                }
+                trace.append(
+                    SimpleNamespace(
+                        source=SimpleNamespace(ipv6=source),
+                        destination=SimpleNamespace(ipv6=destination),
+                        dhcpv6_packet=packet,
+                        dhcpv6_message_type=int(relay_type),
+                    )
+                )
+    return trace
+
+
+def _scan_queries(trace: list[SimpleNamespace], peer: str) -> int:
+    # one pass per test, as test_dhcp_ipv6_01/02/03 did
+    found = 0
+    for packet in trace:
+        peeraddr = nested_lookup("dhcpv6.peeraddr", packet.dhcpv6_packet)
+        if peeraddr and peeraddr[0] == peer:
+            lookup = nested_lookup("dhcpv6.msgtype", packet.dhcpv6_packet)
+            if lookup[-1] in ["1", "3"]:
+                found += len(nested_lookup("dhcpv6.duid.type", packet.dhcpv6_packet))
+    for packet in trace:
+        if peer in nested_lookup("dhcpv6.peeraddr", packet.dhcpv6_packet):
+            found += len(nested_lookup(IA_PD, packet.dhcpv6_packet))
+    for packet in trace:
+        if peer in nested_lookup(
+            "dhcpv6.peeraddr", packet.dhcpv6_packet
+        ) and nested_lookup("dhcpv6.msgtype", packet.dhcpv6_packet)[-1:] == ["2"]:
+            found += len(
+                nested_lookup("Vendor-specific Information", packet.dhcpv6_packet)
+            )
+    return found
+
+
+def _index_queries(index: Dhcpv6Index, peer: str) -> int:
+    found = sum(
+        message.duid_type is not None
+        for msg_type in (SOLICIT, REQUEST)
+        for message in index.messages(peer, msg_type)
+    )
+    found += sum(len(message.ia_pd) for message in index.exchange(peer))
+    found += sum(
+        len(message.lookup("Vendor-specific Information"))
+        for message in index.messages(peer, ADVERTISE)
+    )
+    return found
+
+
+def _measure(func: Callable[[], object], iterations: int) -> dict[str, float]:
+    timings = []
+    for _ in range(iterations):
+        begin = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - begin)
+    return {"median_ms": statistics.median(timings) * 1e3, "max_ms": max(timings) * 1e3}
+
+
+def run(boots: list[int], clients: int, iterations: int) -> dict[str, dict[str, float]]:
+    """Time the test queries with both approaches.
+
+    :param boots: capture sizes to measure, in boots
+    :type boots: list[int]
+    :param clients: DHCPv6 clients per boot
+    :type clients: int
+    :param iterations: runs per measurement
+    :type iterations: int
+    :return: results keyed by ``<approach>/<boots>``
+    :rtype: dict[str, dict[str, float]]
+    :raises AssertionError: if both approaches do not find the same fields
+    """
+    peer = "fe80::1"
+    results = {}
+    for size in boots:
+        trace = synthetic_trace(size, clients)
+        index = Dhcpv6Index(trace)  # type: ignore[arg-type]
+        if _scan_queries(trace, peer) != _index_queries(index, peer):
+            msg = f"scan and index disagree on {size} boots"
+            raise AssertionError(msg)
+        results[f"scan/{size}"] = _measure(
+            partial(_scan_queries, trace, peer), iterations
+        )
+        results[f"build/{size}"] = _measure(
+            partial(Dhcpv6Index, trace),
+            iterations,  # type: ignore[arg-type]
+        )
+        results[f"query/{size}"] = _measure(
+            partial(_index_queries, index, peer), iterations
+        )
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--boots", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(args.boots, args.clients, args.iterations)
+    sys.stdout.write(f"{'approach/boots':>14} {'median ms':>10} {'max ms':>10}\n")
+    for key, res in results.items():
+        sys.stdout.write(
+            f"{key:>14} {res['median_ms']:>10.2f} {res['max_ms']:>10.2f}\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Compare a list-building GPV parse with the streaming parser.
+
+Reports peak RSS, time to first parameter and total time for a synthetic
+``Device.WiFi.`` subtree of the given sizes. ``list`` and ``stream`` parse
+a GetParameterValuesResponse file at once and incrementally. ``gpv`` and
+``split`` read the subtree from a simulated CPE through the in-process ACS,
+``gpv`` with the one ``get_parameter_values`` call the tests make and
+``split`` with ``iter_parameter_values``, one GPV per child object; these
+two need boardfarm3 installed::
+
+    python -m benchmarks.bench_gpv_stream --params 1000 10000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from xml.etree.ElementTree import parse
+
+from lib.tr069.cwmp import (
+    CWMP_NS,
+    SOAP_ENV_NS,
+    XSI_TYPE,
+    convert_value,
+    iterparse_parameter_values,
+    local_name,
+)
+from lib.tr069.local_acs import LocalACS, SimulatedCPE
+
+MODES = ("list", "stream", "gpv", "split")
+
+
+def _name(idx: int) -> str:
+    radio, ssid = divmod(idx, 64)
+    return f"Device.WiFi.Radio.{radio}.SSID.{ssid}.Stats.BytesSent"
+
+
+def _write_response(fname: Path, params: int) -> None:
+    with fname.open("w", encoding="utf-8") as out:
+        out.write(
+            f'<soap-env:Envelope xmlns:soap-env="{SOAP_ENV_NS}" '
+            f'xmlns:cwmp="{CWMP_NS}" '
+            'xmlns:xsd="http://www.w3.org/2001/XMLSchema" '
+            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+            "<soap-env:Body><cwmp:GetParameterValuesResponse>"
+            f'<ParameterList arrayType="cwmp:ParameterValueStruct[{params}]">'
+        )
+        for idx in range(params):
+            out.write(
+                "<ParameterValueStruct>"
+                f"<Name>{_name(idx)}</Name>"
+                f'<Value xsi:type="xsd:unsignedInt">{idx}</Value>'
+                "</ParameterValueStruct>"
+            )
+        out.write(
+            "</ParameterList></cwmp:GetParameterValuesResponse>"
+            "</soap-env:Body></soap-env:Envelope>"
+        )
+
+
+def _parse_to_list(fname: Path) -> tuple[float, int]:
+    start = time.perf_counter()
+    result = []
+    for elem in parse(fname).getroot().iter():  # noqa: S314
+        if local_name(elem.tag) != "ParameterValueStruct":
+            continue
+        key, value = elem[0], elem[1]
+        data_type = value.get(XSI_TYPE, "xsd:string")
+        result.append(
+            {
+                "key": key.text,
+                "value": convert_value(value.text, data_type),
+                "type": data_type,
+            }
+        )
+    return time.perf_counter() - start, len(result)
+
+
+def _parse_streaming(fname: Path) -> tuple[float, int]:
+    start = time.perf_counter()
+    first = None
+    count = 0
+    with fname.open("rb") as source:
+        for _ in iterparse_parameter_values(source):
+            if first is None:
+                first = time.perf_counter() - start
+            count += 1
+    return first or 0.0, count
+
+
+def _read_from_acs(mode: str, acs: LocalACS, cpe: SimulatedCPE) -> tuple[float, int]:
+    # the ACS modes go through the boardfarm use cases, the file modes run
+    # without boardfarm installed
+    # pylint: disable=import-outside-toplevel
+    from boardfarm3.use_cases.tr069 import get_parameter_values
+
+    from lib.tr069.streaming import iter_parameter_values
+
+    start = time.perf_counter()
+    if mode == "gpv":
+        response = get_parameter_values("Device.WiFi.", acs, cpe)  # type: ignore[arg-type]
+        return time.perf_counter() - start, len(response)
+    first = None
+    count = 0
+    for _ in iter_parameter_values("Device.WiFi.", acs, cpe, depth=2):  # type: ignore[arg-type]
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    return first or 0.0, count
+
+
+def _child(mode: str, fname: Path) -> None:
+    if mode in ("gpv", "split"):
+        params = int(fname.stem.rsplit("_", 1)[-1])
+        model: dict[str, str | int | bool] = {_name(idx): idx for idx in range(params)}
+        with LocalACS() as acs, SimulatedCPE(acs.url, model) as cpe:
+            cpe.boot()
+            # the simulated CPE holds the data model, only the read counts
+            baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            start = time.perf_counter()
+            first, count = _read_from_acs(mode, acs, cpe)
+            total = time.perf_counter() - start
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    else:
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        if mode == "list":
+            first, count = _parse_to_list(fname)
+        else:
+            first, count = _parse_streaming(fname)
+        total = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    json.dump(
+        {
+            "count": count,
+            "first_s": first,
+            "total_s": total,
+            "peak_kib": peak,
+            "delta_kib": peak - baseline,
+        },
+        sys.stdout,
+    )
+
+
+def _run(mode: str, fname: Path) -> dict:
+    command = [sys.executable, "-m", "benchmarks.bench_gpv_stream", "--child", mode]
+    output = subprocess.run(
+        [*command, str(fname)],  # noqa: S603
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    """Run the benchmark and print one row per size and parser."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--params", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "FILE"))
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child[0], Path(args.child[1]))
+        return
+    sys.stdout.write(
+        f"{'params':>8} {'parser':>7} {'first param ms':>15} {'total ms':>10}"
+        f" {'peak RSS MiB':>13} {'RSS growth MiB':>15}\n"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for params in args.params:
+            fname = Path(tmp) / f"gpv_{params}.xml"
+            _write_response(fname, params)
+            for mode in args.modes:
+                res = _run(mode, fname)
+                sys.stdout.write(
+                    f"{res['count']:>8} {mode:>7} {res['first_s'] * 1e3:>15.2f}"
+                    f" {res['total_s'] * 1e3:>10.2f} {res['peak_kib'] / 1024:>13.1f}"
+                    f" {res['delta_kib'] / 1024:>15.1f}\n"
+                )
+
+
+if __name__ == "__main__":
+    main()
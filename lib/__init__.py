@@ -0,0 +1 @@
+"""Shared test library for boardfarm tests."""
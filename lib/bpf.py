@@ -0,0 +1,117 @@
+"""Compile what a test wants to capture into a tight tcpdump capture filter.
+
+The kernel drops everything else, so the pcap, its parsing and the copy to
+the artifacts only carry the packets the test looks at.
+
+>>> bpf_filter("udp", ports=(546, 547), mode="ipv6")
+'ip6 and udp and (port 546 or port 547)'
+>>> bpf_filter("tcp", hosts=erouter_hosts(board_facts.erouter_addresses, "dual"))
+'tcp and (host 10.1.0.2 or host 2001:db8::2)'
+"""
+
+from __future__ import annotations
+
+from ipaddress import ip_address
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from boardfarm3.lib.dataclass.interface import IPAddresses
+
+ROUTER_SOLICITATION = 133
+ROUTER_ADVERTISEMENT = 134
+
+_FAMILIES = {"ipv4": ("ip", 4), "ipv6": ("ip6", 6)}
+# protocols that imply the address family
+_ICMP = {"icmp": 4, "icmp6": 6}
+
+
+def _any_of(primitive: str, values: Iterable[object]) -> str:
+    terms = [f"{primitive} {value}" for value in dict.fromkeys(values)]
+    return terms[0] if len(terms) == 1 else f"({' or '.join(terms)})"
+
+
+def bpf_filter(
+    protocol: str | None = None,
+    *,
+    ports: Iterable[int] = (),
+    hosts: Iterable[object] = (),
+    mode: str = "dual",
+    icmp6_types: Iterable[int] = (),
+) -> str:
+    """Return the capture filter for a protocol, ports, peers and IP mode.
+
+    Hosts of the address family the mode excludes are left out, e.g. the
+    IPv4 address of a dual stack eRouter when capturing in ``ipv6`` mode.
+
+    :param protocol: ``tcp``, ``udp``, ``icmp`` or ``icmp6``, defaults to any
+    :type protocol: str | None
+    :param ports: source or destination ports, defaults to any
+    :type ports: Iterable[int]
+    :param hosts: source or destination addresses, defaults to any
+    :type hosts: Iterable[object]
+    :param mode: ``ipv4``, ``ipv6`` or ``dual``, defaults to ``dual``
+    :type mode: str
+    :param icmp6_types: ICMPv6 message types, e.g. ``ROUTER_ADVERTISEMENT``,
+        only with the ``icmp6`` protocol
+    :type icmp6_types: Iterable[int]
+    :return: tcpdump filter expression, empty to capture everything
+    :rtype: str
+    :raises ValueError: if the filter would never match
+    """
+    family, version = _FAMILIES.get(mode, ("", None))
+    if protocol in _ICMP and version not in (None, _ICMP[protocol]):
+        msg = f"{protocol} is never captured in {mode} mode"
+        raise ValueError(msg)
+    terms = [family] if family and protocol not in _ICMP else []
+    if protocol:
+        terms.append(protocol)
+    if types := list(icmp6_types):
+        if protocol != "icmp6":
+            msg = "ICMPv6 types need the icmp6 protocol"
+            raise ValueError(msg)
+        # the ICMPv6 type follows the fixed IPv6 header, RA/RS/NS/NA carry
+        # no extension headers
+        terms.append(_any_of("ip6[40] ==", types))
+    if port_list := list(ports):
+        terms.append(_any_of("port", port_list))
+    if peers := [str(host) for host in hosts if host is not None]:
+        if version := version or _ICMP.get(protocol or ""):
+            peers = [peer for peer in peers if ip_address(peer).version == version]
+        if not peers:
+            msg = f"no peer address left in {mode} mode"
+            raise ValueError(msg)
+        terms.append(_any_of("host", peers))
+    return " and ".join(terms)
+
+
+def erouter_hosts(
+    addresses: IPAddresses, mode: str, *, link_local: bool = False
+) -> list[str]:
+    """Return the eRouter WAN addresses used in the given mode.
+
+    :param addresses: eRouter WAN addresses, e.g. from
+        ``get_erouter_addresses``
+    :type addresses: IPAddresses
+    :param mode: eRouter provisioning mode
+    :type mode: str
+    :param link_local: also return the IPv6 link-local address, defaults
+        to False
+    :type link_local: bool
+    :return: addresses, IPv4 first
+    :rtype: list[str]
+    """
+    hosts = []
+    if mode in ("ipv4", "dual") and addresses.ipv4:
+        hosts.append(str(addresses.ipv4))
+    if mode in ("ipv6", "dual"):
+        hosts += [
+            str(address)
+            for address in (
+                addresses.ipv6,
+                addresses.link_local_ipv6 if link_local else None,
+            )
+            if address
+        ]
+    return hosts
@@ -0,0 +1,299 @@
+"""Packet capture whose decoded output is followed while the pcap is written."""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Self
+
+import pexpect
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
+_LOGGER = logging.getLogger(__name__)
+
+# tcpdump -tt prints the epoch timestamp at the start of every packet
+_PACKET_START = re.compile(r"^(\d{9,10}\.\d{6}) ")
+# tcpdump -x prints the packet, from the network header on, as hex lines
+_HEX_LINE = re.compile(r"^\s+0x[0-9a-f]{4}:\s+((?:[0-9a-f]{2,4}\s?)+)")
+
+
+@dataclass
+class CapturedPacket:
+    """One packet as decoded by tcpdump, header line plus detail lines."""
+
+    timestamp: float
+    lines: list[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Decoded packet text.
+
+        :return: all lines of the packet
+        :rtype: str
+        """
+        return "\n".join(self.lines)
+
+    @property
+    def data(self) -> bytes:
+        """Packet bytes from the network header on, decoded with ``-x``.
+
+        :return: packet bytes, empty when not decoded with ``-x``
+        :rtype: bytes
+        """
+        return bytes.fromhex(
+            "".join(match[1] for line in self.lines if (match := _HEX_LINE.match(line)))
+        )
+
+
+class PacketWatch:
+    """The first packet matching a predicate, awaited while the capture runs.
+
+    Created by :meth:`LiveCapture.watch` before the action that makes the
+    packet appear, so a packet captured before :meth:`wait` is called is
+    not missed.
+    """
+
+    def __init__(self, predicate: Callable[[CapturedPacket], bool]) -> None:
+        """Initialize the watch.
+
+        :param predicate: function returning True for the awaited packet
+        :type predicate: Callable[[CapturedPacket], bool]
+        """
+        self._predicate = predicate
+        self._matched = threading.Event()
+        self.packet: CapturedPacket | None = None
+
+    def __call__(self, packet: CapturedPacket) -> None:
+        """Check a captured packet, keeping the first match.
+
+        :param packet: captured packet
+        :type packet: CapturedPacket
+        """
+        if self.packet is None and self._predicate(packet):
+            self.packet = packet
+            self._matched.set()
+
+    def wait(self, timeout: float) -> CapturedPacket | None:
+        """Wait for the matching packet.
+
+        :param timeout: seconds to wait
+        :type timeout: float
+        :return: matching packet, None on timeout
+        :rtype: CapturedPacket | None
+        """
+        start = time.monotonic()
+        if self._matched.wait(timeout):
+            _LOGGER.info("awaited packet seen after %.1fs", time.monotonic() - start)
+        else:
+            _LOGGER.warning("awaited packet not seen in %ss", timeout)
+        return self.packet
+
+
+class LiveCapture:  # pylint: disable=too-many-instance-attributes
+    """Run tcpdump on a device console and follow the packets as they arrive.
+
+    The capture is written to ``fname`` on the device, exactly like
+    ``tcpdump_on_device``, while a second tcpdump decodes the same stream
+    on the console. A reader thread splits the decoded output into
+    :class:`CapturedPacket` objects and hands them to the registered
+    callbacks, so tests can react to a packet the moment it is captured
+    instead of sleeping and reading the whole pcap back.
+
+    The device console is owned by the capture until the context exits.
+
+    A test that would keep a capture open for a fixed time "to complete"
+    watches for the packet that completes it and leaves as soon as it is
+    seen, the timeout being only the fallback:
+
+    >>> with LiveCapture(provisioner, pcap_file, iface, "udp port 547") as capture:
+    ...     reply = capture.watch(dhcpv6_reply_to(link_local_ipv6))
+    ...     factory_reset(board)
+    ...     reply.wait(timeout=30)
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        device: Any,  # noqa: ANN401
+        fname: str,
+        interface: str,
+        bpf_filter: str = "",
+        decode_args: str = "-vv",
+    ) -> None:
+        """Initialize the capture.
+
+        :param device: device with a Linux ``console``, e.g. ACS or LAN
+        :type device: Any
+        :param fname: pcap file path on the device
+        :type fname: str
+        :param interface: interface to capture on
+        :type interface: str
+        :param bpf_filter: capture filter expression, defaults to everything
+        :type bpf_filter: str
+        :param decode_args: tcpdump options used to decode the packets,
+            defaults to ``-vv``
+        :type decode_args: str
+        """
+        self._console = device.console
+        self._interface = interface
+        self._command = (
+            f"tcpdump -U -n -i {interface} -w - {_quote(bpf_filter)} | tee {fname} | "
+            f"tcpdump -l -n -tt {decode_args} -r - 2>/dev/null"
+        )
+        self._callbacks: list[Callable[[CapturedPacket], None]] = []
+        self._packet: CapturedPacket | None = None
+        self._partial = ""
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._follow, daemon=True)
+        self.packets = 0
+
+    def add_callback(self, callback: Callable[[CapturedPacket], None]) -> None:
+        """Call ``callback`` with every captured packet.
+
+        :param callback: function taking a :class:`CapturedPacket`
+        :type callback: Callable[[CapturedPacket], None]
+        """
+        self._callbacks.append(callback)
+
+    def watch(self, predicate: Callable[[CapturedPacket], bool]) -> PacketWatch:
+        """Match the packets captured from now on against a predicate.
+
+        :param predicate: function returning True for the awaited packet
+        :type predicate: Callable[[CapturedPacket], bool]
+        :return: watch to wait on
+        :rtype: PacketWatch
+        """
+        watch = PacketWatch(predicate)
+        self.add_callback(watch)
+        return watch
+
+    def wait_for(
+        self, predicate: Callable[[CapturedPacket], bool], timeout: float
+    ) -> CapturedPacket | None:
+        """Wait for the first packet, captured from now on, matching a predicate.
+
+        :param predicate: function returning True for the awaited packet
+        :type predicate: Callable[[CapturedPacket], bool]
+        :param timeout: seconds to wait
+        :type timeout: float
+        :return: matching packet, None on timeout
+        :rtype: CapturedPacket | None
+        """
+        watch = self.watch(predicate)
+        try:
+            return watch.wait(timeout)
+        finally:
+            self._callbacks.remove(watch)
+
+    def start(self) -> None:
+        """Start tcpdump and the reader thread.
+
+        :raises ValueError: when tcpdump does not start
+        """
+        self._console.sendline(self._command)
+        if self._console.expect_exact(
+            [f"listening on {self._interface}", pexpect.TIMEOUT], timeout=30
+        ):
+            msg = f"Failed to start tcpdump on {self._interface}"
+            raise ValueError(msg)
+        self._feed(self._console.buffer)
+        self._console.buffer = ""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the reader thread and tcpdump, flushing the pcap file."""
+        self._stop.set()
+        self._thread.join()
+        self._console.sendcontrol("c")
+        self._console.expect_exact(["packets captured", pexpect.TIMEOUT], timeout=30)
+        self._console.execute_command("sync")
+        self._flush()
+
+    def __enter__(self) -> Self:
+        """Start the capture.
+
+        :return: the running capture
+        :rtype: Self
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the capture.
+
+        :param exc_type: exception type raised in the context, if any
+        :type exc_type: type[BaseException] | None
+        :param exc_value: exception raised in the context, if any
+        :type exc_value: BaseException | None
+        :param traceback: traceback of the exception, if any
+        :type traceback: TracebackType | None
+        """
+        self.stop()
+
+    def _follow(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._feed(self._console.read_nonblocking(65536, timeout=0.5))
+            except pexpect.TIMEOUT:
+                # no more output for now, the pending packet is complete
+                self._flush()
+            except pexpect.EOF:
+                _LOGGER.warning("console closed while capturing")
+                return
+
+    def _feed(self, data: str) -> None:
+        lines = (self._partial + data).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            line = line.rstrip("\r")  # noqa: PLW2901
+            if match := _PACKET_START.match(line):
+                self._flush()
+                self._packet = CapturedPacket(float(match[1]), [line])
+            elif self._packet is not None:
+                self._packet.lines.append(line)
+
+    def _flush(self) -> None:
+        if self._packet is None:
+            return
+        packet, self._packet = self._packet, None
+        self.packets += 1
+        for callback in list(self._callbacks):
+            try:
+                callback(packet)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("packet callback failed")
+        _LOGGER.debug("packet at %s handled at %s", packet.timestamp, time.time())
+
+
+def dhcpv6_reply_to(peer: object) -> Callable[[CapturedPacket], bool]:
+    """Match a DHCPv6 Reply to a client, direct or relayed.
+
+    Works on the ``-v`` decode, where a relayed Reply is printed inside
+    the Relay-reply together with the ``peeraddr`` of the client.
+
+    :param peer: link-local address of the client
+    :type peer: object
+    :return: packet predicate
+    :rtype: Callable[[CapturedPacket], bool]
+    """
+    address = str(peer)
+
+    def _match(packet: CapturedPacket) -> bool:
+        text = packet.text
+        return address in text and ("dhcp6 reply" in text or "(reply " in text)
+
+    return _match
+
+
+def _quote(bpf_filter: str) -> str:
+    return f"'{bpf_filter}'" if bpf_filter else ""
@@ -0,0 +1,241 @@
+"""Session-long captures that tests cut time-window slices from.
+
+One tcpdump per device interface runs for the whole session and rotates
+its pcap every ``segment_seconds``. Each segment is named after the epoch
+second it starts at, which is the time index: a slice opens only the
+segments overlapping the window. The slice is then cut to the window and
+the filter with ``mergecap``, ``editcap`` and ``tcpdump -r`` on the
+device. Tests skip the tcpdump start/stop and file naming, cannot miss
+the first packet, and can share one capture.
+
+>>> service = capture_services.get(lan, lan.iface_dut, "icmp6")
+>>> start = service.now()
+>>> set_ra_mtu(1400)
+>>> service.slice(pcap_file, start, service.now(), "ip6[40] == 134")
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import tempfile
+import threading
+import zlib
+from bisect import bisect_right
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+SEGMENT_SECONDS = 60
+MAX_SEGMENTS = 120
+_PID = re.compile(r"PID:(\d+)")
+_SLICED = re.compile(r"SLICED:0\b")
+
+
+def _quote(bpf_filter: str) -> str:
+    return f"'{bpf_filter}'" if bpf_filter else ""
+
+
+class CaptureService:  # pylint: disable=too-many-instance-attributes
+    """A background tcpdump writing rotating pcap segments on a device.
+
+    The console of the device stays free, every command returns at once.
+    Times are epoch seconds on the device clock, see :meth:`now`.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        device: Any,  # noqa: ANN401
+        interface: str,
+        bpf_filter: str = "",
+        segment_seconds: int = SEGMENT_SECONDS,
+        max_segments: int = MAX_SEGMENTS,
+    ) -> None:
+        """Initialize the service.
+
+        :param device: device with a Linux ``console``, e.g. LAN or ACS
+        :type device: Any
+        :param interface: interface to capture on
+        :type interface: str
+        :param bpf_filter: capture filter of the whole session, defaults to
+            everything
+        :type bpf_filter: str
+        :param segment_seconds: seconds per pcap segment, defaults to 60
+        :type segment_seconds: int
+        :param max_segments: segments kept, older ones are deleted,
+            defaults to 120
+        :type max_segments: int
+        """
+        self._device = device
+        self.interface = interface
+        self.bpf_filter = bpf_filter
+        self.segment_seconds = segment_seconds
+        self.max_segments = max_segments
+        # services on one interface differ by filter, so does their directory
+        self.directory = (
+            f"/{tempfile.template}/capture_{device.device_name}_{interface}_"
+            f"{zlib.crc32(bpf_filter.encode()):08x}"
+        )
+        self._pid: str | None = None
+        # one command at a time on the device console
+        self._lock = threading.Lock()
+
+    def _run(self, command: str, timeout: int = 30) -> str:
+        with self._lock:
+            return self._device.console.execute_command(command, timeout=timeout)
+
+    def start(self) -> None:
+        """Start tcpdump in the background.
+
+        :raises ValueError: when tcpdump does not start
+        """
+        output = self._run(
+            f"mkdir -p {self.directory} && "
+            f"nohup tcpdump -U -n -i {self.interface} -G {self.segment_seconds} "
+            f"-w {self.directory}/%s.pcap {_quote(self.bpf_filter)} "
+            f"> {self.directory}/tcpdump.log 2>&1 & echo PID:$!"
+        )
+        if not (match := _PID.search(output)):
+            msg = f"Failed to start the capture service on {self.interface}"
+            raise ValueError(msg)
+        self._pid = match[1]
+        _LOGGER.info(
+            "capture service on %s/%s started, pid %s",
+            self._device.device_name,
+            self.interface,
+            self._pid,
+        )
+
+    def stop(self, *, remove: bool = True) -> None:
+        """Stop tcpdump.
+
+        :param remove: delete the segments, defaults to True
+        :type remove: bool
+        """
+        if self._pid is None:
+            return
+        self._run(f"kill {self._pid}; sleep 1")
+        self._pid = None
+        if remove:
+            self._run(f"rm -rf {self.directory}")
+
+    def now(self) -> float:
+        """Return the current time on the device clock.
+
+        :return: epoch seconds
+        :rtype: float
+        """
+        return float(self._run("date +%s.%N").strip().splitlines()[-1])
+
+    def segments(self) -> list[tuple[int, str]]:
+        """Return the segments, deleting those beyond ``max_segments``.
+
+        :return: start time and path of every segment, oldest first
+        :rtype: list[tuple[int, str]]
+        """
+        names = self._run(f"ls -1 {self.directory}").split()
+        starts = sorted(
+            int(name.removesuffix(".pcap"))
+            for name in names
+            if name.removesuffix(".pcap").isdigit()
+        )
+        if expired := starts[: -self.max_segments]:
+            self._run(
+                "rm -f "
+                + " ".join(f"{self.directory}/{start}.pcap" for start in expired)
+            )
+        return [
+            (start, f"{self.directory}/{start}.pcap")
+            for start in starts[len(expired) :]
+        ]
+
+    def slice(self, fname: str, start: float, end: float, bpf_filter: str = "") -> str:
+        """Write the packets captured in a time window to a pcap file.
+
+        :param fname: pcap file path on the device
+        :type fname: str
+        :param start: window start, epoch seconds on the device clock
+        :type start: float
+        :param end: window end, epoch seconds on the device clock
+        :type end: float
+        :param bpf_filter: filter applied to the window, defaults to all
+            packets of the service
+        :type bpf_filter: str
+        :return: ``fname``
+        :rtype: str
+        :raises ValueError: when no segment covers the window or the slice
+            could not be written
+        """
+        segments = self.segments()
+        starts = [segment_start for segment_start, _ in segments]
+        first = max(bisect_right(starts, start) - 1, 0)
+        last = bisect_right(starts, end)
+        paths = [path for _, path in segments[first:last]]
+        if not paths:
+            msg = f"no capture segment between {start} and {end}"
+            raise ValueError(msg)
+        merged = f"{fname}.merged"
+        # the open segment may end in a partial packet, mergecap then fails
+        # but has written the packets before it, hence ";" after it only
+        output = self._run(
+            f"rm -f {fname}; mergecap -F pcap -w {merged} {' '.join(paths)}; "
+            f"editcap -F pcap -A {start:.6f} -B {end:.6f} {merged} {merged}.window "
+            f"&& tcpdump -n -r {merged}.window -w {fname} {_quote(bpf_filter)} "
+            f"&& test -s {fname} && echo SLICED:$?; "
+            f"rm -f {merged} {merged}.window",
+            timeout=120,
+        )
+        if not _SLICED.search(output):
+            msg = f"failed to slice the capture into {fname}: {output.strip()}"
+            raise ValueError(msg)
+        _LOGGER.info(
+            "sliced %.1fs from %d segments into %s", end - start, len(paths), fname
+        )
+        return fname
+
+
+class CaptureServices:
+    """The capture services of a session, one per device, interface and filter.
+
+    >>> services = CaptureServices()
+    >>> service = services.get(lan, lan.iface_dut, "icmp6")
+    >>> services.stop_all()
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._services: dict[tuple[str, str, str], CaptureService] = {}
+
+    def get(
+        self,
+        device: Any,  # noqa: ANN401
+        interface: str,
+        bpf_filter: str = "",
+    ) -> CaptureService:
+        """Return the running service for a capture, starting it on first use.
+
+        :param device: device with a Linux ``console``
+        :type device: Any
+        :param interface: interface to capture on
+        :type interface: str
+        :param bpf_filter: capture filter of the whole session, defaults to
+            everything
+        :type bpf_filter: str
+        :return: running service
+        :rtype: CaptureService
+        """
+        key = (device.device_name, interface, bpf_filter)
+        if key not in self._services:
+            service = CaptureService(device, interface, bpf_filter)
+            service.start()
+            self._services[key] = service
+        return self._services[key]
+
+    def stop_all(self) -> None:
+        """Stop every service and delete its segments."""
+        for service in self._services.values():
+            try:
+                service.stop()
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("failed to stop the capture on %s", service.interface)
+        self._services.clear()
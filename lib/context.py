@@ -0,0 +1,56 @@
+"""The CPE under test together with the per-test helpers working on it."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+from lib.health import ensure_recovered
+from lib.teardown import RECOVER_BOARD
+
+if TYPE_CHECKING:
+    from boardfarm3.templates.acs import ACS
+    from boardfarm3.templates.cpe import CPE
+
+    from lib.facts import BoardFacts
+    from lib.retry import Retrier
+    from lib.teardown import TeardownRegistry
+    from lib.telemetry import PhaseTelemetry
+
+
+@dataclass
+class BoardContext:
+    """The CPE, its cached facts and the retrier, telemetry and teardown of a test.
+
+    Tests and fixtures that reboot or reset the CPE need all of them; the
+    ``board_context`` fixture hands them over as one argument.
+
+    >>> with board_context.telemetry.phase("power_cycle"):
+    ...     power_cycle(board_context.cpe)
+    >>> board_context.register_recovery(mode, acs)
+    """
+
+    cpe: CPE
+    facts: BoardFacts
+    retrier: Retrier
+    telemetry: PhaseTelemetry
+    teardown: TeardownRegistry
+
+    def register_recovery(self, mode: str, acs: ACS | None = None) -> None:
+        """Register the teardown action bringing the CPE back.
+
+        It probes the health of the CPE and only recovers what is missing,
+        see :func:`lib.health.ensure_recovered`. Other actions on the CPE
+        declaring ``after=[RECOVER_BOARD]`` wait for it.
+
+        :param mode: eRouter provisioning mode the CPE has to come back in
+        :type mode: str
+        :param acs: ACS the CPE has to be registered on, defaults to none
+        :type acs: ACS | None
+        """
+        self.teardown.register(
+            RECOVER_BOARD,
+            partial(ensure_recovered, self.cpe, mode, acs, self.retrier),
+            self.cpe.device_name,
+        )
@@ -0,0 +1,99 @@
+"""Resolve the device roles of a testbed once and check them when used."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import pexpect
+from boardfarm3.exceptions import DeviceConnectionError
+from boardfarm3.templates.acs import ACS
+from boardfarm3.templates.cpe import CPE
+from boardfarm3.templates.lan import LAN
+from boardfarm3.templates.provisioner import Provisioner
+from boardfarm3.templates.wan import WAN
+
+if TYPE_CHECKING:
+    from boardfarm3.lib.device_manager import DeviceManager
+
+_LOGGER = logging.getLogger(__name__)
+_T = TypeVar("_T")
+
+# seconds a console has to print its prompt again after an empty command
+PROMPT_TIMEOUT = 10
+
+
+@dataclass(frozen=True)
+class Devices:
+    """The devices of a testbed by role, None for a role it does not have."""
+
+    cpe: CPE | None = None
+    acs: ACS | None = None
+    wan: WAN | None = None
+    provisioner: Provisioner | None = None
+    lan_clients: list[LAN] = field(default_factory=list)
+
+    @property
+    def all(self) -> list[Any]:
+        """Return every resolved device.
+
+        :return: devices, CPE first
+        :rtype: list[Any]
+        """
+        roles = [self.cpe, self.acs, self.wan, self.provisioner]
+        return [device for device in roles if device is not None] + self.lan_clients
+
+
+def _first(device_manager: DeviceManager, device_type: type) -> Any:  # noqa: ANN401
+    return next(iter(device_manager.get_devices_by_type(device_type).values()), None)
+
+
+def check_connected(device: _T) -> _T:
+    """Check that the consoles of a device answer.
+
+    A trivial command is sent on every console and its prompt is expected
+    back, so a console whose process is alive but whose far end is gone,
+    e.g. a stale serial or SSH session, fails here and not in the test.
+
+    :param device: device to check
+    :type device: _T
+    :return: the device
+    :rtype: _T
+    :raises DeviceConnectionError: if a console of the device does not answer
+    """
+    checked: Any = device
+    dead = []
+    for name, console in checked.get_interactive_consoles().items():
+        try:
+            console.execute_command("echo", timeout=PROMPT_TIMEOUT)
+        except (pexpect.TIMEOUT, pexpect.EOF, OSError):
+            dead.append(name)
+    if dead:
+        msg = f"Consoles of {checked.device_name} not answering: {', '.join(dead)}"
+        raise DeviceConnectionError(msg)
+    return device
+
+
+def resolve_devices(device_manager: DeviceManager) -> Devices:
+    """Look up every device role of the testbed.
+
+    The consoles are not checked here, see :func:`check_connected`, so a
+    dead device only fails the tests using it.
+
+    :param device_manager: boardfarm device manager
+    :type device_manager: DeviceManager
+    :return: devices by role
+    :rtype: Devices
+    """
+    devices = Devices(
+        cpe=_first(device_manager, CPE),
+        acs=_first(device_manager, ACS),
+        wan=_first(device_manager, WAN),
+        provisioner=_first(device_manager, Provisioner),
+        lan_clients=list(
+            device_manager.get_devices_by_type(LAN).values()  # type:ignore[type-abstract]
+        ),
+    )
+    _LOGGER.info("%d devices resolved", len(devices.all))
+    return devices
@@ -0,0 +1,260 @@
+"""DHCPv6 traffic captured across a factory reset, shared between tests."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from boardfarm3.lib.dataclass.dhcp import DHCPV6TraceData
+
+# message types
+SOLICIT = 1
+ADVERTISE = 2
+REQUEST = 3
+REPLY = 7
+
+IA_NA = "Identity Association for Non-temporary Address"
+IA_PD = "Identity Association for Prefix Delegation"
+
+
+def index_fields(node: dict[str, Any]) -> dict[str, list[Any]]:
+    """Collect every value of every key of a tshark JSON tree in one walk.
+
+    The values of a key are in the order ``nested_lookup`` returns them, so
+    ``index_fields(packet)[key]`` equals ``nested_lookup(key, packet)``.
+
+    :param node: tshark JSON tree, e.g. the ``dhcpv6`` layer of a packet
+    :type node: dict[str, Any]
+    :return: values by key
+    :rtype: dict[str, list[Any]]
+    """
+    fields: dict[str, list[Any]] = {}
+
+    def _walk(tree: dict[str, Any]) -> None:
+        for key, value in tree.items():
+            if key in fields:
+                fields[key].append(value)
+            else:
+                fields[key] = [value]
+            if isinstance(value, dict):
+                _walk(value)
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, dict):
+                        _walk(item)
+
+    _walk(node)
+    return fields
+
+
+def _first(fields: dict[str, list[Any]], key: str) -> Any:  # noqa: ANN401
+    values = fields.get(key)
+    return values[0] if values else None
+
+
+def _last(fields: dict[str, list[Any]], key: str) -> Any:  # noqa: ANN401
+    values = fields.get(key)
+    return values[-1] if values else None
+
+
+class Dhcpv6Message:  # pylint: disable=too-many-instance-attributes
+    """One captured DHCPv6 packet with the fields the tests check precomputed.
+
+    Relayed packets nest the client message in a Relay-forw/Relay-reply;
+    ``msg_type`` and ``xid`` are those of the innermost message and
+    ``peer`` the client address the relay agent reports. ``duid_type`` and
+    ``link_layer_addr`` come from the first DUID in the packet, the client
+    identifier for messages a client sends. Any other field is looked up
+    with :meth:`lookup`.
+    """
+
+    __slots__ = (
+        "duid_type",
+        "fields",
+        "ia_na",
+        "ia_pd",
+        "link_layer_addr",
+        "msg_type",
+        "options",
+        "peer",
+        "trace",
+        "xid",
+    )
+
+    def __init__(self, trace: DHCPV6TraceData) -> None:
+        """Index the fields of a packet.
+
+        :param trace: parsed packet, as returned by ``parse_dhcpv6_trace``
+        :type trace: DHCPV6TraceData
+        """
+        fields = index_fields(trace.dhcpv6_packet)
+        msg_type = _last(fields, "dhcpv6.msgtype")
+        self.trace = trace
+        self.fields = fields
+        self.msg_type = int(msg_type) if msg_type is not None else None
+        self.xid: str | None = _last(fields, "dhcpv6.xid")
+        self.peer: str | None = _first(fields, "dhcpv6.peeraddr")
+        self.duid_type: str | None = _first(fields, "dhcpv6.duid.type")
+        self.link_layer_addr: str | None = _first(
+            fields, "dhcpv6.duidll.link_layer_addr"
+        )
+        self.ia_na: list[dict[str, Any]] = fields.get(IA_NA, [])
+        self.ia_pd: list[dict[str, Any]] = fields.get(IA_PD, [])
+        self.options = frozenset(
+            int(code) for code in fields.get("dhcpv6.option.type", [])
+        )
+
+    @property
+    def packet(self) -> dict[str, Any]:
+        """Return the tshark ``dhcpv6`` layer of the packet.
+
+        :return: dhcpv6 layer
+        :rtype: dict[str, Any]
+        """
+        return self.trace.dhcpv6_packet
+
+    def lookup(self, key: str) -> list[Any]:
+        """Return every value of a key, like ``nested_lookup`` on the packet.
+
+        :param key: tshark field or tree name
+        :type key: str
+        :return: values in packet order, empty if the key is absent
+        :rtype: list[Any]
+        """
+        return self.fields.get(key, [])
+
+
+class Dhcpv6Index:
+    """The messages of a DHCPv6 trace indexed by address, type and transaction.
+
+    Built in one pass over the trace, so tests filtering a large multi-boot
+    capture do dictionary lookups instead of walking every packet again.
+
+    >>> index = Dhcpv6Index(parse_dhcpv6_trace(provisioner, pcap_file))
+    >>> solicits = index.messages(link_local_ipv6, 1)
+    >>> replies = index.transaction(solicits[-1].xid)
+    """
+
+    __slots__ = ("_by_peer", "_by_type", "_by_xid", "all")
+
+    def __init__(self, trace: list[DHCPV6TraceData]) -> None:
+        """Index a trace.
+
+        :param trace: parsed packets in capture order
+        :type trace: list[DHCPV6TraceData]
+        """
+        self.all = [Dhcpv6Message(packet) for packet in trace]
+        self._by_peer: dict[str, list[Dhcpv6Message]] = defaultdict(list)
+        self._by_type: dict[int | None, list[Dhcpv6Message]] = defaultdict(list)
+        self._by_xid: dict[str | None, list[Dhcpv6Message]] = defaultdict(list)
+        for message in self.all:
+            addresses = {
+                str(message.trace.source.ipv6),
+                str(message.trace.destination.ipv6),
+                *message.lookup("dhcpv6.peeraddr"),
+            }
+            for address in addresses:
+                self._by_peer[address].append(message)
+            self._by_type[message.msg_type].append(message)
+            self._by_xid[message.xid].append(message)
+
+    def exchange(self, address: object) -> list[Dhcpv6Message]:
+        """Return the messages from, to or relayed for an address.
+
+        Equivalent to the tshark filter
+        ``dhcpv6.peeraddr==<addr> or ipv6.addr==<addr>``.
+
+        :param address: IPv6 address, e.g. the eRouter WAN link-local address
+        :type address: object
+        :return: matching messages in capture order
+        :rtype: list[Dhcpv6Message]
+        """
+        return list(self._by_peer.get(str(address), []))
+
+    def messages(self, address: object | None, msg_type: int) -> list[Dhcpv6Message]:
+        """Return the messages of one type, optionally exchanged with an address.
+
+        :param address: IPv6 address, None for every address
+        :type address: object | None
+        :param msg_type: DHCPv6 message type, e.g. 1 for Solicit
+        :type msg_type: int
+        :return: matching messages in capture order
+        :rtype: list[Dhcpv6Message]
+        """
+        if address is None:
+            return list(self._by_type.get(msg_type, []))
+        return [
+            message
+            for message in self._by_peer.get(str(address), [])
+            if message.msg_type == msg_type
+        ]
+
+    def transaction(self, xid: str | None) -> list[Dhcpv6Message]:
+        """Return the messages of one transaction.
+
+        :param xid: transaction id, as shown by tshark
+        :type xid: str | None
+        :return: matching messages in capture order
+        :rtype: list[Dhcpv6Message]
+        """
+        return list(self._by_xid.get(xid, []))
+
+    def __len__(self) -> int:
+        """Return the number of indexed messages.
+
+        :return: message count
+        :rtype: int
+        """
+        return len(self.all)
+
+
+@dataclass
+class ResetCapture:
+    """DHCPv6 packets captured on the provisioner during one factory reset.
+
+    The capture and its parsed trace are produced once per provisioning
+    mode by the ``dhcpv6_reset_capture`` fixture and handed to every test
+    that analyses the post-reset Solicit/Advertise/Request/Reply exchange.
+    """
+
+    mode: str
+    pcap_file: str
+    provisioner: Any
+    trace: list[DHCPV6TraceData]
+    pcap_copied: bool = False
+    _index: Dhcpv6Index | None = field(default=None, init=False, repr=False)
+
+    @property
+    def index(self) -> Dhcpv6Index:
+        """Return the trace index, built on first use.
+
+        :return: indexed trace
+        :rtype: Dhcpv6Index
+        """
+        if self._index is None:
+            self._index = Dhcpv6Index(self.trace)
+        return self._index
+
+    def exchange(self, link_local_ipv6: object) -> list[Dhcpv6Message]:
+        """Return the messages from, to or relayed for an address.
+
+        :param link_local_ipv6: eRouter WAN link-local address
+        :type link_local_ipv6: object
+        :return: matching messages in capture order
+        :rtype: list[Dhcpv6Message]
+        """
+        return self.index.exchange(link_local_ipv6)
+
+    def messages(self, link_local_ipv6: object, msg_type: int) -> list[Dhcpv6Message]:
+        """Return the messages of one type exchanged with an address.
+
+        :param link_local_ipv6: eRouter WAN link-local address
+        :type link_local_ipv6: object
+        :param msg_type: DHCPv6 message type, e.g. 1 for Solicit
+        :type msg_type: int
+        :return: matching messages in capture order
+        :rtype: list[Dhcpv6Message]
+        """
+        return self.index.messages(link_local_ipv6, msg_type)
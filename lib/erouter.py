@@ -0,0 +1,109 @@
+"""Wait for the eRouter WAN addresses by following the CPE console."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from boardfarm3.use_cases.erouter import verify_erouter_ip_address
+
+from lib.milestones import Milestone, MilestoneWaiter
+from lib.polling import WaitResult, wait_until
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from boardfarm3.templates.cpe import CPE
+
+    from lib.milestones import MilestoneTiming
+
+# one ``ip -o`` line each, not a "Deleted" one; the IPv6 line is matched
+# up to its end so a tentative or DAD failed address is never taken
+IPV4_BOUND = r"(?m)^(?!Deleted)[^\n]*inet \d+\.\d+\.\d+\.\d+/\d+"
+IPV6_BOUND = (
+    r"(?m)^(?!Deleted)[^\n]*inet6 (?!fe80)[0-9a-f:]+/\d+ scope global"
+    r"(?:(?!tentative|dadfailed)[^\n])*\n"
+)
+# seconds the console check confirming the addresses is retried
+CONFIRM_TIMEOUT = 30
+
+
+def erouter_milestones(
+    mode: str,
+    deadline: float | None = None,
+    callback: Callable[[MilestoneTiming], None] | None = None,
+) -> list[Milestone]:
+    """Return the eRouter address milestones of a provisioning mode.
+
+    :param mode: eRouter provisioning mode, ``ipv4``, ``ipv6`` or ``dual``
+    :type mode: str
+    :param deadline: seconds each address may take, defaults to none
+    :type deadline: float | None
+    :param callback: called with the timing of each bound address
+    :type callback: Callable[[MilestoneTiming], None] | None
+    :return: ``erouter_ipv4_bound`` and/or ``erouter_ipv6_bound`` milestones
+    :rtype: list[Milestone]
+    """
+    milestones = []
+    if mode in ("ipv4", "dual"):
+        milestones.append(
+            Milestone("erouter_ipv4_bound", IPV4_BOUND, deadline, callback)
+        )
+    if mode in ("ipv6", "dual"):
+        milestones.append(
+            Milestone("erouter_ipv6_bound", IPV6_BOUND, deadline, callback)
+        )
+    return milestones
+
+
+def wait_for_erouter_ip(
+    board: CPE,
+    mode: str,
+    timeout: float = 720,
+    refresh: float = 30,
+) -> WaitResult:
+    """Wait until the eRouter WAN interface has the addresses of its mode.
+
+    ``ip monitor address`` is followed on the CPE console, so the wait
+    returns within a second of the address being configured instead of on
+    the next tick of a ``verify_erouter_ip_address`` retry loop. The
+    monitor is restarted every ``refresh`` seconds after printing the
+    current addresses, which covers changes made while it was restarting.
+    The result is confirmed with ``verify_erouter_ip_address``, retried
+    for up to ``CONFIRM_TIMEOUT`` seconds.
+
+    :param board: CPE device instance
+    :type board: CPE
+    :param mode: eRouter provisioning mode, ``ipv4``, ``ipv6`` or ``dual``
+    :type mode: str
+    :param timeout: overall timeout in seconds, defaults to 720 as some
+        boards take 12 minutes to get the eRouter address
+    :type timeout: float
+    :param refresh: seconds between monitor restarts, defaults to 30
+    :type refresh: float
+    :return: result holding the milestone timings by name
+    :rtype: WaitResult
+    """
+    start = time.monotonic()
+    iface = board.sw.erouter_iface
+    waiter = MilestoneWaiter(
+        board.hw.get_console("console"),
+        erouter_milestones(mode),
+        command=f"ip -o address show dev {iface}; ip -o monitor address dev {iface}",
+        refresh=refresh,
+    )
+    timings = waiter.wait(timeout)
+    converged = all(timing.reached for timing in timings.values()) and bool(
+        wait_until(
+            lambda: verify_erouter_ip_address(mode, board, 1),
+            CONFIRM_TIMEOUT,
+            interval=2,
+            description=f"eRouter {mode} addresses",
+        )
+    )
+    return WaitResult(
+        converged=converged,
+        value=timings,
+        elapsed=time.monotonic() - start,
+        attempts=1,
+    )
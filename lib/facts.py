@@ -0,0 +1,148 @@
+"""Cache the facts about a CPE that tests read again and again over its console."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from boardfarm3.use_cases.cpe import get_cpe_provisioning_mode
+from boardfarm3.use_cases.erouter import get_erouter_addresses
+from boardfarm3.use_cases.networking import get_interface_mac_addr
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from boardfarm3.lib.dataclass.interface import IPAddresses
+    from boardfarm3.templates.cpe import CPE
+    from boardfarm3.templates.lan import LAN
+
+_LOGGER = logging.getLogger(__name__)
+
+REBOOT = "reboot"
+FACTORY_RESET = "factory_reset"
+DHCP_RENEW = "dhcp_renew"
+
+# board events that make a cached fact stale
+_ADDRESS_EVENTS = frozenset((REBOOT, FACTORY_RESET, DHCP_RENEW))
+_STATE_EVENTS = frozenset((REBOOT, FACTORY_RESET))
+_NEVER: frozenset[str] = frozenset()
+
+
+class BoardFacts:
+    """Facts about a CPE, read on first use and kept until an event changes them.
+
+    Every fact declares the events that make it stale: the eRouter
+    addresses are dropped on a reboot, factory reset or DHCP renew, the
+    firmware on a reboot or factory reset, the provisioning mode on a
+    factory reset, and MAC addresses are kept for the session. Whoever
+    reboots, resets or renews the board calls :meth:`invalidate`.
+
+    >>> facts = BoardFacts(board)
+    >>> link_local = facts.erouter_addresses.link_local_ipv6
+    >>> factory_reset(acs, board)
+    >>> facts.invalidate(FACTORY_RESET)
+    """
+
+    def __init__(self, board: CPE) -> None:
+        """Initialize an empty cache.
+
+        :param board: CPE device instance
+        :type board: CPE
+        """
+        self._board = board
+        self._values: dict[str, tuple[Any, frozenset[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get(
+        self, name: str, loader: Callable[[], Any], invalidated_by: frozenset[str]
+    ) -> Any:  # noqa: ANN401
+        if name in self._values:
+            self.hits += 1
+            return self._values[name][0]
+        self.misses += 1
+        value = loader()
+        self._values[name] = (value, invalidated_by)
+        return value
+
+    @property
+    def mode(self) -> str:
+        """Return the eRouter provisioning mode.
+
+        :return: ``ipv4``, ``ipv6`` or ``dual``
+        :rtype: str
+        """
+        return self._get(
+            "mode",
+            lambda: get_cpe_provisioning_mode(self._board),
+            frozenset((FACTORY_RESET,)),
+        )
+
+    @property
+    def firmware(self) -> str:
+        """Return the CPE software version.
+
+        :return: software version
+        :rtype: str
+        """
+        return self._get("firmware", lambda: str(self._board.sw.version), _STATE_EVENTS)
+
+    @property
+    def erouter_addresses(self) -> IPAddresses:
+        """Return the eRouter WAN addresses.
+
+        :return: IPv4, IPv6 and link-local IPv6 address
+        :rtype: IPAddresses
+        """
+        return self._get(
+            "erouter_addresses",
+            lambda: get_erouter_addresses(retry_count=3, board=self._board),
+            _ADDRESS_EVENTS,
+        )
+
+    @property
+    def erouter_mac(self) -> str:
+        """Return the MAC address of the eRouter WAN interface.
+
+        :return: MAC address
+        :rtype: str
+        """
+        return self._get(
+            "erouter_mac",
+            lambda: get_interface_mac_addr(self._board, self._board.sw.erouter_iface),
+            _NEVER,
+        )
+
+    def lan_mac(self, lan: LAN) -> str:
+        """Return the MAC address of a LAN client interface facing the CPE.
+
+        :param lan: LAN client device instance
+        :type lan: LAN
+        :return: MAC address, as reported by the client
+        :rtype: str
+        """
+        return self._get(
+            f"lan_mac/{lan.device_name}",
+            lambda: lan.get_interface_macaddr(lan.iface_dut),
+            _NEVER,
+        )
+
+    def invalidate(self, event: str) -> None:
+        """Drop the facts made stale by a board event.
+
+        :param event: ``REBOOT``, ``FACTORY_RESET`` or ``DHCP_RENEW``
+        :type event: str
+        """
+        stale = [name for name, (_, events) in self._values.items() if event in events]
+        for name in stale:
+            del self._values[name]
+        _LOGGER.debug("%s dropped %s from the board facts", event, stale)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the cache counters, misses being the console reads done.
+
+        :return: ``hits`` and ``misses``
+        :rtype: dict[str, int]
+        """
+        return {"hits": self.hits, "misses": self.misses}
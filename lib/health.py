@@ -0,0 +1,190 @@
+"""Probe the health of a CPE and recover only what is missing."""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Any
+
+from boardfarm3.exceptions import TeardownError
+from boardfarm3.use_cases.erouter import verify_erouter_ip_address
+from boardfarm3.use_cases.online_usecases import (
+    is_board_online_after_reset,
+    power_cycle,
+)
+from boardfarm3.use_cases.tr069 import is_dut_online_on_acs
+
+from lib.erouter import wait_for_erouter_ip
+from lib.retry import Retrier
+from lib.tr069.wait import wait_for_acs_registration
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from boardfarm3.templates.acs import ACS
+    from boardfarm3.templates.cpe import CPE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class HealthReport:
+    """Outcome of every health check, truthy when nothing is missing.
+
+    ``acs`` is None when no ACS was probed.
+    """
+
+    console: bool = False
+    cm: bool = False
+    erouter: bool = False
+    acs: bool | None = None
+    elapsed: float = 0.0
+
+    @property
+    def missing(self) -> list[str]:
+        """Return the names of the failed checks.
+
+        :return: failed checks, empty when healthy
+        :rtype: list[str]
+        """
+        return [
+            field.name
+            for field in fields(self)
+            if field.name != "elapsed" and getattr(self, field.name) is False
+        ]
+
+    def __bool__(self) -> bool:
+        """Return whether the board is healthy.
+
+        :return: True if every probed check passed
+        :rtype: bool
+        """
+        return not self.missing
+
+
+def _check(name: str, func: Callable[[], Any]) -> bool:
+    try:
+        return bool(func())
+    except Exception as exc:  # noqa: BLE001  # pylint: disable=broad-except
+        _LOGGER.debug("health check %s failed: %s", name, exc)
+        return False
+
+
+def probe_health(board: CPE, mode: str, acs: ACS | None = None) -> HealthReport:
+    """Check the CPE console, CM, eRouter addresses and ACS registration.
+
+    The ACS is asked in parallel with the checks on the CPE. Those share the
+    CPE consoles and run one after another, stopping at an unresponsive
+    console, so a healthy board is probed in a few seconds.
+
+    :param board: CPE device instance
+    :type board: CPE
+    :param mode: expected eRouter provisioning mode
+    :type mode: str
+    :param acs: ACS the CPE has to be registered on, defaults to not
+        probing the ACS
+    :type acs: ACS | None
+    :return: outcome of every check
+    :rtype: HealthReport
+    """
+    start = time.monotonic()
+    report = HealthReport()
+    with ThreadPoolExecutor(1) as pool:
+        acs_online = (
+            pool.submit(_check, "acs", lambda: is_dut_online_on_acs(acs, board))
+            if acs is not None
+            else None
+        )
+        report.console = _check("console", board.sw.get_seconds_uptime)
+        if report.console:
+            report.cm = _check("cm", is_board_online_after_reset)
+            report.erouter = _check(
+                "erouter", lambda: verify_erouter_ip_address(mode, board, 1)
+            )
+        if acs_online is not None:
+            report.acs = acs_online.result()
+    report.elapsed = time.monotonic() - start
+    _LOGGER.info(
+        "health probe done in %.1fs, missing: %s",
+        report.elapsed,
+        ", ".join(report.missing) or "nothing",
+    )
+    return report
+
+
+def recover(
+    board: CPE,
+    mode: str,
+    acs: ACS | None = None,
+    retrier: Retrier | None = None,
+) -> HealthReport:
+    """Bring the CPE back to health with the least disruptive action.
+
+    A healthy board is left alone. A board that only lacks its eRouter
+    addresses or ACS registration is given the time to get them; the board
+    is power cycled only when its console or CM is down, or waiting did not
+    help.
+
+    >>> health = recover(board, mode, acs, retrier)
+    >>> assert health, f"DUT not healthy: {', '.join(health.missing)}"
+
+    :param board: CPE device instance
+    :type board: CPE
+    :param mode: expected eRouter provisioning mode
+    :type mode: str
+    :param acs: ACS the CPE has to be registered on, defaults to none
+    :type acs: ACS | None
+    :param retrier: retrier of the test, defaults to a new one
+    :type retrier: Retrier | None
+    :return: health after the recovery
+    :rtype: HealthReport
+    """
+    retrier = retrier or Retrier()
+    report = probe_health(board, mode, acs)
+    if report:
+        return report
+    if report.console and report.cm:
+        _LOGGER.info("waiting for %s instead of rebooting", ", ".join(report.missing))
+        if not report.erouter:
+            wait_for_erouter_ip(board, mode, timeout=180)
+        if acs is not None:
+            wait_for_acs_registration(acs, board, timeout=120)
+        report = probe_health(board, mode, acs)
+        if report:
+            return report
+    _LOGGER.info("power cycling, missing: %s", ", ".join(report.missing))
+    cycled = time.monotonic()
+    power_cycle(board)
+    if retrier.call(
+        "board online after reset", is_board_online_after_reset, timeout=150
+    ):
+        wait_for_erouter_ip(board, mode)
+        if acs is not None:
+            wait_for_acs_registration(acs, board, since=cycled)
+    return probe_health(board, mode, acs)
+
+
+def ensure_recovered(
+    board: CPE,
+    mode: str,
+    acs: ACS | None = None,
+    retrier: Retrier | None = None,
+) -> None:
+    """Recover the CPE in teardown, see :func:`recover`.
+
+    :param board: CPE device instance
+    :type board: CPE
+    :param mode: expected eRouter provisioning mode
+    :type mode: str
+    :param acs: ACS the CPE has to be registered on, defaults to none
+    :type acs: ACS | None
+    :param retrier: retrier of the test, defaults to a new one
+    :type retrier: Retrier | None
+    :raises TeardownError: if the CPE is still not healthy
+    """
+    health = recover(board, mode, acs, retrier)
+    if not health:
+        msg = f"DUT not healthy in teardown, missing {', '.join(health.missing)}"
+        raise TeardownError(msg)
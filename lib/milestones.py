@@ -0,0 +1,214 @@
+"""Wait for named milestones in a console stream instead of polling."""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import pexpect
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+# boot log lines of RDK-B CPEs, boards logging differently pass their own
+CM_OPERATIONAL = r"(?i)cm[\w -]*status\W+operational|docsis registration complete"
+TR069_STARTED = r"CcspTr069PaSsp"
+
+
+@dataclass
+class MilestoneTiming:
+    """When a milestone was reached, relative to the start of the wait."""
+
+    name: str
+    elapsed: float | None = None
+    line: str = ""
+    missed_deadline: bool = False
+
+    @property
+    def reached(self) -> bool:
+        """Return whether the milestone was seen.
+
+        :return: True if the milestone pattern matched
+        :rtype: bool
+        """
+        return self.elapsed is not None
+
+
+@dataclass
+class Milestone:
+    """A named console pattern with an optional deadline and callback."""
+
+    name: str
+    pattern: str
+    deadline: float | None = None
+    callback: Callable[[MilestoneTiming], None] | None = None
+
+
+class MilestoneWaiter:  # pylint: disable=too-few-public-methods
+    """Follow a console and time the milestones as their lines appear.
+
+    The console is read with ``expect`` on the patterns of all pending
+    milestones, so a milestone is recorded as soon as its line is printed.
+    ``command`` is run in the foreground for the duration of the wait, e.g.
+    ``ip monitor address``; with ``refresh`` it is interrupted and started
+    again periodically, which lets a command that first prints the current
+    state catch changes that happened while it was not running.
+
+    >>> waiter = MilestoneWaiter(
+    ...     board.hw.get_console("console"),
+    ...     [Milestone("tr069_started", "CcspTr069PaSsp", deadline=300)],
+    ... )
+    >>> timings = waiter.wait(timeout=720)
+    """
+
+    def __init__(
+        self,
+        console: Any,  # noqa: ANN401
+        milestones: list[Milestone],
+        command: str | None = None,
+        refresh: float | None = None,
+    ) -> None:
+        """Initialize the waiter.
+
+        :param console: pexpect based device console
+        :type console: Any
+        :param milestones: milestones to wait for
+        :type milestones: list[Milestone]
+        :param command: foreground command producing the stream, defaults to
+            following the console output as it is
+        :type command: str | None
+        :param refresh: seconds after which ``command`` is restarted,
+            defaults to never
+        :type refresh: float | None
+        """
+        self._console = console
+        self._milestones = milestones
+        self._command = command
+        self._refresh = refresh
+
+    def wait(self, timeout: float) -> dict[str, MilestoneTiming]:
+        """Wait until every milestone is reached or the timeout expires.
+
+        A milestone that misses its deadline is logged and flagged but still
+        awaited until the timeout, so its real timing is known. When the
+        console closes, e.g. as the board reboots, the wait ends with the
+        milestones reached so far.
+
+        :param timeout: overall timeout in seconds
+        :type timeout: float
+        :return: timing of every milestone by name, unreached ones have no
+            ``elapsed``
+        :rtype: dict[str, MilestoneTiming]
+        """
+        start = time.monotonic()
+        timings = {item.name: MilestoneTiming(item.name) for item in self._milestones}
+        pending = list(self._milestones)
+        restart_at = self._start_command(start)
+        alive = True
+        try:
+            while pending and (now := time.monotonic()) < start + timeout:
+                wakeups = [start + timeout, restart_at]
+                wakeups += [
+                    start + item.deadline
+                    for item in pending
+                    if item.deadline is not None
+                    and not timings[item.name].missed_deadline
+                ]
+                index = self._console.expect(
+                    [*(re.compile(item.pattern) for item in pending), pexpect.TIMEOUT],
+                    timeout=max(min(wakeups) - now, 0.0),
+                )
+                now = time.monotonic()
+                if index < len(pending):
+                    item = pending.pop(index)
+                    self._reached(item, timings[item.name], now - start)
+                    continue
+                for item in pending:
+                    self._check_deadline(item, timings[item.name], now - start)
+                if now >= restart_at:
+                    self._stop_command()
+                    restart_at = self._start_command(now)
+        except pexpect.EOF:
+            alive = False
+            _LOGGER.warning(
+                "console closed after %.1fs, not reached: %s",
+                time.monotonic() - start,
+                ", ".join(item.name for item in pending),
+            )
+        finally:
+            if alive:
+                self._stop_command()
+        return timings
+
+    def _reached(
+        self, milestone: Milestone, timing: MilestoneTiming, elapsed: float
+    ) -> None:
+        timing.elapsed = elapsed
+        timing.line = str(self._console.after).strip()
+        timing.missed_deadline = (
+            milestone.deadline is not None and elapsed > milestone.deadline
+        )
+        _LOGGER.info("milestone %s reached after %.1fs", milestone.name, elapsed)
+        if milestone.callback:
+            milestone.callback(timing)
+
+    @staticmethod
+    def _check_deadline(
+        milestone: Milestone, timing: MilestoneTiming, elapsed: float
+    ) -> None:
+        if (
+            milestone.deadline is not None
+            and elapsed >= milestone.deadline
+            and not timing.missed_deadline
+        ):
+            timing.missed_deadline = True
+            _LOGGER.warning(
+                "milestone %s missed its %ss deadline",
+                milestone.name,
+                milestone.deadline,
+            )
+
+    def _start_command(self, now: float) -> float:
+        if self._command:
+            self._console.sendline(self._command)
+        if self._command and self._refresh:
+            return now + self._refresh
+        return float("inf")
+
+    def _stop_command(self) -> None:
+        if self._command:
+            self._console.sendcontrol("c")
+            self._console.execute_command("")
+
+
+def boot_milestones(
+    deadline: float | None = None,
+    callback: Callable[[MilestoneTiming], None] | None = None,
+    cm_operational: str = CM_OPERATIONAL,
+    tr069_started: str = TR069_STARTED,
+) -> list[Milestone]:
+    """Return the boot log milestones of a CPE, followed on its console.
+
+    They are awaited from the power cycle or reset on, without a command,
+    while :func:`lib.erouter.erouter_milestones` follow the addresses.
+
+    :param deadline: seconds each milestone may take, defaults to none
+    :type deadline: float | None
+    :param callback: called with the timing of each milestone
+    :type callback: Callable[[MilestoneTiming], None] | None
+    :param cm_operational: pattern of the cable modem operational line
+    :type cm_operational: str
+    :param tr069_started: pattern of the TR-069 agent start line
+    :type tr069_started: str
+    :return: ``cm_operational`` and ``tr069_started`` milestones
+    :rtype: list[Milestone]
+    """
+    return [
+        Milestone("cm_operational", cm_operational, deadline, callback),
+        Milestone("tr069_started", tr069_started, deadline, callback),
+    ]
@@ -0,0 +1,166 @@
+"""Order the collected tests to minimise board state transitions.
+
+Tests that only read state run first and tests that reboot, factory reset
+or reprovision the board run last, across the whole session, so a read-only
+test never waits for a board coming back from another test. The board cost
+of a test is declared with::
+
+    @pytest.mark.board_cost("reset")
+
+tests without the marker change nothing, except those using a fixture
+that resets the board once for all tests using it; those run next to each
+other. Tests whose ``env_req`` does not match the board are skipped by
+boardfarm, so the provisioning mode plays no part in the order. Enabled by
+listing the module in ``pytest_plugins``; ``--no-cost-order`` keeps the
+collection order.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+# seconds the board needs to get back to a usable state after each kind
+TRANSITION_COST = {"none": 0.0, "reboot": 180.0, "reset": 600.0, "reprovision": 900.0}
+RANK = {"none": 0, "reboot": 1, "reset": 2, "reprovision": 3}
+# fixtures that factory reset the board once for all the tests using them
+_RESET_FIXTURES = ("dhcpv6_reset_capture",)
+_COST_ORDER = pytest.StashKey[str]()
+
+
+@dataclass(frozen=True)
+class TestCost:
+    """Board cost of one test and the fixture it shares the cost with."""
+
+    __test__ = False  # not a test class
+
+    kind: str
+    shared: str | None = None
+
+
+def board_cost(item: pytest.Item) -> TestCost:
+    """Return the board cost of a collected test.
+
+    :param item: collected test
+    :type item: pytest.Item
+    :return: cost kind and the fixture paying it, if shared
+    :rtype: TestCost
+    """
+    if marker := item.get_closest_marker("board_cost"):
+        return TestCost(marker.args[0])
+    fixtures = set(getattr(item, "fixturenames", ()))
+    shared = next((name for name in _RESET_FIXTURES if name in fixtures), None)
+    return TestCost("reset" if shared else "none", shared)
+
+
+def estimate(costs: Sequence[TestCost]) -> tuple[int, float]:
+    """Count the board state transitions of a test order and their cost.
+
+    Every test that reboots or resets the board is a transition, except
+    that a cost shared through a fixture is paid by its first test only.
+    The count is the same for any order; :func:`order` only changes when
+    the transitions happen.
+
+    :param costs: test costs in run order
+    :type costs: Sequence[TestCost]
+    :return: number of transitions and their estimated seconds
+    :rtype: tuple[int, float]
+    """
+    transitions, seconds = 0, 0.0
+    paid: set[str] = set()
+    for cost in costs:
+        if cost.kind == "none" or cost.shared in paid:
+            continue
+        if cost.shared is not None:
+            paid.add(cost.shared)
+        transitions += 1
+        seconds += TRANSITION_COST[cost.kind]
+    return transitions, seconds
+
+
+def order(costs: Sequence[TestCost]) -> list[int]:
+    """Return the run order, as indices into ``costs``, cheapest first.
+
+    Tests run by increasing cost and tests sharing a fixture cost follow
+    each other. The sort is stable so equal tests keep their collection
+    order.
+
+    :param costs: test costs in collection order
+    :type costs: Sequence[TestCost]
+    :return: indices in run order
+    :rtype: list[int]
+    """
+    return sorted(
+        range(len(costs)),
+        key=lambda index: (RANK[costs[index].kind], costs[index].shared or ""),
+    )
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the option to keep the collection order.
+
+    :param parser: pytest argument parser
+    :type parser: pytest.Parser
+    """
+    parser.addoption(
+        "--no-cost-order",
+        action="store_true",
+        help="do not reorder tests by their board cost",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the board_cost marker.
+
+    :param config: pytest config
+    :type config: pytest.Config
+    """
+    config.addinivalue_line(
+        "markers",
+        "board_cost(kind): board state change made by the test, "
+        "one of none, reboot, reset, reprovision",
+    )
+    config.stash[_COST_ORDER] = ""
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Reorder the tests by board cost.
+
+    :param config: pytest config
+    :type config: pytest.Config
+    :param items: collected tests, reordered in place
+    :type items: list[pytest.Item]
+    """
+    if config.getoption("--no-cost-order") or len(items) < 2:  # noqa: PLR2004
+        return
+    costs = [board_cost(item) for item in items]
+    new_order = order(costs)
+    first_costly = next(
+        (rank for rank, index in enumerate(new_order) if costs[index].kind != "none"),
+        len(new_order),
+    )
+    items[:] = [items[index] for index in new_order]
+    transitions, seconds = estimate(costs)
+    config.stash[_COST_ORDER] = (
+        f"board cost ordering: {first_costly} read-only tests first, then "
+        f"{transitions} state transitions, estimated {seconds / 60:.1f} min"
+    )
+
+
+def pytest_report_collectionfinish(config: pytest.Config) -> str:
+    """Report the read-only tests and the transitions of the run.
+
+    :param config: pytest config
+    :type config: pytest.Config
+    :return: summary line, empty when the order was kept
+    :rtype: str
+    """
+    return config.stash[_COST_ORDER]
@@ -0,0 +1,191 @@
+"""Read pcap files and reassemble TCP streams without external tools."""
+
+from __future__ import annotations
+
+import itertools
+import struct
+from dataclasses import dataclass, field
+from ipaddress import IPv4Address, IPv6Address
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+Endpoint = tuple[str, int]
+Flow = tuple[Endpoint, Endpoint]
+
+# magic number -> (byte order, timestamp fraction unit)
+_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6),
+    b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9),
+    b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+}
+# link type -> length of the link layer header
+_LINK_HEADER = {
+    0: 4,  # BSD loopback
+    1: 14,  # Ethernet
+    12: 0,  # raw IP
+    101: 0,  # raw IP
+    113: 16,  # Linux cooked capture, tcpdump -i any
+    276: 20,  # Linux cooked capture v2, tcpdump -i any
+}
+_VLAN_TPIDS = (b"\x81\x00", b"\x88\xa8")
+_TCP = 6
+_SYN = 0x02
+_ACK = 0x10
+# out-of-order segments held per direction before the gap is given up on
+_MAX_PENDING = 1024
+
+
+def read_packets(source: IO[bytes]) -> Iterator[tuple[float, bytes]]:
+    """Yield the network layer of every packet in a pcap file.
+
+    :param source: binary file object positioned at the pcap header
+    :type source: IO[bytes]
+    :yield: capture timestamp and packet bytes from the IP header on
+    :raises ValueError: when the file is not a pcap or the link type is unknown
+    """
+    header = source.read(24)
+    if len(header) < 24 or header[:4] not in _MAGIC:  # noqa: PLR2004
+        msg = "not a pcap file (pcapng is not supported, use tcpdump -w)"
+        raise ValueError(msg)
+    order, unit = _MAGIC[header[:4]]
+    link_type = struct.unpack_from(f"{order}I", header, 20)[0] & 0x0FFFFFFF
+    if link_type not in _LINK_HEADER:
+        msg = f"unsupported pcap link type {link_type}"
+        raise ValueError(msg)
+    record = struct.Struct(f"{order}IIII")
+    while len(raw := source.read(record.size)) == record.size:
+        seconds, fraction, length, _ = record.unpack(raw)
+        data = source.read(length)
+        offset = _LINK_HEADER[link_type]
+        if link_type == 1:
+            while data[offset - 2 : offset] in _VLAN_TPIDS:
+                offset += 4
+        yield seconds + fraction * unit, data[offset:]
+
+
+@dataclass
+class TcpSegment:
+    """TCP header fields and payload of one packet."""
+
+    src: Endpoint
+    dst: Endpoint
+    seq: int
+    flags: int
+    payload: bytes
+
+    @property
+    def flow(self) -> Flow:
+        """Direction of the segment.
+
+        :return: source and destination endpoints
+        :rtype: Flow
+        """
+        return self.src, self.dst
+
+
+def tcp_segment(data: bytes) -> TcpSegment | None:
+    """Decode an IPv4/IPv6 TCP packet.
+
+    :param data: packet bytes starting at the IP header
+    :type data: bytes
+    :return: the TCP segment, None when the packet is not TCP
+    :rtype: TcpSegment | None
+    """
+    if len(data) < 20:  # noqa: PLR2004
+        return None
+    if data[0] >> 4 == 4:  # noqa: PLR2004
+        offset, proto = (data[0] & 0x0F) * 4, data[9]
+        src, dst = str(IPv4Address(data[12:16])), str(IPv4Address(data[16:20]))
+        end = struct.unpack_from("!H", data, 2)[0]
+    elif data[0] >> 4 == 6 and len(data) >= 40:  # noqa: PLR2004
+        offset, proto = 40, data[6]
+        src, dst = str(IPv6Address(data[8:24])), str(IPv6Address(data[24:40]))
+        end = 40 + struct.unpack_from("!H", data, 4)[0]
+    else:
+        return None
+    if proto != _TCP or len(data) < offset + 20:
+        return None
+    sport, dport, seq = struct.unpack_from("!HHI", data, offset)
+    start = offset + (data[offset + 12] >> 4) * 4
+    return TcpSegment(
+        (src, sport), (dst, dport), seq, data[offset + 13], data[start:end]
+    )
+
+
+@dataclass
+class _Direction:
+    next_seq: int | None = None
+    pending: dict[int, bytes] = field(default_factory=dict)
+
+
+class TcpReassembler:
+    """Put the payload of each TCP direction back in order.
+
+    Retransmitted bytes are dropped and out-of-order segments are held
+    until the gap is filled, or skipped when the capture missed it and too
+    many segments pile up behind it. Every connection gets a session
+    number, a new SYN on the same address pair starts a new session.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the reassembler."""
+        self._directions: dict[Flow, _Direction] = {}
+        self._sessions: dict[frozenset[Endpoint], int] = {}
+        self._session_ids = itertools.count(1)
+
+    def session(self, flow: Flow) -> int:
+        """Return the session number of a flow.
+
+        :param flow: source and destination endpoints, either direction
+        :type flow: Flow
+        :return: session number, starting at 1
+        :rtype: int
+        """
+        key = frozenset(flow)
+        if key not in self._sessions:
+            self._sessions[key] = next(self._session_ids)
+        return self._sessions[key]
+
+    def feed(self, segment: TcpSegment) -> bytes:
+        """Add a segment.
+
+        :param segment: the decoded segment
+        :type segment: TcpSegment
+        :return: payload bytes that became contiguous with this segment
+        :rtype: bytes
+        """
+        if segment.flags & (_SYN | _ACK) == _SYN:
+            self._sessions.pop(frozenset(segment.flow), None)
+            self._directions.pop((segment.dst, segment.src), None)
+        self.session(segment.flow)
+        direction = self._directions.setdefault(segment.flow, _Direction())
+        if segment.flags & _SYN:
+            direction.next_seq = (segment.seq + 1) & 0xFFFFFFFF
+            direction.pending.clear()
+            return b""
+        if direction.next_seq is None:
+            # the capture started mid-connection
+            direction.next_seq = segment.seq
+        delta = (segment.seq - direction.next_seq) & 0xFFFFFFFF
+        if delta >= 1 << 31:
+            # starts before the expected byte, keep only the new part
+            skip = (1 << 32) - delta
+            if skip >= len(segment.payload):
+                return b""
+            direction.pending[direction.next_seq] = segment.payload[skip:]
+        elif segment.payload:
+            direction.pending.setdefault(segment.seq, segment.payload)
+        if len(direction.pending) > _MAX_PENDING:
+            # the missing bytes were not captured, resume after the gap
+            expected = direction.next_seq
+            direction.next_seq = min(
+                direction.pending, key=lambda seq: (seq - expected) & 0xFFFFFFFF
+            )
+        data = b""
+        while (chunk := direction.pending.pop(direction.next_seq, None)) is not None:
+            data += chunk
+            direction.next_seq = (direction.next_seq + len(chunk)) & 0xFFFFFFFF
+        return data
@@ -0,0 +1,94 @@
+"""Wait until an observed value converges instead of sleeping blindly."""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class WaitResult:
+    """Outcome of :func:`wait_until`, truthy when the wait converged."""
+
+    converged: bool
+    value: Any
+    elapsed: float
+    attempts: int
+
+    def __bool__(self) -> bool:
+        """Return whether the wait converged.
+
+        :return: True if the predicate was satisfied before the deadline
+        :rtype: bool
+        """
+        return self.converged
+
+
+def wait_until(  # pylint: disable=too-many-arguments
+    predicate: Callable[[], Any],
+    timeout: float,
+    interval: float = 1.0,
+    max_interval: float = 10.0,
+    backoff: float = 1.5,
+    description: str = "condition",
+) -> WaitResult:
+    """Poll a predicate until it returns a truthy value or the deadline passes.
+
+    The poll interval starts at ``interval`` and grows by ``backoff`` up to
+    ``max_interval``, so fast transitions are caught quickly while slow ones
+    do not flood the device. The last poll is aligned with the deadline.
+    Exceptions raised by the predicate count as a failed attempt.
+
+    >>> assert wait_until(lambda: board.sw.is_online(), timeout=120)
+
+    :param predicate: callable returning a truthy value once converged
+    :type predicate: Callable[[], Any]
+    :param timeout: deadline in seconds
+    :type timeout: float
+    :param interval: first poll interval in seconds, defaults to 1.0
+    :type interval: float
+    :param max_interval: upper bound of the poll interval, defaults to 10.0
+    :type max_interval: float
+    :param backoff: interval growth factor, defaults to 1.5
+    :type backoff: float
+    :param description: what is awaited, used in the log
+    :type description: str
+    :return: result with the last value, elapsed time and attempts
+    :rtype: WaitResult
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    attempts = 0
+    value = None
+    while True:
+        attempts += 1
+        try:
+            value = predicate()
+        except Exception as exc:  # noqa: BLE001  # pylint: disable=broad-except
+            _LOGGER.debug("%s: attempt %d failed (%s)", description, attempts, exc)
+            value = None
+        now = time.monotonic()
+        if value:
+            _LOGGER.info(
+                "%s converged after %.1fs (%d attempts)",
+                description,
+                now - start,
+                attempts,
+            )
+            return WaitResult(
+                converged=True, value=value, elapsed=now - start, attempts=attempts
+            )
+        if now >= deadline:
+            _LOGGER.info("%s did not converge within %ss", description, timeout)
+            return WaitResult(
+                converged=False, value=value, elapsed=now - start, attempts=attempts
+            )
+        time.sleep(min(interval, deadline - now))
+        interval = min(interval * backoff, max_interval)
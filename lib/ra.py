@@ -0,0 +1,454 @@
+"""Typed ICMPv6 Router Advertisements, decoded from a pcap or solicited."""
+
+from __future__ import annotations
+
+import logging
+import statistics
+import struct
+import tempfile
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from ipaddress import IPv6Address, IPv6Network
+from itertools import pairwise
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, overload
+
+from lib.pcap import read_packets
+from lib.polling import wait_until
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from boardfarm3.templates.lan import LAN
+
+_LOGGER = logging.getLogger(__name__)
+
+_ICMPV6 = 58
+# hop-by-hop, routing and destination options headers
+_EXTENSION_HEADERS = (0, 43, 60)
+_ROUTER_ADVERTISEMENT = 134
+_RA_HEADER = struct.Struct("!BBHBBHII")
+_PREFERENCE = {0: "medium", 1: "high", 2: "reserved", 3: "low"}
+
+# option types
+_SOURCE_LINK_ADDRESS = 1
+_PREFIX_INFORMATION = 3
+_MTU = 5
+_RDNSS = 25
+
+
+@dataclass
+class PrefixInfo:
+    """Prefix Information option of an RA."""
+
+    prefix: IPv6Network
+    on_link: bool
+    autonomous: bool
+    valid_lifetime: int
+    preferred_lifetime: int
+
+
+@dataclass
+class RouterAdvertisement:  # pylint: disable=too-many-instance-attributes
+    """One Router Advertisement seen on the wire."""
+
+    timestamp: float
+    source: str
+    destination: str
+    hop_limit: int
+    managed: bool
+    other: bool
+    preference: str
+    router_lifetime: int
+    reachable_time: int
+    retrans_timer: int
+    mtu: int | None = None
+    source_link_address: str | None = None
+    prefixes: list[PrefixInfo] = field(default_factory=list)
+    rdnss: list[IPv6Address] = field(default_factory=list)
+    rdnss_lifetime: int | None = None
+
+
+def _icmpv6_offset(data: bytes) -> int | None:
+    if len(data) < 40 or data[0] >> 4 != 6:  # noqa: PLR2004
+        return None
+    next_header, offset = data[6], 40
+    while next_header in _EXTENSION_HEADERS and len(data) >= offset + 8:
+        next_header, offset = data[offset], offset + (data[offset + 1] + 1) * 8
+    return offset if next_header == _ICMPV6 else None
+
+
+def _options(ra: RouterAdvertisement, data: bytes) -> None:
+    offset = 0
+    while offset + 2 <= len(data) and (length := data[offset + 1] * 8):
+        option, body = data[offset], data[offset + 2 : offset + length]
+        if option == _MTU and len(body) >= 6:  # noqa: PLR2004
+            ra.mtu = struct.unpack_from("!I", body, 2)[0]
+        elif option == _SOURCE_LINK_ADDRESS:
+            ra.source_link_address = body[:6].hex(":")
+        elif option == _PREFIX_INFORMATION and len(body) >= 30:  # noqa: PLR2004
+            valid, preferred = struct.unpack_from("!II", body, 2)
+            ra.prefixes.append(
+                PrefixInfo(
+                    IPv6Network((body[14:30], body[0]), strict=False),
+                    bool(body[1] & 0x80),
+                    bool(body[1] & 0x40),
+                    valid,
+                    preferred,
+                )
+            )
+        elif option == _RDNSS and len(body) >= 6:  # noqa: PLR2004
+            ra.rdnss_lifetime = struct.unpack_from("!I", body, 2)[0]
+            ra.rdnss += [
+                IPv6Address(body[start : start + 16])
+                for start in range(6, len(body) - 15, 16)
+            ]
+        offset += length
+
+
+def router_advertisement(timestamp: float, data: bytes) -> RouterAdvertisement | None:
+    """Decode an IPv6 packet carrying a Router Advertisement.
+
+    :param timestamp: capture timestamp of the packet
+    :type timestamp: float
+    :param data: packet bytes from the IPv6 header on
+    :type data: bytes
+    :return: the RA, None when the packet is not an RA
+    :rtype: RouterAdvertisement | None
+    """
+    offset = _icmpv6_offset(data)
+    if offset is None or len(data) < offset + _RA_HEADER.size:
+        return None
+    icmp_type, _, _, hop_limit, flags, lifetime, reachable, retrans = (
+        _RA_HEADER.unpack_from(data, offset)
+    )
+    if icmp_type != _ROUTER_ADVERTISEMENT:
+        return None
+    ra = RouterAdvertisement(
+        timestamp=timestamp,
+        source=str(IPv6Address(data[8:24])),
+        destination=str(IPv6Address(data[24:40])),
+        hop_limit=hop_limit,
+        managed=bool(flags & 0x80),
+        other=bool(flags & 0x40),
+        preference=_PREFERENCE[(flags >> 3) & 0x03],
+        router_lifetime=lifetime,
+        reachable_time=reachable,
+        retrans_timer=retrans,
+    )
+    end = 40 + struct.unpack_from("!H", data, 4)[0]
+    _options(ra, data[offset + _RA_HEADER.size : end])
+    return ra
+
+
+class RaTrace(Sequence[RouterAdvertisement]):
+    """Router Advertisements in time order, indexed by MTU and router.
+
+    Time windows are bisected and the MTU index is built once, so queries
+    over thousands of RAs stay cheap.
+
+    >>> trace = RaTrace.from_pcap(open("lan.pcap", "rb"))
+    >>> assert trace.all_carry_mtu(1400, after=spv_time)
+    >>> trace.interval_stats()["max"]
+    """
+
+    def __init__(self, advertisements: Sequence[RouterAdvertisement]) -> None:
+        """Initialize the trace.
+
+        :param advertisements: RAs in any order
+        :type advertisements: Sequence[RouterAdvertisement]
+        """
+        self._all = sorted(advertisements, key=lambda ra: ra.timestamp)
+        self._times = [ra.timestamp for ra in self._all]
+        self._by_mtu: defaultdict[int | None, list[RouterAdvertisement]] = defaultdict(
+            list
+        )
+        for ra in self._all:
+            self._by_mtu[ra.mtu].append(ra)
+
+    @classmethod
+    def from_pcap(cls, source: IO[bytes]) -> RaTrace:
+        """Decode the RAs of a pcap file.
+
+        :param source: binary file object of the pcap
+        :type source: IO[bytes]
+        :return: the trace
+        :rtype: RaTrace
+        """
+        return cls(
+            [
+                ra
+                for timestamp, data in read_packets(source)
+                if (ra := router_advertisement(timestamp, data)) is not None
+            ]
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> RouterAdvertisement: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[RouterAdvertisement]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> RouterAdvertisement | list[RouterAdvertisement]:
+        """Return RAs in time order.
+
+        :param index: position or slice
+        :type index: int | slice
+        :return: the RA(s)
+        :rtype: RouterAdvertisement | list[RouterAdvertisement]
+        """
+        return self._all[index]
+
+    def __len__(self) -> int:
+        """Return the number of RAs.
+
+        :return: number of RAs
+        :rtype: int
+        """
+        return len(self._all)
+
+    def between(
+        self, after: float | None = None, before: float | None = None
+    ) -> list[RouterAdvertisement]:
+        """Return the RAs captured strictly between two times.
+
+        :param after: only RAs captured after this epoch time
+        :type after: float | None
+        :param before: only RAs captured before this epoch time
+        :type before: float | None
+        :return: RAs in time order
+        :rtype: list[RouterAdvertisement]
+        """
+        start = 0 if after is None else bisect_right(self._times, after)
+        end = len(self._times) if before is None else bisect_left(self._times, before)
+        return self._all[start:end]
+
+    def find(
+        self,
+        mtu: int | None = None,
+        source: str | None = None,
+        after: float | None = None,
+    ) -> list[RouterAdvertisement]:
+        """Return the RAs of a router carrying an MTU within a time window.
+
+        :param mtu: MTU option value, defaults to any RA
+        :type mtu: int | None
+        :param source: link-local address of the router, defaults to any
+        :type source: str | None
+        :param after: only RAs captured after this epoch time
+        :type after: float | None
+        :return: matching RAs in time order
+        :rtype: list[RouterAdvertisement]
+        """
+        candidates = self._all if mtu is None else self._by_mtu.get(mtu, [])
+        return [
+            ra
+            for ra in candidates
+            if (after is None or ra.timestamp > after)
+            and (source is None or ra.source == source)
+        ]
+
+    def all_carry_mtu(self, mtu: int, after: float | None = None) -> bool:
+        """Return whether there are RAs after a time and all announce an MTU.
+
+        :param mtu: MTU option value
+        :type mtu: int
+        :param after: only RAs captured after this epoch time
+        :type after: float | None
+        :return: True if at least one RA was captured and all carry the MTU
+        :rtype: bool
+        """
+        window = self.between(after)
+        return bool(window) and all(ra.mtu == mtu for ra in window)
+
+    def intervals(self, source: str | None = None) -> list[float]:
+        """Return the seconds between consecutive RAs of a router.
+
+        :param source: link-local address of the router, defaults to any
+        :type source: str | None
+        :return: intervals in time order
+        :rtype: list[float]
+        """
+        times = [ra.timestamp for ra in self.find(source=source)]
+        return [later - earlier for earlier, later in pairwise(times)]
+
+    def interval_stats(self, source: str | None = None) -> dict[str, Any]:
+        """Summarise the intervals between consecutive RAs.
+
+        :param source: link-local address of the router, defaults to any
+        :type source: str | None
+        :return: count, min, p50, p90 and max in seconds, only the count
+            when fewer than two RAs were captured
+        :rtype: dict[str, Any]
+        """
+        intervals = self.intervals(source)
+        if not intervals:
+            return {"count": 0}
+        cuts = (
+            statistics.quantiles(intervals, n=100, method="inclusive")
+            if len(intervals) > 1
+            else intervals * 99
+        )
+        return {
+            "count": len(intervals),
+            "min": min(intervals),
+            "p50": cuts[49],
+            "p90": cuts[89],
+            "max": max(intervals),
+        }
+
+
+def load_ra_trace(device: Any, fname: str) -> RaTrace:  # noqa: ANN401
+    """Copy a pcap from a device and decode its Router Advertisements.
+
+    :param device: device holding the pcap, usually a LAN client
+    :type device: Any
+    :param fname: pcap file path on the device
+    :type fname: str
+    :return: the trace
+    :rtype: RaTrace
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        local_path = Path(tmp, Path(fname).name)
+        device.scp_device_file_to_local(str(local_path), fname)
+        with local_path.open("rb") as source:
+            return RaTrace.from_pcap(source)
+
+
+def _rdisc6_value(key: str, value: str) -> int:
+    number = value.split()[0] if value else ""
+    if number == "infinite":
+        return 0xFFFFFFFF
+    if number.isdigit():
+        return int(number)
+    _LOGGER.debug("rdisc6 %s is %r", key, value)
+    return 0
+
+
+def parse_rdisc6(output: str, timestamp: float) -> RouterAdvertisement | None:
+    """Build an RA record from the report ``rdisc6`` prints for it.
+
+    rdisc6 does not report the destination address, it is left empty.
+
+    :param output: rdisc6 output for one RA
+    :type output: str
+    :param timestamp: epoch time the RA was received at
+    :type timestamp: float
+    :return: the RA, None when the output has no RA
+    :rtype: RouterAdvertisement | None
+    """
+    values: dict[str, str] = {}
+    prefixes: list[PrefixInfo] = []
+    rdnss: list[IPv6Address] = []
+    ra = None
+    for line in output.splitlines():
+        key, _, value = (part.strip() for part in line.partition(":"))
+        if key == "Prefix":
+            prefixes.append(
+                PrefixInfo(
+                    IPv6Network(value, strict=False),
+                    on_link=False,
+                    autonomous=False,
+                    valid_lifetime=0,
+                    preferred_lifetime=0,
+                )
+            )
+        elif key == "On-link" and prefixes:
+            prefixes[-1].on_link = value == "Yes"
+        elif key == "Autonomous address conf." and prefixes:
+            prefixes[-1].autonomous = value == "Yes"
+        elif key == "Valid time" and prefixes:
+            prefixes[-1].valid_lifetime = _rdisc6_value(key, value)
+        elif key == "Pref. time" and prefixes:
+            prefixes[-1].preferred_lifetime = _rdisc6_value(key, value)
+        elif key == "Recursive DNS server":
+            rdnss.append(IPv6Address(value))
+        elif key.startswith("from "):
+            ra = RouterAdvertisement(
+                timestamp=timestamp,
+                source=line.strip().removeprefix("from ").split()[0],
+                destination="",
+                hop_limit=_rdisc6_value("Hop limit", values.get("Hop limit", "")),
+                managed=values.get("Stateful address conf.") == "Yes",
+                other=values.get("Stateful other conf.") == "Yes",
+                preference=values.get("Router preference", "medium"),
+                router_lifetime=_rdisc6_value(
+                    "Router lifetime", values.get("Router lifetime", "")
+                ),
+                reachable_time=_rdisc6_value(
+                    "Reachable time", values.get("Reachable time", "")
+                ),
+                retrans_timer=_rdisc6_value(
+                    "Retransmit time", values.get("Retransmit time", "")
+                ),
+                mtu=_rdisc6_value("MTU", values["MTU"]) if "MTU" in values else None,
+                source_link_address=values.get("Source link-layer address"),
+                prefixes=prefixes,
+                rdnss=rdnss,
+                rdnss_lifetime=(
+                    _rdisc6_value("DNS server lifetime", values["DNS server lifetime"])
+                    if "DNS server lifetime" in values
+                    else None
+                ),
+            )
+            break
+        elif value:
+            values[key] = value
+    return ra
+
+
+def solicit_router_advertisement(
+    lan: LAN,
+    predicate: Callable[[RouterAdvertisement], bool] | None = None,
+    after: float | None = None,
+    timeout: float = 30,
+) -> RouterAdvertisement | None:
+    """Send Router Solicitations from a LAN client until a fresh RA answers.
+
+    The CPE answers a solicitation right away instead of at its next
+    periodic RA, so a changed RA setting can be checked in seconds. The
+    solicitation is repeated until an RA received after ``after``, on the
+    LAN client clock, satisfies ``predicate`` or the timeout expires.
+
+    >>> ra = solicit_router_advertisement(lan, lambda ra: ra.mtu == 1400)
+
+    :param lan: LAN client, its console must be free and have ``rdisc6``
+    :type lan: LAN
+    :param predicate: condition on the RA, defaults to any RA
+    :type predicate: Callable[[RouterAdvertisement], bool] | None
+    :param after: epoch time on the LAN client the RA has to be received
+        after, defaults to any time
+    :type after: float | None
+    :param timeout: seconds to keep soliciting, defaults to 30
+    :type timeout: float
+    :return: first matching RA, None on timeout
+    :rtype: RouterAdvertisement | None
+    """
+
+    def _solicit() -> RouterAdvertisement | None:
+        output = lan.console.execute_command(
+            f"rdisc6 -1 -r 3 -w 1000 {lan.iface_dut}; date +%s.%N", timeout=30
+        )
+        lines = output.strip().splitlines()
+        ra = parse_rdisc6(output, float(lines[-1])) if lines else None
+        if (
+            ra is None
+            or (after is not None and ra.timestamp <= after)
+            or (predicate is not None and not predicate(ra))
+        ):
+            return None
+        return ra
+
+    # a router answers solicitations at most every MIN_DELAY_BETWEEN_RAS (3s)
+    result = wait_until(
+        _solicit,
+        timeout,
+        interval=3,
+        max_interval=3,
+        description=f"solicited RA on {lan.device_name}",
+    )
+    return result.value if result else None
@@ -0,0 +1,224 @@
+"""Retry operations with jittered backoff, a per-test budget and learned timing.
+
+A :class:`Retrier` replaces fixed ``retry(func, 6, ...)`` and
+``retry_on_exception(func, (), retries=5, tout=30)`` loops. Each call names
+the operation it retries; the time every operation took to succeed is kept
+in a :class:`LatencyHistory`, and later calls sleep through the part of the
+wait in which the operation never completed before, then poll densely
+around its typical completion time. All calls of a test share one time
+budget, and the retrier reports the attempts of every call and how long a
+success may have gone unnoticed between two polls.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
+
+from lib.polling import WaitResult
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_KEY = "retry/latency"
+# successful latencies kept per operation
+HISTORY_SIZE = 20
+# samples needed before the schedule follows the history
+MIN_SAMPLES = 3
+
+
+class LatencyHistory:
+    """Time to success of named operations, e.g. from earlier test runs."""
+
+    def __init__(self, samples: dict[str, list[float]] | None = None) -> None:
+        """Initialize the history.
+
+        :param samples: latencies in seconds by operation, e.g. as stored
+            by :meth:`to_dict`
+        :type samples: dict[str, list[float]] | None
+        """
+        self._samples = {name: list(values) for name, values in (samples or {}).items()}
+
+    def add(self, operation: str, latency: float) -> None:
+        """Record the time an operation took to succeed.
+
+        :param operation: operation name
+        :type operation: str
+        :param latency: seconds until success
+        :type latency: float
+        """
+        samples = self._samples.setdefault(operation, [])
+        samples.append(round(latency, 3))
+        del samples[:-HISTORY_SIZE]
+
+    def window(self, operation: str) -> tuple[float, float] | None:
+        """Return the span in which the operation usually completes.
+
+        :param operation: operation name
+        :type operation: str
+        :return: 10th and 90th percentile of the latency, None while there
+            are fewer than ``MIN_SAMPLES`` samples
+        :rtype: tuple[float, float] | None
+        """
+        samples = self._samples.get(operation, [])
+        if len(samples) < MIN_SAMPLES:
+            return None
+        deciles = statistics.quantiles(samples, n=10, method="inclusive")
+        return deciles[0], deciles[-1]
+
+    def to_dict(self) -> dict[str, list[float]]:
+        """Return the samples in a JSON serialisable form.
+
+        :return: latencies by operation
+        :rtype: dict[str, list[float]]
+        """
+        return {name: list(values) for name, values in self._samples.items()}
+
+
+@dataclass
+class RetryRecord:
+    """Attempts and timing of one retried call."""
+
+    operation: str
+    converged: bool
+    attempts: int
+    elapsed: float
+    # length of the last sleep, the longest the success could have gone unseen
+    detection_lag: float
+
+
+class Retrier:
+    """Retry operations within the time budget of one test.
+
+    >>> retrier = Retrier(budget=900, history=LatencyHistory())
+    >>> retrier.call("board online", is_board_online_after_reset, timeout=150)
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        budget: float | None = None,
+        history: LatencyHistory | None = None,
+        interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 2.0,
+        jitter: float = 0.2,
+    ) -> None:
+        """Initialize the retrier.
+
+        :param budget: seconds all calls may take together, defaults to
+            no budget
+        :type budget: float | None
+        :param history: learned latencies, updated on every success,
+            defaults to none
+        :type history: LatencyHistory | None
+        :param interval: shortest poll interval in seconds, defaults to 1.0
+        :type interval: float
+        :param max_interval: longest poll interval in seconds, defaults to 30.0
+        :type max_interval: float
+        :param backoff: interval growth factor, defaults to 2.0
+        :type backoff: float
+        :param jitter: relative random spread of every interval,
+            defaults to 0.2
+        :type jitter: float
+        """
+        self._deadline = time.monotonic() + budget if budget is not None else None
+        self.history = history or LatencyHistory()
+        self._interval = interval
+        self._max_interval = max_interval
+        self._backoff = backoff
+        self._jitter = jitter
+        self.records: list[RetryRecord] = []
+
+    @property
+    def remaining(self) -> float:
+        """Return the seconds left in the budget.
+
+        :return: remaining budget, infinite without one
+        :rtype: float
+        """
+        if self._deadline is None:
+            return float("inf")
+        return max(self._deadline - time.monotonic(), 0.0)
+
+    def call(
+        self,
+        operation: str,
+        func: Callable[[], Any],
+        timeout: float,
+        check: Callable[[Any], bool] = bool,
+    ) -> WaitResult:
+        """Call ``func`` until its result passes ``check`` or time runs out.
+
+        Exceptions count as a failed attempt. The call ends at ``timeout`` or
+        when the test budget is spent, whichever comes first, but ``func`` is
+        always tried at least once.
+
+        :param operation: name the latency is learned under
+        :type operation: str
+        :param func: operation to retry
+        :type func: Callable[[], Any]
+        :param timeout: seconds this call may take
+        :type timeout: float
+        :param check: accepts the result of ``func``, defaults to truthiness;
+            pass ``lambda _: True`` to only retry on exceptions
+        :type check: Callable[[Any], bool]
+        :return: result with the last value returned by ``func``
+        :rtype: WaitResult
+        """
+        start = time.monotonic()
+        deadline = start + min(timeout, self.remaining)
+        interval = self._interval
+        attempts, lag, value = 0, 0.0, None
+        while True:
+            attempts += 1
+            try:
+                value = func()
+                converged = check(value)
+            except Exception as exc:  # noqa: BLE001  # pylint: disable=broad-except
+                _LOGGER.debug("%s: attempt %d failed (%s)", operation, attempts, exc)
+                value, converged = None, False
+            now = time.monotonic()
+            if converged or now >= deadline:
+                break
+            lag = min(
+                self._next_delay(now - start, interval, operation), deadline - now
+            )
+            time.sleep(lag)
+            interval = min(interval * self._backoff, self._max_interval)
+        elapsed = now - start
+        if converged:
+            self.history.add(operation, elapsed)
+        self.records.append(RetryRecord(operation, converged, attempts, elapsed, lag))
+        _LOGGER.info(
+            "%s %s after %.1fs (%d attempts)",
+            operation,
+            "succeeded" if converged else "gave up",
+            elapsed,
+            attempts,
+        )
+        return WaitResult(converged, value, elapsed, attempts)
+
+    def _next_delay(self, elapsed: float, interval: float, operation: str) -> float:
+        window = self.history.window(operation)
+        if window is not None and elapsed < window[0]:
+            # it never succeeded this early, sleep until the window opens
+            delay = min(window[0] - elapsed, self._max_interval)
+            return delay * random.uniform(1 - self._jitter, 1)  # noqa: S311
+        if window is not None and elapsed <= window[1]:
+            interval = self._interval
+        return interval * random.uniform(1 - self._jitter, 1 + self._jitter)  # noqa: S311
+
+    def report(self) -> list[dict[str, Any]]:
+        """Return the retried calls of the test, e.g. for ``record_property``.
+
+        :return: one entry per call with attempts, elapsed time and
+            detection lag
+        :rtype: list[dict[str, Any]]
+        """
+        return [asdict(record) for record in self.records]
@@ -0,0 +1,135 @@
+"""Run independent teardown actions concurrently, ordered only where declared."""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from boardfarm3.exceptions import TeardownError
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_WORKERS = 4
+# name of the action bringing the DUT back, later actions on the DUT wait for it
+RECOVER_BOARD = "recover board"
+
+
+@dataclass
+class TeardownAction:
+    """A compensating action, the device it works on and what it waits for."""
+
+    name: str
+    func: Callable[[], Any]
+    device: str | None = None
+    after: tuple[str, ...] = ()
+
+
+def _skip_dependents(
+    pending: dict[str, TeardownAction], errors: dict[str, str]
+) -> None:
+    # a skipped action skips the actions waiting for it as well
+    while skipped := {
+        action.name: failed
+        for action in pending.values()
+        if (failed := [dep for dep in action.after if dep in errors])
+    }:
+        for name, failed in skipped.items():
+            errors[name] = f"skipped, {', '.join(failed)} failed"
+            del pending[name]
+
+
+class TeardownRegistry:
+    """Collect the teardown actions of a test and run them as a graph.
+
+    Actions on the same device run one at a time, actions that declare
+    ``after`` start once those actions succeeded, and all others run
+    concurrently, e.g. copying the provisioner pcap while the CPE reboots.
+    A dependency that was never registered counts as done. Every failure is
+    reported in one :class:`TeardownError` once all runnable actions ran.
+
+    >>> teardown = TeardownRegistry()
+    >>> teardown.register(RECOVER_BOARD, lambda: recover(board, mode), "cpe")
+    >>> teardown.register("restore", restorer.restore, "cpe", [RECOVER_BOARD])
+    >>> teardown.register("copy pcap", copy_pcap, "provisioner")
+    >>> teardown.run()
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self.actions: dict[str, TeardownAction] = {}
+
+    def register(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        device: str | None = None,
+        after: Iterable[str] = (),
+    ) -> None:
+        """Register an action.
+
+        :param name: unique action name, used in ``after`` and in errors
+        :type name: str
+        :param func: the action
+        :type func: Callable[[], Any]
+        :param device: name of the device the action works on, defaults to
+            none, i.e. no device exclusion
+        :type device: str | None
+        :param after: names of the actions that have to succeed first
+        :type after: Iterable[str]
+        :raises ValueError: if the name is already registered
+        """
+        if name in self.actions:
+            msg = f"teardown action {name!r} is already registered"
+            raise ValueError(msg)
+        self.actions[name] = TeardownAction(name, func, device, tuple(after))
+
+    def run(self, max_workers: int = MAX_WORKERS) -> None:
+        """Run every action and clear the registry.
+
+        :param max_workers: upper bound of concurrent actions, defaults to 4
+        :type max_workers: int
+        :raises TeardownError: listing every failed or skipped action
+        """
+        pending = dict(self.actions)
+        self.actions.clear()
+        done: set[str] = set()
+        errors: dict[str, str] = {}
+        busy: set[str] = set()
+        running: dict[Future[Any], TeardownAction] = {}
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers) as pool:
+            while pending or running:
+                _skip_dependents(pending, errors)
+                unfinished = set(pending) | {item.name for item in running.values()}
+                for action in list(pending.values()):
+                    if action.device not in busy and not unfinished.intersection(
+                        action.after
+                    ):
+                        del pending[action.name]
+                        if action.device is not None:
+                            busy.add(action.device)
+                        running[pool.submit(action.func)] = action
+                if not running:
+                    # only actions waiting on each other are left
+                    errors.update(dict.fromkeys(pending, "skipped, dependency cycle"))
+                    break
+                for future in wait(running, return_when=FIRST_COMPLETED).done:
+                    action = running.pop(future)
+                    busy.discard(action.device)  # type: ignore[arg-type]
+                    if (exc := future.exception()) is not None:
+                        _LOGGER.warning("teardown %s failed: %s", action.name, exc)
+                        errors[action.name] = repr(exc)
+                    else:
+                        done.add(action.name)
+        _LOGGER.info(
+            "%d teardown actions done in %.1fs", len(done), time.monotonic() - start
+        )
+        if errors:
+            msg = "; ".join(f"{name}: {error}" for name, error in errors.items())
+            raise TeardownError(msg)
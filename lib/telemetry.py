@@ -0,0 +1,182 @@
+"""Per-phase timing of board operations, kept as an append-only JSONL series.
+
+Every record is one line with the phase name, its duration and whether it
+succeeded, tagged with the test, board model, firmware and provisioning
+mode, so boot and reset times can be compared across builds and timeouts
+tuned from data. The module is also a small report CLI::
+
+    python -m lib.telemetry results/board_timing.jsonl --by phase firmware
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class PhaseOutcome:
+    """Outcome of a timed phase, set by the caller when it returns a status."""
+
+    ok: bool = True
+
+
+class PhaseTelemetry:
+    """Append phase durations, tagged with the context of the test, to a file.
+
+    >>> telemetry = PhaseTelemetry("board_timing.jsonl", firmware="7.1.2")
+    >>> with telemetry.phase("factory_reset"):
+    ...     factory_reset(board)
+    >>> with telemetry.phase("online after reset") as outcome:
+    ...     outcome.ok = is_board_online_after_reset()
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: str | Path, **tags: Any) -> None:  # noqa: ANN401
+        """Initialize the recorder.
+
+        :param path: JSONL file the records are appended to
+        :type path: str | Path
+        :param tags: values added to every record, e.g. test, board,
+            firmware and mode
+        :type tags: Any
+        """
+        self.path = Path(path)
+        self.tags = tags
+
+    def record(self, phase: str, duration: float, ok: bool = True) -> None:  # noqa: FBT001, FBT002
+        """Append one phase duration.
+
+        :param phase: phase name, e.g. ``power_cycle``
+        :type phase: str
+        :param duration: seconds the phase took
+        :type duration: float
+        :param ok: whether the phase succeeded, defaults to True
+        :type ok: bool
+        """
+        line = json.dumps(
+            {
+                "timestamp": round(time.time(), 3),
+                "phase": phase,
+                "duration": round(duration, 3),
+                "ok": ok,
+                **self.tags,
+            }
+        )
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseOutcome]:
+        """Time the body of the ``with`` block as one phase.
+
+        A phase that raises is recorded as failed and the exception
+        propagates. A phase reporting failure by its result instead is
+        marked failed by setting ``ok`` on the yielded outcome.
+
+        :param name: phase name
+        :type name: str
+        :yield: outcome of the phase, ok unless the caller says otherwise
+        """
+        start = time.monotonic()
+        outcome = PhaseOutcome()
+        try:
+            yield outcome
+        except BaseException:
+            outcome.ok = False
+            raise
+        finally:
+            self.record(name, time.monotonic() - start, outcome.ok)
+
+
+def load(path: str | Path) -> list[dict[str, Any]]:
+    """Read the records of a telemetry file, skipping truncated lines.
+
+    :param path: JSONL telemetry file
+    :type path: str | Path
+    :return: records in file order
+    :rtype: list[dict[str, Any]]
+    """
+    records = []
+    with Path(path).open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def aggregate(
+    records: Iterable[dict[str, Any]], by: Iterable[str] = ("phase",)
+) -> dict[tuple[str, ...], dict[str, float]]:
+    """Summarise the successful phase durations per group.
+
+    :param records: telemetry records
+    :type records: Iterable[dict[str, Any]]
+    :param by: record keys to group by, defaults to the phase
+    :type by: Iterable[str]
+    :return: count, percentiles and maximum in seconds by group
+    :rtype: dict[tuple[str, ...], dict[str, float]]
+    """
+    keys = tuple(by)
+    groups: dict[tuple[str, ...], list[float]] = defaultdict(list)
+    for record in records:
+        if record.get("ok", True):
+            group = tuple(str(record.get(key, "")) for key in keys)
+            groups[group].append(float(record["duration"]))
+    summary = {}
+    for group, durations in sorted(groups.items()):
+        cuts = (
+            statistics.quantiles(durations, n=100, method="inclusive")
+            if len(durations) > 1
+            else durations * 99
+        )
+        summary[group] = {
+            "count": len(durations),
+            **{f"p{pct}": cuts[pct - 1] for pct in PERCENTILES},
+            "max": max(durations),
+        }
+    return summary
+
+
+def main() -> None:
+    """Print the duration percentiles of a telemetry file."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path, help="JSONL telemetry file")
+    parser.add_argument(
+        "--by", nargs="+", default=["phase"], help="record keys to group by"
+    )
+    args = parser.parse_args()
+
+    summary = aggregate(load(args.path), args.by)
+    width = max([len(" / ".join(group)) for group in summary] + [len("group")])
+    columns = "".join(f" {f'p{pct} s':>8}" for pct in PERCENTILES)
+    sys.stdout.write(f"{'group':<{width}} {'count':>6}{columns} {'max s':>8}\n")
+    for group, stats in summary.items():
+        cells = "".join(f" {stats[f'p{pct}']:>8.1f}" for pct in PERCENTILES)
+        sys.stdout.write(
+            f"{' / '.join(group):<{width}} {stats['count']:>6}{cells}"
+            f" {stats['max']:>8.1f}\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
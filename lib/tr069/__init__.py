@@ -0,0 +1 @@
+"""TR-069 helpers shared by the test suites."""
@@ -0,0 +1,370 @@
+"""CWMP (TR-069) SOAP message helpers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import IO, TYPE_CHECKING, Any
+from xml.etree.ElementTree import Element, fromstring, iterparse
+from xml.sax.saxutils import escape
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+SOAP_ENV_NS = "http://schemas.xmlsoap.org/soap/envelope/"
+CWMP_NS = "urn:dslforum-org:cwmp-1-0"
+XSI_TYPE = "{http://www.w3.org/2001/XMLSchema-instance}type"
+
+_INT_TYPES = frozenset(("xsd:int", "xsd:unsignedInt", "xsd:long", "xsd:unsignedLong"))
+
+
+def local_name(tag: str) -> str:
+    """Return an XML tag name without its namespace.
+
+    :param tag: tag as reported by ElementTree, e.g. ``{urn:...}Inform``
+    :type tag: str
+    :return: tag name without namespace
+    :rtype: str
+    """
+    return tag.rpartition("}")[2]
+
+
+def xsd_type(value: str | int | bool) -> str:
+    """Return the xsi:type matching a Python value.
+
+    :param value: parameter value
+    :type value: str | int | bool
+    :return: xsi:type, e.g. ``xsd:unsignedInt``
+    :rtype: str
+    """
+    if isinstance(value, bool):
+        return "xsd:boolean"
+    if isinstance(value, int):
+        return "xsd:unsignedInt" if value >= 0 else "xsd:int"
+    return "xsd:string"
+
+
+def convert_value(value: str | None, data_type: str) -> str | int | bool:
+    """Convert a ParameterValueStruct value to its Python type.
+
+    :param value: value text
+    :type value: str | None
+    :param data_type: xsi:type of the value, e.g. ``xsd:boolean``
+    :type data_type: str
+    :return: converted value, strings are returned unchanged
+    :rtype: str | int | bool
+    """
+    text = value or ""
+    if data_type == "xsd:boolean":
+        return text.strip().lower() in ("1", "true")
+    if data_type in _INT_TYPES and text.strip().lstrip("-").isdigit():
+        return int(text)
+    return text
+
+
+def iterparse_parameter_values(source: IO[bytes]) -> Iterator[dict[str, Any]]:
+    """Yield ParameterValueStructs while a GPV response is being parsed.
+
+    Every struct is yielded as soon as its closing tag is read and is then
+    dropped from the tree, so memory stays bounded by one struct no matter
+    how large the ParameterList is. The entries use the same ``key``,
+    ``value`` and ``type`` layout as the ACS GPV response.
+
+    :param source: binary stream with a GetParameterValuesResponse envelope
+    :type source: IO[bytes]
+    :yield: GPV entries in response order
+    :rtype: Iterator[dict[str, Any]]
+    """
+    parameter_list = None
+    for event, elem in iterparse(source, events=("start", "end")):  # noqa: S314
+        name = local_name(elem.tag)
+        if event == "start":
+            if name == "ParameterList":
+                parameter_list = elem
+            continue
+        if name != "ParameterValueStruct":
+            continue
+        key = value = data_type = None
+        for child in elem:
+            child_name = local_name(child.tag)
+            if child_name == "Name":
+                key = (child.text or "").strip()
+            elif child_name == "Value":
+                value = child.text
+                data_type = child.get(XSI_TYPE, "xsd:string")
+        yield {
+            "key": key,
+            "value": convert_value(value, data_type or "xsd:string"),
+            "type": data_type,
+        }
+        elem.clear()
+        if parameter_list is not None:
+            parameter_list.clear()
+
+
+class CwmpFaultError(Exception):
+    """Raised when the CPE answers an RPC with a CWMP fault."""
+
+
+@dataclass
+class CwmpMessage:  # pylint: disable=too-many-instance-attributes
+    """A CWMP RPC request or response carried by one SOAP envelope."""
+
+    rpc: str
+    cwmp_id: str | None = None
+    event_codes: list[str] = field(default_factory=list)
+    device_id: dict[str, str] = field(default_factory=dict)
+    parameters: dict[str, Any] = field(default_factory=dict)
+    types: dict[str, str] = field(default_factory=dict)
+    names: list[str] = field(default_factory=list)
+    next_level: bool | None = None
+    status: int | None = None
+    fault_code: str | None = None
+
+
+def _text(elem: Element, name: str) -> str:
+    return next(
+        (
+            (child.text or "").strip()
+            for child in elem.iter()
+            if local_name(child.tag) == name
+        ),
+        "",
+    )
+
+
+def _parse_rpc(message: CwmpMessage, rpc: Element) -> None:
+    for elem in rpc.iter():
+        name = local_name(elem.tag)
+        if name == "EventCode":
+            message.event_codes.append((elem.text or "").strip())
+        elif name == "DeviceId":
+            message.device_id = {
+                local_name(child.tag): (child.text or "").strip() for child in elem
+            }
+        elif name == "ParameterValueStruct":
+            key = _text(elem, "Name")
+            value = next(c for c in elem if local_name(c.tag) == "Value")
+            data_type = value.get(XSI_TYPE, "xsd:string")
+            message.parameters[key] = convert_value(value.text, data_type)
+            message.types[key] = data_type
+        elif name == "ParameterInfoStruct":
+            message.parameters[_text(elem, "Name")] = convert_value(
+                _text(elem, "Writable"), "xsd:boolean"
+            )
+        elif name in ("string", "ParameterPath"):
+            message.names.append((elem.text or "").strip())
+        elif name == "NextLevel":
+            message.next_level = convert_value(elem.text, "xsd:boolean") is True
+        elif name == "Status":
+            message.status = int(convert_value(elem.text, "xsd:int"))
+        elif name == "FaultCode" and message.fault_code is None:
+            message.fault_code = (elem.text or "").strip()
+
+
+def parse_message(data: bytes | str) -> CwmpMessage | None:
+    """Parse a CWMP SOAP envelope.
+
+    :param data: HTTP body holding the envelope
+    :type data: bytes | str
+    :return: parsed message, None for an empty body
+    :rtype: CwmpMessage | None
+    """
+    if not data.strip():
+        return None
+    envelope = fromstring(data)  # noqa: S314
+    message = CwmpMessage(rpc="")
+    for elem in envelope:
+        if local_name(elem.tag) == "Header":
+            message.cwmp_id = _text(elem, "ID") or None
+        elif local_name(elem.tag) == "Body" and len(elem):
+            message.rpc = local_name(elem[0].tag)
+            _parse_rpc(message, elem[0])
+    return message
+
+
+def _format_value(value: str | int | bool) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return escape(str(value))
+
+
+def _value_structs(values: Iterable[tuple[str, str | int | bool, str]]) -> str:
+    structs = "".join(
+        f"<ParameterValueStruct><Name>{escape(name)}</Name>"
+        f'<Value xsi:type="{data_type}">{_format_value(value)}</Value>'
+        "</ParameterValueStruct>"
+        for name, value, data_type in values
+    )
+    return f"<ParameterList>{structs}</ParameterList>"
+
+
+def build_envelope(body: str, cwmp_id: str | None = None) -> bytes:
+    """Wrap an RPC in a CWMP SOAP envelope.
+
+    :param body: RPC element, e.g. ``<cwmp:InformResponse>...``
+    :type body: str
+    :param cwmp_id: cwmp:ID header value, defaults to None
+    :type cwmp_id: str | None
+    :return: encoded envelope
+    :rtype: bytes
+    """
+    header = (
+        f'<soap-env:Header><cwmp:ID soap-env:mustUnderstand="1">{escape(cwmp_id)}'
+        "</cwmp:ID></soap-env:Header>"
+        if cwmp_id
+        else ""
+    )
+    return (
+        f'<soap-env:Envelope xmlns:soap-env="{SOAP_ENV_NS}" xmlns:cwmp="{CWMP_NS}" '
+        'xmlns:xsd="http://www.w3.org/2001/XMLSchema" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+        f"{header}<soap-env:Body>{body}</soap-env:Body></soap-env:Envelope>"
+    ).encode()
+
+
+def build_inform(
+    device_id: dict[str, str],
+    event_codes: list[str],
+    values: Iterable[tuple[str, str | int | bool, str]],
+) -> str:
+    """Build an Inform RPC.
+
+    :param device_id: DeviceIdStruct fields (Manufacturer, OUI, ProductClass,
+        SerialNumber)
+    :type device_id: dict[str, str]
+    :param event_codes: event codes, e.g. ``["1 BOOT"]``
+    :type event_codes: list[str]
+    :param values: (name, value, xsi:type) of the parameters to report
+    :type values: Iterable[tuple[str, str | int | bool, str]]
+    :return: Inform element
+    :rtype: str
+    """
+    device = "".join(f"<{k}>{escape(v)}</{k}>" for k, v in device_id.items())
+    events = "".join(
+        f"<EventStruct><EventCode>{escape(code)}</EventCode>"
+        "<CommandKey></CommandKey></EventStruct>"
+        for code in event_codes
+    )
+    return (
+        f"<cwmp:Inform><DeviceId>{device}</DeviceId><Event>{events}</Event>"
+        f"<MaxEnvelopes>1</MaxEnvelopes>{_value_structs(values)}</cwmp:Inform>"
+    )
+
+
+def build_inform_response() -> str:
+    """Build an InformResponse.
+
+    :return: InformResponse element
+    :rtype: str
+    """
+    return "<cwmp:InformResponse><MaxEnvelopes>1</MaxEnvelopes></cwmp:InformResponse>"
+
+
+def build_gpv(names: list[str]) -> str:
+    """Build a GetParameterValues RPC.
+
+    :param names: parameter names or partial paths
+    :type names: list[str]
+    :return: GetParameterValues element
+    :rtype: str
+    """
+    strings = "".join(f"<string>{escape(name)}</string>" for name in names)
+    return (
+        "<cwmp:GetParameterValues>"
+        f"<ParameterNames>{strings}</ParameterNames></cwmp:GetParameterValues>"
+    )
+
+
+def build_gpv_response(values: Iterable[tuple[str, str | int | bool, str]]) -> str:
+    """Build a GetParameterValuesResponse.
+
+    :param values: (name, value, xsi:type) of the requested parameters
+    :type values: Iterable[tuple[str, str | int | bool, str]]
+    :return: GetParameterValuesResponse element
+    :rtype: str
+    """
+    return (
+        "<cwmp:GetParameterValuesResponse>"
+        f"{_value_structs(values)}</cwmp:GetParameterValuesResponse>"
+    )
+
+
+def build_spv(values: Iterable[tuple[str, str | int | bool, str]]) -> str:
+    """Build a SetParameterValues RPC.
+
+    :param values: (name, value, xsi:type) of the parameters to set
+    :type values: Iterable[tuple[str, str | int | bool, str]]
+    :return: SetParameterValues element
+    :rtype: str
+    """
+    return (
+        f"<cwmp:SetParameterValues>{_value_structs(values)}"
+        "<ParameterKey></ParameterKey></cwmp:SetParameterValues>"
+    )
+
+
+def build_spv_response(status: int) -> str:
+    """Build a SetParameterValuesResponse.
+
+    :param status: 0 when applied, 1 when applied after a reboot
+    :type status: int
+    :return: SetParameterValuesResponse element
+    :rtype: str
+    """
+    return (
+        "<cwmp:SetParameterValuesResponse>"
+        f"<Status>{status}</Status></cwmp:SetParameterValuesResponse>"
+    )
+
+
+def build_gpn(path: str, *, next_level: bool) -> str:
+    """Build a GetParameterNames RPC.
+
+    :param path: parameter name or partial path
+    :type path: str
+    :param next_level: only report the next level below the path
+    :type next_level: bool
+    :return: GetParameterNames element
+    :rtype: str
+    """
+    return (
+        f"<cwmp:GetParameterNames><ParameterPath>{escape(path)}</ParameterPath>"
+        f"<NextLevel>{_format_value(next_level)}</NextLevel></cwmp:GetParameterNames>"
+    )
+
+
+def build_gpn_response(infos: Iterable[tuple[str, bool]]) -> str:
+    """Build a GetParameterNamesResponse.
+
+    :param infos: (name, writable) of the reported parameters and objects
+    :type infos: Iterable[tuple[str, bool]]
+    :return: GetParameterNamesResponse element
+    :rtype: str
+    """
+    structs = "".join(
+        f"<ParameterInfoStruct><Name>{escape(name)}</Name>"
+        f"<Writable>{_format_value(writable)}</Writable></ParameterInfoStruct>"
+        for name, writable in infos
+    )
+    return (
+        "<cwmp:GetParameterNamesResponse>"
+        f"<ParameterList>{structs}</ParameterList></cwmp:GetParameterNamesResponse>"
+    )
+
+
+def build_fault(code: str, message: str) -> str:
+    """Build a SOAP Fault carrying a CWMP fault.
+
+    :param code: CWMP fault code, e.g. ``9005``
+    :type code: str
+    :param message: fault string
+    :type message: str
+    :return: Fault element
+    :rtype: str
+    """
+    return (
+        "<soap-env:Fault><faultcode>Client</faultcode><faultstring>CWMP fault"
+        f"</faultstring><detail><cwmp:Fault><FaultCode>{code}</FaultCode>"
+        f"<FaultString>{escape(message)}</FaultString></cwmp:Fault></detail>"
+        "</soap-env:Fault>"
+    )
@@ -0,0 +1,264 @@
+"""TR-181 data-model name index built from GetParameterNames."""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from _pytest.cacheprovider import Cache
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_KEY = "tr069/datamodel"
+INSTANCE = "{i}"
+IDENTITY_PARAMS = (
+    "Device.DeviceInfo.ProductClass",
+    "Device.DeviceInfo.ModelName",
+    "Device.DeviceInfo.SoftwareVersion",
+)
+
+
+class _Node:  # pylint: disable=too-few-public-methods
+    __slots__ = ("children", "writable")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        self.writable: bool | None = None
+
+
+class DataModel:
+    """Prefix trie of every parameter and object name a CPE exposes.
+
+    Built from one recursive GetParameterNames on ``Device.``, it answers
+    path and writable-flag questions and enumerates table instances without
+    further RPCs. Paths may use ``{i}`` for any instance number, as in the
+    TR-181 specification:
+
+    >>> "Device.Hosts.Host.{i}.IPv6Address." in model
+    True
+    >>> model.instances("Device.Hosts.Host.")
+    [1, 2]
+
+    A model built from :meth:`schema` names, as :func:`load_data_model`
+    returns from the cache, knows the paths and writable flags but not which
+    instances exist: a concrete instance number matches ``{i}`` and
+    :meth:`instances` raises.
+    """
+
+    def __init__(
+        self, names: dict[str, bool], version: str = "", *, live: bool = True
+    ) -> None:
+        """Initialize the data model.
+
+        :param names: parameter and object names (objects end with a dot)
+            mapped to their writable flag
+        :type names: dict[str, bool]
+        :param version: CPE software version the names were read from
+        :type version: str
+        :param live: whether the names were just read from the CPE, False for
+            schema names with ``{i}`` in place of instance numbers
+        :type live: bool
+        """
+        self.version = version
+        self.names = names
+        self.live = live
+        self._root = _Node()
+        for name, writable in names.items():
+            self._insert(name).writable = writable
+
+    @classmethod
+    def from_gpn_response(
+        cls, response: Iterable[dict[str, Any]], version: str = ""
+    ) -> DataModel:
+        """Build the data model from an ACS GPN response.
+
+        :param response: GPN entries with ``key`` and the writable flag as
+            ``value``
+        :type response: Iterable[dict[str, Any]]
+        :param version: CPE software version, defaults to ""
+        :type version: str
+        :return: the data model
+        :rtype: DataModel
+        """
+        return cls(
+            {
+                str(entry["key"]): str(entry["value"]).lower() in ("1", "true")
+                for entry in response
+            },
+            version,
+        )
+
+    def __contains__(self, path: object) -> bool:
+        """Return whether a parameter or object path exists.
+
+        :param path: full or partial path, may contain ``{i}``
+        :type path: object
+        :return: True if at least one matching name exists
+        :rtype: bool
+        """
+        return isinstance(path, str) and any(True for _ in self._match(path))
+
+    def __len__(self) -> int:
+        """Return the number of names.
+
+        :return: number of parameter and object names
+        :rtype: int
+        """
+        return len(self.names)
+
+    def is_writable(self, path: str) -> bool:
+        """Return the writable flag of a parameter or object.
+
+        :param path: full or partial path, may contain ``{i}``
+        :type path: str
+        :return: True if every matching name is writable
+        :rtype: bool
+        :raises KeyError: when the path does not exist
+        """
+        flags = [node.writable for node in self._match(path)]
+        if not flags:
+            raise KeyError(path)
+        return all(flags)
+
+    def instances(self, table: str) -> list[int]:
+        """Return the instance numbers of a multi-instance object.
+
+        :param table: table path ending with a dot, e.g. ``Device.Hosts.Host.``
+        :type table: str
+        :return: instance numbers in ascending order
+        :rtype: list[int]
+        :raises ValueError: when the model holds schema names only
+        """
+        if not self.live:
+            msg = f"instances of {table} are not cached, read them with GPN"
+            raise ValueError(msg)
+        return sorted(
+            {
+                int(name)
+                for node in self._match(table)
+                for name in node.children
+                if name.isdigit()
+            }
+        )
+
+    def children(self, path: str) -> list[str]:
+        """Return the names directly below an object.
+
+        :param path: object path ending with a dot
+        :type path: str
+        :return: child names relative to ``path``, objects end with a dot
+        :rtype: list[str]
+        """
+        return sorted(
+            {
+                name + ("." if child.children else "")
+                for node in self._match(path)
+                for name, child in node.children.items()
+            }
+        )
+
+    def schema(self) -> dict[str, bool]:
+        """Return the names with every instance number replaced by ``{i}``.
+
+        :return: schema names mapped to their writable flag, a name is
+            writable when it is writable in every instance
+        :rtype: dict[str, bool]
+        """
+        schema: dict[str, bool] = {}
+        for name, writable in self.names.items():
+            key = ".".join(
+                INSTANCE if part.isdigit() else part for part in name.split(".")
+            )
+            schema[key] = schema.get(key, True) and writable
+        return schema
+
+    def unknown(self, paths: Iterable[str]) -> list[str]:
+        """Return the paths missing from the data model.
+
+        :param paths: paths to validate
+        :type paths: Iterable[str]
+        :return: paths that do not exist, in input order
+        :rtype: list[str]
+        """
+        return [path for path in paths if path not in self]
+
+    def _insert(self, name: str) -> _Node:
+        node = self._root
+        for part in _split(name):
+            node = node.children.setdefault(part, _Node())
+        return node
+
+    def _match(self, path: str) -> Iterator[_Node]:
+        nodes = [self._root]
+        for part in _split(path):
+            if part == INSTANCE:
+                nodes = [
+                    child
+                    for node in nodes
+                    for name, child in node.children.items()
+                    if name.isdigit() or name == INSTANCE
+                ]
+            else:
+                nodes = [
+                    child for node in nodes if (child := _child(node, part)) is not None
+                ]
+        yield from nodes
+
+
+def _child(node: _Node, part: str) -> _Node | None:
+    if part in node.children:
+        return node.children[part]
+    return node.children.get(INSTANCE) if part.isdigit() else None
+
+
+def _split(path: str) -> list[str]:
+    return path.rstrip(".").split(".")
+
+
+def _cache_key(product_class: str, model_name: str) -> str:
+    slug = re.sub(r"[^\w.-]+", "_", f"{product_class}-{model_name}")
+    return f"{CACHE_KEY}/{slug}"
+
+
+def load_data_model(acs: Any, board: Any, cache: Cache) -> DataModel:  # noqa: ANN401
+    """Return the CPE data model, read with GPN only when the firmware changed.
+
+    One GPV reads the ProductClass, ModelName and SoftwareVersion of the CPE.
+    The :meth:`DataModel.schema` names are kept in the pytest cache under
+    :data:`CACHE_KEY` per ProductClass and ModelName, together with the
+    software version they were read from; a different version invalidates
+    the entry. Instance numbers are not cached, a model loaded from the cache
+    cannot enumerate the rows of dynamic tables such as ``Device.Hosts.Host.``.
+
+    :param acs: ACS device instance
+    :type acs: Any
+    :param board: CPE device instance
+    :type board: Any
+    :param cache: pytest cache, ``request.config.cache``
+    :type cache: Cache
+    :return: the data model
+    :rtype: DataModel
+    """
+    cpe_id = board.sw.tr69_cpe_id
+    identity = {
+        entry["key"]: str(entry["value"])
+        for entry in acs.GPV(list(IDENTITY_PARAMS), cpe_id=cpe_id)
+    }
+    product_class, model_name, version = (identity[name] for name in IDENTITY_PARAMS)
+    key = _cache_key(product_class, model_name)
+    cached = cache.get(key, None)
+    if cached and cached.get("version") == version:
+        _LOGGER.debug("data model of %s %s loaded from the cache", model_name, version)
+        return DataModel(cached["names"], version, live=False)
+    _LOGGER.info(
+        "reading the data model of %s %s with GetParameterNames", model_name, version
+    )
+    model = DataModel.from_gpn_response(
+        acs.GPN("Device.", next_level=False, cpe_id=cpe_id), version
+    )
+    cache.set(key, {"version": version, "names": model.schema()})
+    return model
@@ -0,0 +1,137 @@
+"""Run the same TR-069 RPC on every CPE of a farm concurrently."""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from boardfarm3.use_cases.tr069 import set_parameter_values
+
+from lib.tr069.snapshot import ParameterSnapshot, get_parameter_snapshot
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from boardfarm3.templates.acs import ACS
+    from boardfarm3.templates.cpe import CPE
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_WORKERS = 8
+
+
+@dataclass
+class BoardResult:
+    """Outcome of one RPC on one board, truthy when it did not raise."""
+
+    name: str
+    value: Any = None
+    error: Exception | None = None
+    elapsed: float = 0.0
+
+    def __bool__(self) -> bool:
+        """Return whether the RPC succeeded.
+
+        :return: True if no exception was raised
+        :rtype: bool
+        """
+        return self.error is None
+
+
+def fan_out(
+    func: Callable[[CPE], Any],
+    boards: dict[str, CPE],
+    max_workers: int = MAX_WORKERS,
+) -> dict[str, BoardResult]:
+    """Call ``func`` for every board through a bounded thread pool.
+
+    Exceptions are caught per board so one failing CPE does not hide the
+    results of the others.
+
+    :param func: callable taking a CPE, e.g. a partial GPV use case
+    :type func: Callable[[CPE], Any]
+    :param boards: boards by name, as from ``device_manager.get_devices_by_type``
+    :type boards: dict[str, CPE]
+    :param max_workers: upper bound of concurrent RPCs, defaults to 8
+    :type max_workers: int
+    :return: results by board name, in the order of ``boards``
+    :rtype: dict[str, BoardResult]
+    """
+
+    def _run(name: str, board: CPE) -> BoardResult:
+        start = time.monotonic()
+        try:
+            value = func(board)
+        except Exception as exc:  # noqa: BLE001  # pylint: disable=broad-except
+            _LOGGER.warning("%s failed on %s: %s", func, name, exc)
+            return BoardResult(name, error=exc, elapsed=time.monotonic() - start)
+        return BoardResult(name, value, elapsed=time.monotonic() - start)
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(max(1, min(max_workers, len(boards)))) as pool:
+        futures = {
+            name: pool.submit(_run, name, board) for name, board in boards.items()
+        }
+        results = {name: future.result() for name, future in futures.items()}
+    _LOGGER.info(
+        "%d boards done in %.2fs (slowest %.2fs)",
+        len(results),
+        time.monotonic() - start,
+        max((result.elapsed for result in results.values()), default=0.0),
+    )
+    return results
+
+
+def get_parameter_values_all(
+    params: str | list[str],
+    acs: ACS,
+    boards: dict[str, CPE],
+    max_workers: int = MAX_WORKERS,
+) -> dict[str, BoardResult]:
+    """Read parameters from every board with one GPV per board.
+
+    :param params: parameter name or list of names, partial paths allowed
+    :type params: str | list[str]
+    :param acs: ACS device instance
+    :type acs: ACS
+    :param boards: boards by name
+    :type boards: dict[str, CPE]
+    :param max_workers: upper bound of concurrent RPCs, defaults to 8
+    :type max_workers: int
+    :return: results holding a :class:`ParameterSnapshot` per board
+    :rtype: dict[str, BoardResult]
+    """
+
+    def _gpv(board: CPE) -> ParameterSnapshot:
+        return get_parameter_snapshot(params, acs, board)
+
+    return fan_out(_gpv, boards, max_workers)
+
+
+def set_parameter_values_all(
+    params: list[dict[str, Any]],
+    acs: ACS,
+    boards: dict[str, CPE],
+    max_workers: int = MAX_WORKERS,
+) -> dict[str, BoardResult]:
+    """Set parameters on every board with one SPV per board.
+
+    :param params: list of parameter name to value mappings
+    :type params: list[dict[str, Any]]
+    :param acs: ACS device instance
+    :type acs: ACS
+    :param boards: boards by name
+    :type boards: dict[str, CPE]
+    :param max_workers: upper bound of concurrent RPCs, defaults to 8
+    :type max_workers: int
+    :return: results holding the SPV status per board
+    :rtype: dict[str, BoardResult]
+    """
+
+    def _spv(board: CPE) -> int:
+        return set_parameter_values(params, acs, board)
+
+    return fan_out(_spv, boards, max_workers)
@@ -0,0 +1,180 @@
+"""Follow the CWMP Informs a CPE sends to the ACS while they are captured."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Self
+
+from lib.capture import CapturedPacket, LiveCapture
+from lib.tr069.trace import CwmpExtractor, CwmpRecord
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class InformWatcher:
+    """Capture the CPE to ACS traffic and detect Informs as they arrive.
+
+    Captured packets go through the same :class:`CwmpExtractor` used for
+    pcap files, so every RPC is recorded with its EventCodes, session and
+    capture timestamp as soon as it is on the wire. Tests wait for the
+    event they need and leave the context, which stops tcpdump right away,
+    instead of sleeping for a fixed time and grepping the pcap afterwards.
+    The pcap is still written for the artifacts. Besides the ACS capture
+    timestamp, the :func:`time.monotonic` time each record reached the test
+    host is kept, see :meth:`arrival`, to measure latencies on one clock.
+    When the filter also lets the traffic of other CPEs through, ``cpe_id``
+    restricts the Informs waited for to the ones of the CPE under test.
+
+    >>> with InformWatcher(acs, pcap_file, "tcp port 7547", cpe_id) as watcher:
+    ...     power_cycle()
+    ...     inform = watcher.wait_for_event("1 BOOT", timeout=300)
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        acs: Any,  # noqa: ANN401
+        fname: str,
+        bpf_filter: str = "tcp",
+        cpe_id: str | None = None,
+        interface: str = "any",
+    ) -> None:
+        """Initialize the watcher.
+
+        :param acs: ACS device, the capture runs on its console
+        :type acs: Any
+        :param fname: pcap file path on the ACS
+        :type fname: str
+        :param bpf_filter: capture filter, usually the CPE address or the
+            CWMP port of the ACS, defaults to ``tcp``
+        :type bpf_filter: str
+        :param cpe_id: only wait for Informs of this CPE, in the
+            ``OUI-ProductClass-SerialNumber`` form, defaults to any CPE
+        :type cpe_id: str | None
+        :param interface: interface to capture on, defaults to ``any``
+        :type interface: str
+        """
+        self._capture = LiveCapture(acs, fname, interface, bpf_filter, "-x")
+        self._capture.add_callback(self._on_packet)
+        self._extractor = CwmpExtractor()
+        self._cpe_id = cpe_id
+        self._seen = threading.Condition()
+        self.records: list[CwmpRecord] = []
+        self._arrivals: dict[int, float] = {}
+
+    def wait_for_event(
+        self,
+        event_code: str = "1 BOOT",
+        timeout: float = 300,
+        *,
+        answered: bool = False,
+    ) -> CwmpRecord | None:
+        """Wait for an Inform carrying the given EventCode.
+
+        Informs already seen since the capture started count as well.
+
+        :param event_code: EventCode to wait for, defaults to ``1 BOOT``
+        :type event_code: str
+        :param timeout: seconds to wait, defaults to 300
+        :type timeout: float
+        :param answered: also wait for the InformResponse of the ACS in the
+            same session, defaults to False
+        :type answered: bool
+        :return: first matching Inform, None on timeout
+        :rtype: CwmpRecord | None
+        """
+        start = time.monotonic()
+
+        def _find() -> CwmpRecord | None:
+            return next(
+                (
+                    record
+                    for record in self.records
+                    if record.rpc == "Inform"
+                    and event_code in record.event_codes
+                    and self._cpe_id in (None, _sender(record))
+                    and (not answered or self._answered(record))
+                ),
+                None,
+            )
+
+        with self._seen:
+            inform = self._seen.wait_for(_find, timeout)
+        if inform:
+            _LOGGER.info(
+                "Inform %r seen after %.1fs", event_code, time.monotonic() - start
+            )
+        return inform
+
+    def arrival(self, record: CwmpRecord) -> float:
+        """Return when a record reached the test host.
+
+        :param record: record seen by this watcher
+        :type record: CwmpRecord
+        :return: :func:`time.monotonic` time the record was decoded
+        :rtype: float
+        """
+        return self._arrivals[id(record)]
+
+    @property
+    def informs(self) -> list[CwmpRecord]:
+        """Informs seen so far.
+
+        :return: Inform records in capture order
+        :rtype: list[CwmpRecord]
+        """
+        return [record for record in self.records if record.rpc == "Inform"]
+
+    def __enter__(self) -> Self:
+        """Start the capture.
+
+        :return: the running watcher
+        :rtype: Self
+        """
+        self._capture.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the capture.
+
+        :param exc_type: exception type raised in the context, if any
+        :type exc_type: type[BaseException] | None
+        :param exc_value: exception raised in the context, if any
+        :type exc_value: BaseException | None
+        :param traceback: traceback of the exception, if any
+        :type traceback: TracebackType | None
+        """
+        self._capture.stop()
+
+    def _answered(self, inform: CwmpRecord) -> bool:
+        return any(
+            record.rpc == "InformResponse" and record.session == inform.session
+            for record in self.records
+        )
+
+    def _on_packet(self, packet: CapturedPacket) -> None:
+        if records := self._extractor.feed(packet.timestamp, packet.data):
+            now = time.monotonic()
+            for record in records:
+                self._arrivals[id(record)] = now
+                _LOGGER.info(
+                    "%s %s at %s", record.rpc, record.event_codes, record.timestamp
+                )
+            with self._seen:
+                self.records.extend(records)
+                self._seen.notify_all()
+
+
+def _sender(inform: CwmpRecord) -> str:
+    return "-".join(
+        inform.device_id.get(key, "") for key in ("OUI", "ProductClass", "SerialNumber")
+    )
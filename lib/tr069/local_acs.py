@@ -0,0 +1,584 @@
+"""In-process ACS and simulated CWMP client talking over localhost.
+
+:class:`LocalACS` offers the ``GPV``, ``SPV`` and ``GPN`` methods of the
+boardfarm ACS template and drives a real CWMP exchange for every call:
+connection request, Inform, the RPC and the session close. The
+:class:`SimulatedCPE` answers these sessions from an in-memory data model.
+Together they allow measuring the cost of the ACS-side helpers without a
+farm::
+
+    with LocalACS() as acs, SimulatedCPE(acs.url, {"Device.X": 1}) as cpe:
+        cpe.boot()
+        acs.GPV("Device.X", cpe_id=cpe.tr69_cpe_id)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Self
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+from lib.tr069.cwmp import (
+    CwmpFaultError,
+    CwmpMessage,
+    build_envelope,
+    build_fault,
+    build_gpn,
+    build_gpn_response,
+    build_gpv,
+    build_gpv_response,
+    build_inform,
+    build_inform_response,
+    build_spv,
+    build_spv_response,
+    parse_message,
+    xsd_type,
+)
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+_LOGGER = logging.getLogger(__name__)
+
+_CR_URL_PARAM = "Device.ManagementServer.ConnectionRequestURL"
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002, ANN401  # pylint: disable=redefined-builtin
+        _LOGGER.debug("%s: %s", self.client_address[0], format % args)
+
+    def _reply(self, status: HTTPStatus, body: bytes = b"") -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        if body:
+            self.send_header("Content-Type", "text/xml; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@dataclass
+class _PendingRpc:
+    body: str
+    done: threading.Event = field(default_factory=threading.Event)
+    response: CwmpMessage | None = None
+
+
+@dataclass
+class AcsDevice:
+    """CPE registration record kept by the :class:`LocalACS`."""
+
+    cpe_id: str
+    connection_request_url: str
+    last_inform: float
+    event_codes: list[str]
+    parameters: dict[str, Any]
+    queue: deque[_PendingRpc] = field(default_factory=deque)
+    in_flight: _PendingRpc | None = None
+
+
+class _AcsHandler(_QuietHandler):
+    server: _AcsServer
+    cpe_id: str | None = None
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Answer a CWMP session request with the next RPC or close it."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        acs = self.server.acs
+        message = parse_message(body)
+        if message is not None and message.rpc == "Inform":
+            self.cpe_id = acs.register(message)
+            self._reply(HTTPStatus.OK, build_envelope(build_inform_response()))
+            return
+        if self.cpe_id is None:
+            self._reply(HTTPStatus.FORBIDDEN)
+            return
+        if message is not None:
+            acs.complete(self.cpe_id, message)
+        if (rpc := acs.next_rpc(self.cpe_id)) is None:
+            self._reply(HTTPStatus.NO_CONTENT)
+        else:
+            self._reply(HTTPStatus.OK, build_envelope(rpc.body))
+
+
+class _AcsServer(ThreadingHTTPServer):
+    daemon_threads = True
+    acs: LocalACS
+
+
+class LocalACS:
+    """Minimal CWMP ACS serving one session per RPC over localhost."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Initialize the ACS.
+
+        :param host: address to listen on, defaults to 127.0.0.1
+        :type host: str
+        :param port: port to listen on, defaults to a free port
+        :type port: int
+        """
+        self._host = host
+        self._server = _AcsServer((host, port), _AcsHandler)
+        self._server.acs = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="local-acs", daemon=True
+        )
+        self._lock = threading.Lock()
+        self._inform_received = threading.Condition(self._lock)
+        self.devices: dict[str, AcsDevice] = {}
+
+    @property
+    def url(self) -> str:
+        """URL the CPE has to use as ManagementServer.URL.
+
+        :return: ACS URL
+        :rtype: str
+        """
+        return f"http://{self._host}:{self._server.server_port}/"
+
+    def start(self) -> None:
+        """Start serving CWMP sessions."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the ACS."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        """Start the ACS.
+
+        :return: the started ACS
+        :rtype: Self
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the ACS.
+
+        :param exc_type: exception type raised in the context, if any
+        :type exc_type: type[BaseException] | None
+        :param exc_value: exception raised in the context, if any
+        :type exc_value: BaseException | None
+        :param traceback: traceback of the exception, if any
+        :type traceback: TracebackType | None
+        """
+        self.stop()
+
+    def register(self, inform: CwmpMessage) -> str:
+        """Record an Inform and return the id of the CPE that sent it.
+
+        :param inform: received Inform
+        :type inform: CwmpMessage
+        :return: CPE id in the ``OUI-ProductClass-SerialNumber`` form
+        :rtype: str
+        """
+        dev = inform.device_id
+        cpe_id = f"{dev['OUI']}-{dev['ProductClass']}-{dev['SerialNumber']}"
+        with self._lock:
+            device = self.devices.get(cpe_id)
+            if device is None:
+                device = self.devices[cpe_id] = AcsDevice(
+                    cpe_id, "", 0.0, [], inform.parameters
+                )
+            device.connection_request_url = str(
+                inform.parameters.get(_CR_URL_PARAM, device.connection_request_url)
+            )
+            device.last_inform = time.monotonic()
+            device.event_codes = inform.event_codes
+            device.parameters.update(inform.parameters)
+            self._inform_received.notify_all()
+        return cpe_id
+
+    def complete(self, cpe_id: str, response: CwmpMessage) -> None:
+        """Hand the CPE response over to the caller waiting for it.
+
+        :param cpe_id: CPE id of the session
+        :type cpe_id: str
+        :param response: RPC response or fault sent by the CPE
+        :type response: CwmpMessage
+        """
+        with self._lock:
+            rpc = self.devices[cpe_id].in_flight
+            self.devices[cpe_id].in_flight = None
+        if rpc is not None:
+            rpc.response = response
+            rpc.done.set()
+
+    def next_rpc(self, cpe_id: str) -> _PendingRpc | None:
+        """Return the next queued RPC of a CPE, None ends the session.
+
+        :param cpe_id: CPE id of the session
+        :type cpe_id: str
+        :return: RPC to send to the CPE
+        :rtype: _PendingRpc | None
+        """
+        with self._lock:
+            device = self.devices[cpe_id]
+            device.in_flight = device.queue.popleft() if device.queue else None
+            return device.in_flight
+
+    def wait_for_inform(
+        self, cpe_id: str, after: float, timeout: float = 30
+    ) -> AcsDevice:
+        """Wait until the CPE has sent an Inform later than a given time.
+
+        :param cpe_id: CPE id
+        :type cpe_id: str
+        :param after: :func:`time.monotonic` timestamp
+        :type after: float
+        :param timeout: seconds to wait, defaults to 30
+        :type timeout: float
+        :raises TimeoutError: when no Inform arrives in time
+        :return: registration record of the CPE
+        :rtype: AcsDevice
+        """
+        with self._inform_received:
+            if not self._inform_received.wait_for(
+                lambda: cpe_id in self.devices
+                and self.devices[cpe_id].last_inform > after,
+                timeout,
+            ):
+                msg = f"{cpe_id} did not inform within {timeout}s"
+                raise TimeoutError(msg)
+            return self.devices[cpe_id]
+
+    def _resolve(self, cpe_id: str | None) -> AcsDevice:
+        with self._lock:
+            if cpe_id is None and len(self.devices) == 1:
+                return next(iter(self.devices.values()))
+            if cpe_id not in self.devices:
+                msg = f"CPE {cpe_id} is not registered on the ACS"
+                raise ValueError(msg)
+            return self.devices[cpe_id]
+
+    def _rpc(self, body: str, timeout: float | None, cpe_id: str | None) -> CwmpMessage:
+        device = self._resolve(cpe_id)
+        rpc = _PendingRpc(body)
+        with self._lock:
+            device.queue.append(rpc)
+        with urlopen(device.connection_request_url, timeout=timeout or 30):  # noqa: S310
+            pass
+        if not rpc.done.wait(timeout or 30):
+            msg = f"no response from {device.cpe_id} within {timeout or 30}s"
+            raise TimeoutError(msg)
+        response = rpc.response
+        if response is None or response.rpc == "Fault":
+            msg = f"CWMP fault {response.fault_code if response else None}"
+            raise CwmpFaultError(msg)
+        return response
+
+    def GPV(  # pylint: disable=invalid-name
+        self,
+        param: str | list[str],
+        timeout: int | None = None,
+        cpe_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Execute GetParameterValues RPC call for the specified parameter(s).
+
+        :param param: name of the parameter(s) to perform RPC
+        :type param: str | list[str]
+        :param timeout: seconds to wait for the response, defaults to None
+        :type timeout: int | None
+        :param cpe_id: cpe identifier, defaults to the only registered CPE
+        :type cpe_id: str | None
+        :return: GPV response with keys, value and datatype
+        :rtype: list[dict[str, Any]]
+        """
+        names = [param] if isinstance(param, str) else param
+        response = self._rpc(build_gpv(names), timeout, cpe_id)
+        return [
+            {"key": key, "value": value, "type": response.types[key]}
+            for key, value in response.parameters.items()
+        ]
+
+    def SPV(  # pylint: disable=invalid-name
+        self,
+        param_value: dict[str, Any] | list[dict[str, Any]],
+        timeout: int | None = None,
+        cpe_id: str | None = None,
+    ) -> int:
+        """Execute SetParameterValues RPC call for the specified parameter.
+
+        :param param_value: parameter name to value mapping(s)
+        :type param_value: dict[str, Any] | list[dict[str, Any]]
+        :param timeout: seconds to wait for the response, defaults to None
+        :type timeout: int | None
+        :param cpe_id: cpe identifier, defaults to the only registered CPE
+        :type cpe_id: str | None
+        :return: status of the SPV, either 0 or 1
+        :rtype: int
+        """
+        params = [param_value] if isinstance(param_value, dict) else param_value
+        values = [
+            (name, value, xsd_type(value))
+            for param in params
+            for name, value in param.items()
+        ]
+        return self._rpc(build_spv(values), timeout, cpe_id).status or 0
+
+    def GPN(  # pylint: disable=invalid-name
+        self,
+        param: str,
+        next_level: bool,  # noqa: FBT001
+        timeout: int | None = None,
+        cpe_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Execute GetParameterNames RPC call for the specified parameter.
+
+        :param param: parameter to be discovered
+        :type param: str
+        :param next_level: only report the next level below the parameter
+        :type next_level: bool
+        :param timeout: seconds to wait for the response, defaults to None
+        :type timeout: int | None
+        :param cpe_id: cpe identifier, defaults to the only registered CPE
+        :type cpe_id: str | None
+        :return: parameter names with their writable flag as value
+        :rtype: list[dict[str, Any]]
+        """
+        body = build_gpn(param, next_level=next_level)
+        response = self._rpc(body, timeout, cpe_id)
+        return [
+            {"key": key, "value": writable, "type": "xsd:boolean"}
+            for key, writable in response.parameters.items()
+        ]
+
+
+class _ConnectionRequestHandler(_QuietHandler):
+    server: _ConnectionRequestServer
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Accept a connection request and schedule a session."""
+        self._reply(HTTPStatus.OK)
+        self.server.cpe.request_session()
+
+
+class _ConnectionRequestServer(ThreadingHTTPServer):
+    daemon_threads = True
+    cpe: SimulatedCPE
+
+
+class SimulatedCPE:  # pylint: disable=too-many-instance-attributes
+    """CWMP client answering ACS sessions from an in-memory data model."""
+
+    def __init__(
+        self,
+        acs_url: str,
+        parameters: dict[str, str | int | bool],
+        read_only: set[str] | None = None,
+        serial_number: str = "SIM000001",
+    ) -> None:
+        """Initialize the simulated CPE.
+
+        :param acs_url: ManagementServer.URL to open the sessions to
+        :type acs_url: str
+        :param parameters: data model, parameter name to value
+        :type parameters: dict[str, str | int | bool]
+        :param read_only: parameters rejected by SPV, defaults to None
+        :type read_only: set[str] | None
+        :param serial_number: serial number reported in the Inform
+        :type serial_number: str
+        """
+        self._acs = urlsplit(acs_url)
+        self._server = _ConnectionRequestServer(
+            ("127.0.0.1", 0), _ConnectionRequestHandler
+        )
+        self._server.cpe = self
+        self._read_only = read_only or set()
+        self._values: dict[str, str | int | bool] = {}
+        self._types: dict[str, str] = {}
+        for name, value in parameters.items():
+            self._set(name, value, xsd_type(value))
+        self.device_id = {
+            "Manufacturer": "Boardfarm",
+            "OUI": "0000BF",
+            "ProductClass": "SimulatedCPE",
+            "SerialNumber": serial_number,
+        }
+        cr_url = f"http://127.0.0.1:{self._server.server_port}/"
+        self._set(_CR_URL_PARAM, cr_url, "xsd:string")
+        self._wakeup = threading.Event()
+        self._running = False
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True),
+            threading.Thread(target=self._session_loop, daemon=True),
+        ]
+
+    @property
+    def tr69_cpe_id(self) -> str:
+        """CPE id under which the ACS registers this CPE.
+
+        :return: CPE id
+        :rtype: str
+        """
+        return "-".join(
+            self.device_id[key] for key in ("OUI", "ProductClass", "SerialNumber")
+        )
+
+    @property
+    def sw(self) -> Self:
+        """Mirror ``board.sw`` so the tr069 use cases accept this object.
+
+        :return: the simulated CPE itself
+        :rtype: Self
+        """
+        return self
+
+    def start(self) -> None:
+        """Start listening for connection requests."""
+        self._running = True
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop the simulated CPE."""
+        self._running = False
+        self._wakeup.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> Self:
+        """Start the simulated CPE.
+
+        :return: the started CPE
+        :rtype: Self
+        """
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop the simulated CPE.
+
+        :param exc_type: exception type raised in the context, if any
+        :type exc_type: type[BaseException] | None
+        :param exc_value: exception raised in the context, if any
+        :type exc_value: BaseException | None
+        :param traceback: traceback of the exception, if any
+        :type traceback: TracebackType | None
+        """
+        self.stop()
+
+    def boot(self) -> None:
+        """Open a session with a ``1 BOOT`` Inform, as after a reboot."""
+        self.run_session(["1 BOOT"])
+
+    def request_session(self) -> None:
+        """Schedule a ``6 CONNECTION REQUEST`` session."""
+        self._wakeup.set()
+
+    def _session_loop(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if not self._running:
+                return
+            try:
+                self.run_session(["6 CONNECTION REQUEST"])
+            except OSError:
+                _LOGGER.exception("CWMP session of %s failed", self.tr69_cpe_id)
+
+    def run_session(self, event_codes: list[str]) -> None:
+        """Run one CWMP session until the ACS closes it.
+
+        :param event_codes: event codes reported in the Inform
+        :type event_codes: list[str]
+        """
+        connection = HTTPConnection(self._acs.hostname, self._acs.port, timeout=30)
+        inform_params = ("Device.DeviceInfo.SoftwareVersion", _CR_URL_PARAM)
+        body = build_envelope(
+            build_inform(
+                self.device_id,
+                event_codes,
+                [self._value(name) for name in inform_params if name in self._values],
+            )
+        )
+        try:
+            while True:
+                connection.request("POST", self._acs.path or "/", body)
+                response = connection.getresponse()
+                request = parse_message(response.read())
+                if response.status == HTTPStatus.NO_CONTENT:
+                    return
+                body = (
+                    build_envelope(self._handle(request), request.cwmp_id)
+                    if request is not None and request.rpc != "InformResponse"
+                    else b""
+                )
+        finally:
+            connection.close()
+
+    def _set(self, name: str, value: str | int | bool, data_type: str) -> None:
+        self._values[name] = value
+        self._types[name] = data_type
+
+    def _value(self, name: str) -> tuple[str, str | int | bool, str]:
+        return name, self._values[name], self._types[name]
+
+    def _handle(self, request: CwmpMessage) -> str:
+        if request.rpc == "GetParameterValues":
+            return self._get_parameter_values(request.names)
+        if request.rpc == "SetParameterValues":
+            return self._set_parameter_values(request)
+        if request.rpc == "GetParameterNames":
+            return self._get_parameter_names(request.names[0], request.next_level)
+        return build_fault("9000", f"{request.rpc} is not supported")
+
+    def _get_parameter_values(self, names: list[str]) -> str:
+        values: list[tuple[str, str | int | bool, str]] = []
+        for name in names:
+            if name.endswith("."):
+                values.extend(
+                    self._value(k) for k in self._values if k.startswith(name)
+                )
+            elif name in self._values:
+                values.append(self._value(name))
+            else:
+                return build_fault("9005", f"Invalid parameter name {name}")
+        return build_gpv_response(values)
+
+    def _set_parameter_values(self, request: CwmpMessage) -> str:
+        for name in request.parameters:
+            if name not in self._values:
+                return build_fault("9005", f"Invalid parameter name {name}")
+            if name in self._read_only:
+                return build_fault("9008", f"{name} is not writable")
+        for name, value in request.parameters.items():
+            self._set(name, value, request.types[name])
+        return build_spv_response(0)
+
+    def _get_parameter_names(self, path: str, next_level: bool | None) -> str:
+        names: dict[str, bool] = {}
+        for name in self._values:
+            if not name.startswith(path):
+                continue
+            parts = name[len(path) :].split(".")
+            if next_level:
+                child = path + parts[0] + ("." if len(parts) > 1 else "")
+                names.setdefault(child, child == name and name not in self._read_only)
+                continue
+            for depth in range(1, len(parts)):
+                names.setdefault(path + ".".join(parts[:depth]) + ".", False)
+            names[name] = name not in self._read_only
+        return build_gpn_response(names.items())
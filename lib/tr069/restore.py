@@ -0,0 +1,141 @@
+"""Record TR-069 parameters changed by a test and restore them in one SPV."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Self
+
+from boardfarm3.exceptions import TeardownError
+from boardfarm3.use_cases.tr069 import set_parameter_values
+
+from lib.tr069.snapshot import get_parameter_snapshot
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from boardfarm3.templates.acs import ACS
+    from boardfarm3.templates.cpe import CPE
+
+
+class ParameterRestorer:
+    """Save the original values of the parameters a test sets via SPV.
+
+    Originals are read with one batched GPV per call, no matter how many
+    parameters are involved, and :meth:`restore` puts back every changed
+    parameter with a single SPV, skipping the ones that already hold their
+    original value.
+
+    >>> with ParameterRestorer(acs, board) as restorer:
+    ...     restorer.set_parameter_values([{"Device.X.Enable": False}])
+    """
+
+    def __init__(self, acs: ACS, board: CPE) -> None:
+        """Initialize the restorer.
+
+        :param acs: ACS device instance
+        :type acs: ACS
+        :param board: CPE device instance
+        :type board: CPE
+        """
+        self._acs = acs
+        self._board = board
+        self._originals: dict[str, Any] = {}
+
+    @property
+    def saved(self) -> dict[str, Any]:
+        """Original values of the recorded parameters.
+
+        :return: parameter name to original value mapping
+        :rtype: dict[str, Any]
+        """
+        return dict(self._originals)
+
+    def save(self, params: str | list[str]) -> dict[str, Any]:
+        """Record the current value of parameters that are not yet recorded.
+
+        :param params: parameter name or list of parameter names
+        :type params: str | list[str]
+        :return: original values of the requested parameters
+        :rtype: dict[str, Any]
+        """
+        names = [params] if isinstance(params, str) else params
+        if missing := [name for name in dict.fromkeys(names) if name not in self]:
+            self._originals.update(
+                get_parameter_snapshot(missing, self._acs, self._board)
+            )
+        return {name: self._originals[name] for name in names}
+
+    def set_parameter_values(self, params: list[dict[str, Any]]) -> int:
+        """Execute SPV after recording the original values of the parameters.
+
+        :param params: list of parameter name to value mappings
+        :type params: list[dict[str, Any]]
+        :return: SPV status, 0 or 1 on success
+        :rtype: int
+        """
+        self.save([name for param in params for name in param])
+        return set_parameter_values(params, self._acs, self._board)
+
+    def restore(self) -> dict[str, Any]:
+        """Set every changed parameter back to its original value.
+
+        The originals are kept when the SPV fails, so a later call can try
+        again.
+
+        :return: parameters that had to be restored, with their values
+        :rtype: dict[str, Any]
+        :raises TeardownError: if the SPV status is neither 0 nor 1
+        """
+        if not self._originals:
+            return {}
+        current = get_parameter_snapshot(list(self._originals), self._acs, self._board)
+        changed = {
+            name: value
+            for name, value in self._originals.items()
+            if current.get(name) != value
+        }
+        if changed and (
+            status := set_parameter_values(
+                [{name: value} for name, value in changed.items()],
+                self._acs,
+                self._board,
+            )
+        ) not in [0, 1]:
+            msg = f"Failed to restore {', '.join(changed)}, SPV status {status}"
+            raise TeardownError(msg)
+        self._originals.clear()
+        return changed
+
+    def __contains__(self, name: str) -> bool:
+        """Return whether the original value of a parameter is recorded.
+
+        :param name: parameter name
+        :type name: str
+        :return: True if the parameter is recorded
+        :rtype: bool
+        """
+        return name in self._originals
+
+    def __enter__(self) -> Self:
+        """Enter the restore context.
+
+        :return: the restorer
+        :rtype: Self
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Restore the recorded parameters on exit.
+
+        :param exc_type: exception type raised in the context, if any
+        :type exc_type: type[BaseException] | None
+        :param exc_value: exception raised in the context, if any
+        :type exc_value: BaseException | None
+        :param traceback: traceback of the exception, if any
+        :type traceback: TracebackType | None
+        """
+        self.restore()
@@ -0,0 +1,153 @@
+"""Batched GetParameterValues snapshot of a TR-181 subtree."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator, Mapping
+from typing import TYPE_CHECKING, Any
+
+from boardfarm3.use_cases.tr069 import get_parameter_values
+
+from lib.tr069.cwmp import convert_value
+
+if TYPE_CHECKING:
+    from boardfarm3.templates.acs import ACS, GpvResponse
+    from boardfarm3.templates.cpe import CPE
+
+
+class ParameterSnapshot(Mapping[str, Any]):
+    """Read-only view of the parameters returned by a single GPV RPC.
+
+    The snapshot maps full parameter names to their values, keeps the
+    TR-069 data type of every parameter and offers helpers to query object
+    subtrees and multi-instance tables without issuing further RPCs.
+    ``xsd:boolean`` values are bools and the integer types ints, everything
+    else stays a string.
+
+    >>> snapshot = get_parameter_snapshot("Device.Hosts.Host.1.", acs, board)
+    >>> host = snapshot.subtree("Device.Hosts.Host.1.")
+    >>> host["PhysAddress"], host["Active"]
+    ('00:11:22:33:44:55', True)
+    """
+
+    def __init__(self, values: dict[str, Any], types: dict[str, str]) -> None:
+        """Initialize the snapshot.
+
+        :param values: parameter name to value mapping
+        :type values: dict[str, Any]
+        :param types: parameter name to TR-069 data type mapping
+        :type types: dict[str, str]
+        """
+        self._values = values
+        self._types = types
+
+    @classmethod
+    def from_gpv_response(cls, response: GpvResponse) -> ParameterSnapshot:
+        """Build a snapshot from a GetParameterValues response.
+
+        Values are converted according to their type, see
+        :func:`lib.tr069.cwmp.convert_value`.
+
+        :param response: GPV response with key, value and type entries
+        :type response: GpvResponse
+        :return: snapshot of the response
+        :rtype: ParameterSnapshot
+        """
+        values: dict[str, Any] = {}
+        types: dict[str, str] = {}
+        for entry in response:
+            name = str(entry["key"])
+            types[name] = str(entry.get("type", ""))
+            value = entry["value"]
+            values[name] = convert_value(
+                None if value is None else str(value), types[name]
+            )
+        return cls(values, types)
+
+    def __getitem__(self, name: str) -> Any:  # noqa: ANN401
+        """Return the value of a parameter.
+
+        :param name: full parameter name
+        :type name: str
+        :return: parameter value
+        :rtype: Any
+        """
+        return self._values[name]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the parameter names in response order.
+
+        :return: parameter name iterator
+        :rtype: Iterator[str]
+        """
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        """Return the number of parameters in the snapshot.
+
+        :return: number of parameters
+        :rtype: int
+        """
+        return len(self._values)
+
+    def get_type(self, name: str) -> str:
+        """Return the TR-069 data type of a parameter, e.g. ``xsd:boolean``.
+
+        :param name: full parameter name
+        :type name: str
+        :return: data type as reported by the ACS
+        :rtype: str
+        """
+        return self._types[name]
+
+    def subtree(self, prefix: str) -> ParameterSnapshot:
+        """Return the parameters below an object path, relative to it.
+
+        :param prefix: partial path ending with a dot,
+            e.g. ``Device.Hosts.Host.1.``
+        :type prefix: str
+        :raises ValueError: when the prefix is not a partial path
+        :return: snapshot keyed by the names relative to the prefix
+        :rtype: ParameterSnapshot
+        """
+        if not prefix.endswith("."):
+            msg = f"{prefix!r} is not a partial path"
+            raise ValueError(msg)
+        start = len(prefix)
+        return ParameterSnapshot(
+            {k[start:]: v for k, v in self._values.items() if k.startswith(prefix)},
+            {k[start:]: v for k, v in self._types.items() if k.startswith(prefix)},
+        )
+
+    def instances(self, table: str) -> list[int]:
+        """Return the instance numbers present in a multi-instance object.
+
+        :param table: multi-instance object path, e.g. ``Device.Hosts.Host.``
+        :type table: str
+        :return: sorted instance numbers
+        :rtype: list[int]
+        """
+        pattern = re.compile(rf"^{re.escape(table)}(\d+)\.")
+        found = {int(m[1]) for name in self._values if (m := pattern.match(name))}
+        return sorted(found)
+
+
+def get_parameter_snapshot(
+    params: str | list[str], acs: ACS, board: CPE
+) -> ParameterSnapshot:
+    """Fetch parameters or whole object subtrees in one GPV session.
+
+    Sibling leaves that would otherwise need one connection request each
+    are read in a single round trip. Partial paths (ending with a dot) are
+    expanded by the CPE.
+
+    :param params: parameter name, partial path or a list of them
+    :type params: str | list[str]
+    :param acs: ACS device instance
+    :type acs: ACS
+    :param board: CPE device instance
+    :type board: CPE
+    :return: snapshot of the returned parameters
+    :rtype: ParameterSnapshot
+    """
+    return ParameterSnapshot.from_gpv_response(get_parameter_values(params, acs, board))
@@ -0,0 +1,105 @@
+"""Bounded-memory GetParameterValues over large partial-path subtrees."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from boardfarm3.use_cases.tr069 import get_parameter_values
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from boardfarm3.templates.acs import ACS
+    from boardfarm3.templates.cpe import CPE
+
+
+def _child_names(path: str, acs: ACS, board: CPE) -> list[str]:
+    response = acs.GPN(path, next_level=True, cpe_id=board.sw.tr69_cpe_id)
+    return [str(entry["key"]) for entry in response if entry["key"] != path]
+
+
+def iter_parameter_values(
+    path: str, acs: ACS, board: CPE, depth: int = 1
+) -> Iterator[dict[str, Any]]:
+    """Yield the parameters of a partial path one child object at a time.
+
+    Instead of one GPV returning the whole subtree, the children of
+    ``path`` are discovered with GetParameterNames (next level only) and
+    every child object is fetched with its own GPV, ``depth`` levels down.
+    Leaves directly below an object are read together in one GPV. Only one
+    chunk is held in memory at a time, the first parameters are available
+    after the first chunk and breaking out of the loop skips the remaining
+    RPCs.
+
+    The bound costs time: every GPN and GPV is a CWMP session of its own,
+    so reading a whole subtree this way takes several times longer than the
+    single ``get_parameter_values`` call, about 7 times for 20000
+    parameters in ``benchmarks.bench_gpv_stream``. Use it when memory, the
+    first parameters or an early exit matter, and ``depth=0`` for one GPV.
+    The ACS templates return parsed lists, so the SOAP response itself
+    cannot be streamed here; :func:`lib.tr069.cwmp.iterparse_parameter_values`
+    does that for raw responses, e.g. from a capture.
+
+    >>> for param in iter_parameter_values("Device.WiFi.", acs, board):
+    ...     if param["key"].endswith(".SSID"):
+    ...         break
+
+    :param path: partial path ending with a dot, e.g. ``Device.WiFi.``
+    :type path: str
+    :param acs: ACS device instance
+    :type acs: ACS
+    :param board: CPE device instance
+    :type board: CPE
+    :param depth: object levels to split before issuing GPV, defaults to 1
+    :type depth: int
+    :raises ValueError: when the path is not a partial path
+    :yield: GPV entries with key, value and type
+    :rtype: Iterator[dict[str, Any]]
+    """
+    if not path.endswith("."):
+        msg = f"{path!r} is not a partial path"
+        raise ValueError(msg)
+    if depth <= 0:
+        yield from get_parameter_values(path, acs, board)
+        return
+    children = _child_names(path, acs, board)
+    if leaves := [name for name in children if not name.endswith(".")]:
+        yield from get_parameter_values(leaves, acs, board)
+    for child in children:
+        if child.endswith("."):
+            yield from iter_parameter_values(child, acs, board, depth - 1)
+
+
+def count_parameter_values(
+    path: str,
+    acs: ACS,
+    board: CPE,
+    predicate: Callable[[dict[str, Any]], bool] | None = None,
+    depth: int = 1,
+) -> int:
+    """Count the parameters of a partial path without building a list.
+
+    See :func:`iter_parameter_values` for the RPCs this makes.
+
+    >>> count_parameter_values(
+    ...     "Device.WiFi.", acs, board, lambda param: param["key"].endswith(".SSID")
+    ... )
+
+    :param path: partial path ending with a dot
+    :type path: str
+    :param acs: ACS device instance
+    :type acs: ACS
+    :param board: CPE device instance
+    :type board: CPE
+    :param predicate: only count the entries matching it, defaults to None
+    :type predicate: Callable[[dict[str, Any]], bool] | None
+    :param depth: object levels to split before issuing GPV, defaults to 1
+    :type depth: int
+    :return: number of (matching) parameters
+    :rtype: int
+    """
+    return sum(
+        1
+        for param in iter_parameter_values(path, acs, board, depth)
+        if predicate is None or predicate(param)
+    )
@@ -0,0 +1,238 @@
+"""Typed, indexed CWMP records extracted from captured ACS traffic."""
+
+from __future__ import annotations
+
+import logging
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import IO, TYPE_CHECKING, Any, overload
+from xml.etree.ElementTree import ParseError
+
+from lib.pcap import Endpoint, Flow, TcpReassembler, read_packets, tcp_segment
+from lib.tr069.cwmp import parse_message
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_LOGGER = logging.getLogger(__name__)
+
+_ENVELOPE_START = re.compile(rb"<(?:[\w-]+:)?Envelope\b")
+_ENVELOPE_END = re.compile(rb"</(?:[\w-]+:)?Envelope\s*>")
+# an unterminated envelope bigger than this is not worth waiting for, a GPV
+# response of the whole data model is a few MiB
+_MAX_PENDING = 32 << 20
+
+
+@dataclass
+class CwmpRecord:  # pylint: disable=too-many-instance-attributes
+    """One CWMP RPC seen on the wire."""
+
+    rpc: str
+    timestamp: float
+    session: int
+    src: Endpoint
+    dst: Endpoint
+    cwmp_id: str | None = None
+    event_codes: list[str] = field(default_factory=list)
+    device_id: dict[str, str] = field(default_factory=dict)
+    parameters: dict[str, Any] = field(default_factory=dict)
+    fault_code: str | None = None
+
+
+class CwmpExtractor:  # pylint: disable=too-few-public-methods
+    """Turn captured packets into :class:`CwmpRecord` objects.
+
+    The TCP payload of both directions is reassembled and every complete
+    SOAP envelope is parsed, the record is stamped with the time of the
+    packet that completed it. Used for pcap files and live captures alike.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the extractor."""
+        self._tcp = TcpReassembler()
+        self._streams: dict[Flow, bytes] = {}
+
+    def feed(self, timestamp: float, data: bytes) -> list[CwmpRecord]:
+        """Add a packet.
+
+        :param timestamp: capture timestamp of the packet
+        :type timestamp: float
+        :param data: packet bytes from the IP header on
+        :type data: bytes
+        :return: records completed by this packet
+        :rtype: list[CwmpRecord]
+        """
+        if (segment := tcp_segment(data)) is None:
+            return []
+        if not (payload := self._tcp.feed(segment)):
+            return []
+        stream = self._streams.get(segment.flow, b"")
+        # only an end tag cut by the segment boundary needs a second look
+        scanned = max(stream.rfind(b"</"), 0)
+        stream += payload
+        records = []
+        while end := _ENVELOPE_END.search(stream, scanned):
+            if start := _ENVELOPE_START.search(stream, 0, end.start()):
+                envelope = stream[start.start() : end.end()]
+                if record := self._record(timestamp, segment.flow, envelope):
+                    records.append(record)
+            stream, scanned = stream[end.end() :], 0
+        if len(stream) > _MAX_PENDING:
+            _LOGGER.warning(
+                "dropping %d bytes of %s:%s -> %s:%s without an envelope end",
+                len(stream),
+                *segment.flow[0],
+                *segment.flow[1],
+            )
+            stream = b""
+        self._streams[segment.flow] = stream
+        return records
+
+    def _record(
+        self, timestamp: float, flow: Flow, envelope: bytes
+    ) -> CwmpRecord | None:
+        try:
+            message = parse_message(envelope)
+        except ParseError:
+            _LOGGER.debug("skipping malformed envelope at %s", timestamp)
+            return None
+        if message is None or not message.rpc:
+            return None
+        return CwmpRecord(
+            rpc=message.rpc,
+            timestamp=timestamp,
+            session=self._tcp.session(flow),
+            src=flow[0],
+            dst=flow[1],
+            cwmp_id=message.cwmp_id,
+            event_codes=message.event_codes,
+            device_id=message.device_id,
+            parameters=message.parameters,
+            fault_code=message.fault_code,
+        )
+
+
+class _Index:
+    """Records and their timestamps, sorted by time."""
+
+    def __init__(self) -> None:
+        self.records: list[CwmpRecord] = []
+        self.times: list[float] = []
+
+    def add(self, record: CwmpRecord) -> None:
+        """Append a record, newer than all records added so far."""
+        self.records.append(record)
+        self.times.append(record.timestamp)
+
+    def between(self, after: float | None, before: float | None) -> list[CwmpRecord]:
+        """Return the records captured strictly between two times."""
+        start = 0 if after is None else bisect_right(self.times, after)
+        end = len(self.times) if before is None else bisect_left(self.times, before)
+        return self.records[start:end]
+
+
+class CwmpTrace(Sequence[CwmpRecord]):
+    """CWMP records in time order, indexed by RPC, EventCode and session.
+
+    >>> trace = CwmpTrace.from_pcap(open("acs.pcap", "rb"))
+    >>> boots = trace.find("Inform", event_code="1 BOOT", after=reboot_time)
+    """
+
+    def __init__(self, records: Iterable[CwmpRecord]) -> None:
+        """Initialize the trace.
+
+        :param records: records in any order
+        :type records: Iterable[CwmpRecord]
+        """
+        self._all = _Index()
+        self._by_rpc: defaultdict[str, _Index] = defaultdict(_Index)
+        self._by_event: defaultdict[tuple[str, str], _Index] = defaultdict(_Index)
+        self._by_session: defaultdict[int, list[CwmpRecord]] = defaultdict(list)
+        for record in sorted(records, key=lambda rec: rec.timestamp):
+            self._all.add(record)
+            self._by_rpc[record.rpc].add(record)
+            self._by_session[record.session].append(record)
+            for code in record.event_codes:
+                self._by_event[record.rpc, code].add(record)
+
+    @classmethod
+    def from_pcap(cls, source: IO[bytes]) -> CwmpTrace:
+        """Extract the CWMP records of a pcap file.
+
+        :param source: binary file object of the pcap
+        :type source: IO[bytes]
+        :return: the trace
+        :rtype: CwmpTrace
+        """
+        extractor = CwmpExtractor()
+        return cls(
+            record
+            for timestamp, data in read_packets(source)
+            for record in extractor.feed(timestamp, data)
+        )
+
+    @overload
+    def __getitem__(self, index: int) -> CwmpRecord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[CwmpRecord]: ...
+
+    def __getitem__(self, index: int | slice) -> CwmpRecord | list[CwmpRecord]:
+        """Return records in time order.
+
+        :param index: position or slice
+        :type index: int | slice
+        :return: the record(s)
+        :rtype: CwmpRecord | list[CwmpRecord]
+        """
+        return self._all.records[index]
+
+    def __len__(self) -> int:
+        """Return the number of records.
+
+        :return: number of records
+        :rtype: int
+        """
+        return len(self._all.records)
+
+    def find(
+        self,
+        rpc: str | None = None,
+        event_code: str | None = None,
+        after: float | None = None,
+        before: float | None = None,
+    ) -> list[CwmpRecord]:
+        """Return the records of an RPC and EventCode within a time window.
+
+        :param rpc: RPC name, e.g. ``Inform``, defaults to any RPC
+        :type rpc: str | None
+        :param event_code: EventCode the record must carry, e.g. ``1 BOOT``,
+            implies ``Inform`` when no RPC is given
+        :type event_code: str | None
+        :param after: only records captured after this epoch time
+        :type after: float | None
+        :param before: only records captured before this epoch time
+        :type before: float | None
+        :return: matching records in time order
+        :rtype: list[CwmpRecord]
+        """
+        if event_code is not None:
+            index = self._by_event.get((rpc or "Inform", event_code))
+        elif rpc is not None:
+            index = self._by_rpc.get(rpc)
+        else:
+            index = self._all
+        return index.between(after, before) if index else []
+
+    def session(self, session: int) -> list[CwmpRecord]:
+        """Return the records exchanged in one CWMP session.
+
+        :param session: session number of a record
+        :type session: int
+        :return: records of the session in time order
+        :rtype: list[CwmpRecord]
+        """
+        return self._by_session.get(session, [])
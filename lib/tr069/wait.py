@@ -0,0 +1,126 @@
+"""Wait for TR-069 state observed through the ACS to converge."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any
+
+from boardfarm3.use_cases.tr069 import get_parameter_values, is_dut_online_on_acs
+
+from lib.polling import WaitResult, wait_until
+
+if TYPE_CHECKING:
+    from boardfarm3.templates.acs import ACS
+    from boardfarm3.templates.cpe import CPE
+
+    from lib.tr069.inform import InformWatcher
+
+UPTIME_PARAM = "Device.DeviceInfo.UpTime"
+
+
+def wait_for_parameter_value(
+    param: str,
+    expected: Any,  # noqa: ANN401
+    acs: ACS,
+    board: CPE,
+    timeout: float = 60,
+) -> WaitResult:
+    """Poll a parameter with GPV until it reports the expected value.
+
+    :param param: full parameter name
+    :type param: str
+    :param expected: value the parameter has to converge to
+    :type expected: Any
+    :param acs: ACS device instance
+    :type acs: ACS
+    :param board: CPE device instance
+    :type board: CPE
+    :param timeout: deadline in seconds, defaults to 60
+    :type timeout: float
+    :return: result holding the last value read
+    :rtype: WaitResult
+    """
+    value = None
+
+    def _converged() -> bool:
+        nonlocal value
+        value = get_parameter_values(param, acs, board)[0]["value"]
+        return value == expected
+
+    result = wait_until(_converged, timeout, description=f"{param} == {expected!r}")
+    result.value = value
+    return result
+
+
+def wait_for_acs_registration(  # pylint: disable=too-many-arguments
+    acs: ACS,
+    board: CPE,
+    timeout: float = 60,
+    watcher: InformWatcher | None = None,
+    event_code: str = "1 BOOT",
+    since: float | None = None,
+) -> WaitResult:
+    """Wait until the CPE registered on the ACS again, e.g. after a reboot.
+
+    With an :class:`~lib.tr069.inform.InformWatcher` capturing on the ACS,
+    this returns as soon as the ACS answered the Inform carrying
+    ``event_code``. Without one, the ACS is polled with a short interval
+    instead of the 5 s steps of ``retry(is_dut_online_on_acs, ...)``; with
+    ``since``, the CPE also has to report an ``UpTime`` shorter than the
+    time passed since then, so the ACS state from before the reboot does
+    not count.
+
+    ``since`` is the :func:`time.monotonic` time taken right before the
+    reboot or reset. The result ``value`` is the monotonic time the
+    registration was seen on the test host, with a watcher when the Inform
+    was decoded, so ``elapsed`` is the registration latency on one clock,
+    which tests report with ``record_property``. Without ``since``,
+    ``elapsed`` is only the time spent in this call.
+
+    :param acs: ACS device instance
+    :type acs: ACS
+    :param board: CPE device instance
+    :type board: CPE
+    :param timeout: deadline in seconds, defaults to 60
+    :type timeout: float
+    :param watcher: running Inform watcher on the ACS, defaults to polling
+    :type watcher: InformWatcher | None
+    :param event_code: Inform EventCode awaited by the watcher,
+        defaults to ``1 BOOT``
+    :type event_code: str
+    :param since: :func:`time.monotonic` time of the reboot or reset,
+        defaults to the call
+    :type since: float | None
+    :return: result holding the monotonic arrival time
+    :rtype: WaitResult
+    """
+    if watcher is None:
+
+        def _registered() -> bool:
+            if not is_dut_online_on_acs(acs, board):
+                return False
+            if since is None:
+                return True
+            uptime = int(get_parameter_values(UPTIME_PARAM, acs, board)[0]["value"])
+            return uptime <= time.monotonic() - since
+
+        result = wait_until(
+            _registered,
+            timeout,
+            interval=0.5,
+            max_interval=2.0,
+            description="CPE registration on the ACS",
+        )
+        result.value = time.monotonic() if result else None
+    else:
+        start = time.monotonic()
+        inform = watcher.wait_for_event(event_code, timeout, answered=True)
+        result = WaitResult(
+            converged=inform is not None,
+            value=watcher.arrival(inform) if inform else None,
+            elapsed=time.monotonic() - start,
+            attempts=1,
+        )
+    if result and since is not None:
+        result.elapsed = result.value - since
+    return result
@@ -20,7 +20,7 @@ def pylint(session: nox.Session) -> None:
     """Lint boardfarm-tests using pylint without dev dependencies."""
     session.install("-r", "requirements.txt")
     session.install("--upgrade", "pylint==3.2.6")
-    session.run("pylint", "tests/")
+    session.run("pylint", "tests/", "lib/")
 
 
 @nox.session(python=_PYTHON_VERSIONS)
@@ -29,4 +29,12 @@ def lint(session: nox.Session) -> None:
     session.install("-r", "requirements.txt", "-r", "dev-requirements.txt")
     session.run("ruff", "format", "--check", ".")
     session.run("ruff", "check", ".")
-    session.run("mypy", "tests")
+    session.run("mypy", "tests", "lib")
+
+
+@nox.session(python=_PYTHON_VERSIONS)
+def unittest(session: nox.Session) -> None:
+    """Run the offline unit tests of the lib helpers, no board needed."""
+    session.install("-r", "requirements.txt")
+    session.install("pytest")
+    session.run("pytest", "unittests")
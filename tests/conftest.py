@@ -0,0 +1,287 @@
+"""Fixtures shared by all boardfarm test suites."""
+
+from collections.abc import Callable, Iterator
+from typing import TypeVar
+
+import pytest
+from boardfarm3.exceptions import DeviceNotFound
+from boardfarm3.lib.device_manager import DeviceManager
+from boardfarm3.templates.acs import ACS
+from boardfarm3.templates.cpe import CPE
+from boardfarm3.templates.lan import LAN
+from boardfarm3.templates.provisioner import Provisioner
+from boardfarm3.templates.wan import WAN
+from pytest_boardfarm3.lib.test_logger import TestLogger
+
+from lib.capture_service import CaptureServices
+from lib.context import BoardContext
+from lib.devices import Devices, check_connected, resolve_devices
+from lib.facts import FACTORY_RESET, REBOOT, BoardFacts
+from lib.retry import HISTORY_KEY, LatencyHistory, Retrier
+from lib.teardown import RECOVER_BOARD, TeardownRegistry
+from lib.telemetry import PhaseTelemetry
+from lib.tr069.datamodel import DataModel, load_data_model
+from lib.tr069.restore import ParameterRestorer
+
+pytest_plugins = ("lib.ordering",)
+
+_T = TypeVar("_T")
+_BOARD_FACTS = pytest.StashKey[BoardFacts]()
+# board facts made stale by a test of each board_cost kind
+_COST_EVENTS = {"reboot": REBOOT, "reset": FACTORY_RESET, "reprovision": FACTORY_RESET}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the board phase timing file option."""
+    parser.addoption(
+        "--board-timing",
+        default="board_timing.jsonl",
+        help="JSONL file the board phase durations are appended to",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the retry_budget marker."""
+    config.addinivalue_line(
+        "markers",
+        "retry_budget(seconds): time all retried operations of the test may take",
+    )
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    """Report the console reads saved by the board facts cache."""
+    if facts := config.stash.get(_BOARD_FACTS, None):
+        terminalreporter.write_line(
+            f"board facts cache: {facts.hits} hits, {facts.misses} misses"
+        )
+
+
+def _required(device: _T | None, role: str) -> _T:
+    if device is None:
+        msg = f"No {role} in the testbed"
+        raise DeviceNotFound(msg)
+    return check_connected(device)
+
+
+@pytest.fixture(scope="session")
+def devices(device_manager: DeviceManager) -> Devices:
+    """Every device of the testbed by role, looked up once.
+
+    The role fixtures check the consoles of the devices they return only,
+    a dead LAN client does not fail the tests that never use it.
+    """
+    return resolve_devices(device_manager)
+
+
+@pytest.fixture(scope="session")
+def cpe(
+    devices: Devices,  # pylint: disable=redefined-outer-name
+) -> CPE:
+    """Return the CPE under test."""
+    return _required(devices.cpe, "CPE")
+
+
+@pytest.fixture(scope="session")
+def acs(
+    devices: Devices,  # pylint: disable=redefined-outer-name
+) -> ACS:
+    """Return the ACS."""
+    return _required(devices.acs, "ACS")
+
+
+@pytest.fixture(scope="session")
+def wan(
+    devices: Devices,  # pylint: disable=redefined-outer-name
+) -> WAN:
+    """Return the WAN host."""
+    return _required(devices.wan, "WAN")
+
+
+@pytest.fixture(scope="session")
+def provisioner(
+    devices: Devices,  # pylint: disable=redefined-outer-name
+) -> Provisioner:
+    """Return the provisioner running the DHCP servers."""
+    return _required(devices.provisioner, "provisioner")
+
+
+@pytest.fixture(scope="session")
+def lan_clients(
+    devices: Devices,  # pylint: disable=redefined-outer-name
+) -> list[LAN]:
+    """Return the LAN clients, in inventory order."""
+    return [check_connected(client) for client in devices.lan_clients]
+
+
+@pytest.fixture(scope="session")
+def lan(
+    devices: Devices,  # pylint: disable=redefined-outer-name
+) -> LAN:
+    """Return the first LAN client."""
+    return _required(next(iter(devices.lan_clients), None), "LAN client")
+
+
+@pytest.fixture(scope="session")
+def board_facts(
+    request: pytest.FixtureRequest,
+    cpe: CPE,  # pylint: disable=redefined-outer-name
+) -> BoardFacts:
+    """Provisioning mode, firmware, addresses and MACs of the CPE, read once."""
+    facts = BoardFacts(cpe)
+    request.config.stash[_BOARD_FACTS] = facts
+    return facts
+
+
+@pytest.fixture(autouse=True)
+def _invalidate_board_facts(request: pytest.FixtureRequest) -> Iterator[None]:
+    """Drop the board facts made stale by a test declaring a board_cost."""
+    yield
+
+    marker = request.node.get_closest_marker("board_cost")
+    facts = request.config.stash.get(_BOARD_FACTS, None)
+    if marker and facts and marker.args[0] in _COST_EVENTS:
+        facts.invalidate(_COST_EVENTS[marker.args[0]])
+
+
+@pytest.fixture(scope="session")
+def capture_services() -> Iterator[CaptureServices]:
+    """Return the session-long captures, one per device interface and filter.
+
+    A capture starts with the first test asking for it and runs until the
+    end of the session, tests cut the time window they need from it.
+    """
+    services = CaptureServices()
+
+    yield services
+
+    services.stop_all()
+
+
+@pytest.fixture()
+def teardown_actions(request: pytest.FixtureRequest) -> Iterator[TeardownRegistry]:
+    """Run the compensating actions registered by the test and its fixtures.
+
+    Fixtures using this one are torn down before it, so they register their
+    actions after ``yield`` and all of them run here at once, concurrently
+    unless they share a device or declare an order. When the test uses
+    ``board_telemetry``, that is set up first and so torn down after this
+    one, to record the retries of a recovery; tests that only restore
+    TR-069 parameters do not pay for the telemetry.
+    """
+    if "board_telemetry" in request.fixturenames:
+        request.getfixturevalue("board_telemetry")
+    registry = TeardownRegistry()
+
+    yield registry
+
+    registry.run()
+
+
+@pytest.fixture()
+def tr069_restore(
+    cpe: CPE,  # pylint: disable=redefined-outer-name
+    acs: ACS,  # pylint: disable=redefined-outer-name
+    bf_logger: TestLogger,
+    teardown_actions: TeardownRegistry,  # pylint: disable=redefined-outer-name
+) -> Iterator[ParameterRestorer]:
+    """Restore every TR-069 parameter set by the test with one SPV in teardown.
+
+    The restore waits for a board recovery registered by the test.
+    """
+    restorer = ParameterRestorer(acs, cpe)
+
+    yield restorer
+
+    if restorer.saved:
+        bf_logger.log_step(
+            f"Teardown: Restore {', '.join(restorer.saved)} to the original values"
+        )
+        teardown_actions.register(
+            "restore TR-069 parameters",
+            restorer.restore,
+            cpe.device_name,
+            after=[RECOVER_BOARD],
+        )
+
+
+@pytest.fixture(scope="session")
+def tr069_data_model(
+    cpe: CPE,  # pylint: disable=redefined-outer-name
+    acs: ACS,  # pylint: disable=redefined-outer-name
+    request: pytest.FixtureRequest,
+) -> DataModel:
+    """TR-181 names of the CPE, cached on disk per model and software version."""
+    return load_data_model(acs, cpe, request.config.cache)
+
+
+@pytest.fixture(scope="session")
+def retry_history(request: pytest.FixtureRequest) -> Iterator[LatencyHistory]:
+    """Latency of retried operations, learned across runs in the pytest cache."""
+    cache = request.config.cache
+    history = LatencyHistory(cache.get(HISTORY_KEY, {}) if cache else {})
+
+    yield history
+
+    if cache:
+        cache.set(HISTORY_KEY, history.to_dict())
+
+
+@pytest.fixture()
+def retrier(
+    request: pytest.FixtureRequest,
+    retry_history: LatencyHistory,  # pylint: disable=redefined-outer-name
+    record_property: Callable[[str, object], None],
+) -> Iterator[Retrier]:
+    """Retry operations within the ``retry_budget`` of the test.
+
+    The attempts and detection lag of every retried call are recorded as the
+    ``retry_report`` property of the test.
+    """
+    marker = request.node.get_closest_marker("retry_budget")
+    engine = Retrier(budget=marker.args[0] if marker else None, history=retry_history)
+
+    yield engine
+
+    if engine.records:
+        record_property("retry_report", engine.report())
+
+
+@pytest.fixture()
+def board_telemetry(
+    request: pytest.FixtureRequest,
+    cpe: CPE,  # pylint: disable=redefined-outer-name
+    board_facts: BoardFacts,  # pylint: disable=redefined-outer-name
+    retrier: Retrier,  # pylint: disable=redefined-outer-name
+) -> Iterator[PhaseTelemetry]:
+    """Time the board phases of the test into the ``--board-timing`` file.
+
+    Records are tagged with the test, board model, firmware and mode. The
+    calls retried through ``retrier`` are recorded as phases too.
+    """
+    telemetry = PhaseTelemetry(
+        request.config.getoption("--board-timing"),
+        test=request.node.nodeid,
+        board=cpe.config.get("type", cpe.device_name),
+        firmware=board_facts.firmware,
+        mode=board_facts.mode,
+    )
+    retried = len(retrier.records)
+
+    yield telemetry
+
+    for record in retrier.records[retried:]:
+        telemetry.record(record.operation, record.elapsed, record.converged)
+
+
+@pytest.fixture()
+def board_context(
+    cpe: CPE,  # pylint: disable=redefined-outer-name
+    board_facts: BoardFacts,  # pylint: disable=redefined-outer-name
+    retrier: Retrier,  # pylint: disable=redefined-outer-name
+    board_telemetry: PhaseTelemetry,  # pylint: disable=redefined-outer-name
+    teardown_actions: TeardownRegistry,  # pylint: disable=redefined-outer-name
+) -> BoardContext:
+    """Return the CPE with its facts and the retrier, telemetry and teardown."""
+    return BoardContext(cpe, board_facts, retrier, board_telemetry, teardown_actions)
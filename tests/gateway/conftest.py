@@ -0,0 +1,122 @@
+"""Fixtures shared by the gateway test suite."""
+
+import tempfile
+import time
+from collections.abc import Iterator
+
+import pytest
+from boardfarm3.templates.provisioner import Provisioner
+from boardfarm3.use_cases.cpe import factory_reset
+from boardfarm3.use_cases.dhcpv6 import parse_dhcpv6_trace
+from boardfarm3.use_cases.networking import copy_pcap_to_artifacts
+from boardfarm3.use_cases.online_usecases import (
+    is_board_online_after_reset,
+    wait_for_board_boot_start,
+)
+from pytest_boardfarm3.lib import TestLogger
+
+from lib.bpf import bpf_filter
+from lib.capture import LiveCapture, dhcpv6_reply_to
+from lib.context import BoardContext
+from lib.dhcpv6 import ResetCapture
+from lib.erouter import wait_for_erouter_ip
+from lib.facts import FACTORY_RESET
+from lib.health import recover
+
+
+def _capture_factory_reset(
+    context: BoardContext,
+    provisioner: Provisioner,
+    mode: str,
+    peer: object | None,
+    bf_logger: TestLogger,
+) -> ResetCapture:
+    pcap_file = (
+        f"/{tempfile.template}/dhcpv6_factory_reset_{mode}_"
+        f"{time.strftime('%Y%m%d_%H%M%S')}.pcap"
+    )
+    bf_logger.log_step(
+        f"Setup: Factory reset the DUT ({mode}) while capturing DHCPv6 on the "
+        "DHCP server, shared by all DHCPv6 factory reset tests"
+    )
+    with LiveCapture(
+        provisioner,
+        pcap_file,
+        provisioner.iface_dut,
+        bpf_filter("udp", ports=(546, 547), mode="ipv6"),
+    ) as capture:
+        # registered before the reset, the Reply may come before the board
+        # is reported online
+        reply = capture.watch(dhcpv6_reply_to(peer)) if peer else None
+        with context.telemetry.phase("factory_reset"):
+            factory_reset(context.cpe)
+        context.retrier.call(
+            "board boot start", wait_for_board_boot_start, 150, lambda _: True
+        )
+        online = context.retrier.call(
+            "board online after reset", is_board_online_after_reset, timeout=150
+        )
+        if online:
+            online = wait_for_erouter_ip(context.cpe, mode)
+            context.telemetry.record("erouter ip address", online.elapsed, bool(online))
+        if online and reply is not None:
+            # the capture is closed once the Reply to the eRouter is written
+            reply.wait(timeout=30)
+
+    if not online:
+        bf_logger.log_step(
+            "Setup: Recovering the DUT, as it was not online post Factory Reset"
+        )
+        recover(context.cpe, mode, retrier=context.retrier)
+        copy_pcap_to_artifacts(pcap_file, provisioner, False)  # noqa: FBT003
+        pytest.fail(f"DUT is not online in {mode} mode post Factory Reset")
+    return ResetCapture(
+        mode, pcap_file, provisioner, parse_dhcpv6_trace(provisioner, pcap_file, 300)
+    )
+
+
+@pytest.fixture(scope="session")
+def dhcpv6_reset_captures() -> dict[str, ResetCapture | None]:
+    """Hold the factory reset DHCPv6 captures by mode, None if the reset failed."""
+    return {}
+
+
+@pytest.fixture()
+def dhcpv6_reset_capture(
+    request: pytest.FixtureRequest,
+    provisioner: Provisioner,
+    bf_logger: TestLogger,
+    dhcpv6_reset_captures: dict[str, ResetCapture | None],  # pylint: disable=redefined-outer-name
+    board_context: BoardContext,
+) -> Iterator[ResetCapture]:
+    """DHCPv6 exchange of a fresh factory reset, taken once per mode.
+
+    The first test of a provisioning mode factory resets the DUT while
+    capturing on the DHCP server; later tests in the same mode get the same
+    parsed trace without another reset. When that reset failed, they are
+    skipped instead of resetting the DUT again. The pcap goes to the
+    artifacts when a test using it fails.
+    """
+    facts = board_context.facts
+    mode = facts.mode
+    if mode not in dhcpv6_reset_captures:
+        # the link-local address is derived from the MAC and survives the reset
+        peer = facts.erouter_addresses.link_local_ipv6 if mode != "ipv4" else None
+        facts.invalidate(FACTORY_RESET)
+        # recorded first, so an exception in the reset counts as a failure too
+        dhcpv6_reset_captures[mode] = None
+        dhcpv6_reset_captures[mode] = _capture_factory_reset(
+            board_context, provisioner, mode, peer, bf_logger
+        )
+    elif dhcpv6_reset_captures[mode] is None:
+        pytest.skip(f"the shared factory reset in {mode} mode failed earlier")
+    capture = dhcpv6_reset_captures[mode]
+    assert capture is not None
+    failed = request.session.testsfailed
+
+    yield capture
+
+    if request.session.testsfailed > failed and not capture.pcap_copied:
+        bf_logger.log_step("Teardown: Copying the factory reset pcap to results")
+        copy_pcap_to_artifacts(capture.pcap_file, provisioner, False)  # noqa: FBT003
+        capture.pcap_copied = True
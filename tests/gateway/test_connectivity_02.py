@@ -1,7 +1,6 @@
 """MVX_TST-532: LAN to WAN IPv6 connectivity."""
 
 import pytest
-from boardfarm3.lib.device_manager import DeviceManager
 from boardfarm3.templates.lan import LAN
 from boardfarm3.templates.wan import WAN
 from boardfarm3.use_cases.networking import start_http_server
@@ -19,11 +18,9 @@ from pytest_boardfarm3.lib.test_logger import TestLogger
         }
     }
 )
-def test_MVX_TST_532(bf_logger: TestLogger, device_manager: DeviceManager) -> None:
+def test_MVX_TST_532(bf_logger: TestLogger, lan: LAN, wan: WAN) -> None:
     """LAN to WAN IPv6 connectivity."""
     port = 9001
-    wan = device_manager.get_device_by_type(WAN)  # type: ignore[type-abstract]
-    lan = device_manager.get_device_by_type(LAN)  # type:ignore[type-abstract]
 
     bf_logger.log_step("STEP 1: Start the HTTP server on the WAN client")
     with start_http_server(wan, port=port, ip_version="6"):
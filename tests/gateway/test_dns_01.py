@@ -4,7 +4,6 @@ import re
 from collections.abc import Iterator
 
 import pytest
-from boardfarm3.lib.device_manager import DeviceManager
 from boardfarm3.lib.regexlib import AllValidIpv6AddressesRegex
 from boardfarm3.templates.lan import LAN
 from boardfarm3.use_cases.networking import (
@@ -16,11 +15,10 @@ from pytest_boardfarm3.lib import ContextStorage, TestLogger
 
 @pytest.fixture()
 def setup_teardown(
-    bf_context: ContextStorage, bf_logger: TestLogger, device_manager: DeviceManager
+    bf_context: ContextStorage, bf_logger: TestLogger, lan: LAN
 ) -> Iterator[LAN]:
     """Set up teardown function."""
     bf_context.enable_ipv6 = False  # type: ignore[attr-defined]
-    lan = device_manager.get_device_by_type(LAN)  # type:ignore[type-abstract]
     yield lan
     if bf_context.enable_ipv6:  # type: ignore[attr-defined]
         bf_logger.log_step("Teardown: Enable the IPv6 on Lan client")
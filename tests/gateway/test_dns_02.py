@@ -4,7 +4,6 @@ import re
 from collections.abc import Iterator
 
 import pytest
-from boardfarm3.lib.device_manager import DeviceManager
 from boardfarm3.lib.regexlib import AllValidIpv6AddressesRegex
 from boardfarm3.templates.lan import LAN
 from boardfarm3.templates.wan import WAN
@@ -14,12 +13,10 @@ from pytest_boardfarm3.lib import ContextStorage, TestLogger
 
 @pytest.fixture()
 def setup_teardown(
-    bf_context: ContextStorage, bf_logger: TestLogger, device_manager: DeviceManager
+    bf_context: ContextStorage, bf_logger: TestLogger, lan: LAN, wan: WAN
 ) -> Iterator[tuple[LAN, WAN]]:
     """Set up teardown function."""
     bf_context.enable_ipv4 = False  # type: ignore[attr-defined]
-    lan = device_manager.get_device_by_type(LAN)  # type:ignore[type-abstract]
-    wan = device_manager.get_device_by_type(WAN)  # type:ignore[type-abstract]
     yield lan, wan
     if bf_context.enable_ipv4:  # type: ignore[attr-defined]
         bf_logger.log_step("Teardown: Enable the IPv4 on Lan client")
@@ -3,7 +3,6 @@
 import re
 
 import pytest
-from boardfarm3.lib.device_manager import DeviceManager
 from boardfarm3.lib.regexlib import AllValidIpv6AddressesRegex
 from boardfarm3.templates.lan import LAN
 from boardfarm3.templates.wan import WAN
@@ -18,10 +17,8 @@ from pytest_boardfarm3.lib import TestLogger
         }
     }
 )
-def test_MVX_TST_607(device_manager: DeviceManager, bf_logger: TestLogger) -> None:
+def test_MVX_TST_607(wan: WAN, lan: LAN, bf_logger: TestLogger) -> None:
     """DNS Resolve -IPv4RG mode- CPE IPv4 address_Ethernet."""
-    wan = device_manager.get_device_by_type(WAN)  # type:ignore[type-abstract]
-    lan = device_manager.get_device_by_type(LAN)  # type:ignore[type-abstract]
     wan_ipv4 = wan.ipv4_addr
     wan_host = "wan.boardfarm.com"
 
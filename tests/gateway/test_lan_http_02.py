@@ -1,7 +1,6 @@
 """[MV3]LAN to WAN IPv6 connectivity."""
 
 import pytest
-from boardfarm3.lib.device_manager import DeviceManager
 from boardfarm3.templates.lan import LAN
 from boardfarm3.templates.wan import WAN
 from boardfarm3.use_cases.networking import http_get, start_http_server
@@ -19,10 +18,8 @@ from pytest_boardfarm3.lib.test_logger import TestLogger
         }
     }
 )
-def test_MVX_TST_69262(bf_logger: TestLogger, device_manager: DeviceManager) -> None:
+def test_MVX_TST_69262(bf_logger: TestLogger, wan: WAN, lan: LAN) -> None:
     """LAN to WAN IPv6 connectivity."""
-    wan = device_manager.get_device_by_type(WAN)  # type:ignore[type-abstract]
-    lan = device_manager.get_device_by_type(LAN)  # type:ignore[type-abstract]
     wan_ip = wan.get_eth_interface_ipv6_address()
 
     bf_logger.log_step("Step1: Start the HTTP server on the WAN client")
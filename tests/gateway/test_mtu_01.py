@@ -6,48 +6,58 @@ import time
 from collections.abc import Iterator
 
 import pytest
-from boardfarm3.lib.device_manager import DeviceManager
 from boardfarm3.lib.utils import get_pytest_name
 from boardfarm3.templates.acs import ACS
 from boardfarm3.templates.cpe import CPE
 from boardfarm3.templates.lan import LAN
-from boardfarm3.use_cases.networking import (
-    copy_pcap_to_artifacts,
-    parse_icmp_trace,
-)
-from boardfarm3.use_cases.tr069 import (
-    get_parameter_values,
-    set_parameter_values,
-)
+from boardfarm3.use_cases.networking import copy_pcap_to_artifacts
 from pytest_boardfarm3.lib import ContextStorage, TestLogger
 
+from lib.bpf import ROUTER_ADVERTISEMENT, ROUTER_SOLICITATION, bpf_filter
+from lib.capture_service import CaptureService, CaptureServices
+from lib.ra import load_ra_trace, solicit_router_advertisement
+from lib.tr069.datamodel import DataModel
+from lib.tr069.restore import ParameterRestorer
+from lib.tr069.wait import wait_for_parameter_value
+
+_RA_FILTER = bpf_filter(
+    "icmp6", icmp6_types=(ROUTER_SOLICITATION, ROUTER_ADVERTISEMENT)
+)
+
 
 @pytest.fixture()
-def setup_teardown(
-    bf_context: ContextStorage, bf_logger: TestLogger, device_manager: DeviceManager
-) -> Iterator[tuple[str, LAN, str, str, CPE, ACS]]:
+def setup_teardown(  # pylint: disable=too-many-arguments
+    bf_context: ContextStorage,
+    bf_logger: TestLogger,
+    lan: LAN,
+    cpe: CPE,
+    acs: ACS,
+    tr069_restore: ParameterRestorer,
+    tr069_data_model: DataModel,
+    capture_services: CaptureServices,
+) -> Iterator[tuple[str, LAN, str, str, CPE, ACS, CaptureService]]:
     """Test setup and teardown."""
-    bf_context.spv_success = (  # type: ignore[attr-defined]
-        bf_context.pcap_started  # type: ignore[attr-defined]
-    ) = bf_context.success = False  # type: ignore[attr-defined]
+    bf_context.pcap_started = bf_context.success = False  # type: ignore[attr-defined]
     tmp = tempfile.template
     pcap_file = (
         f"/{tmp}/{get_pytest_name().split('(')[0]}_"
         f"{time.strftime('%Y%m%d_%H%M%S')}.pcap"
     )
     ra_param = "Device.RouterAdvertisement.InterfaceSetting.1.AdvLinkMTU"
-    lan = device_manager.get_device_by_type(LAN)  # type:ignore[type-abstract]
-    board = device_manager.get_device_by_type(CPE)  # type:ignore[type-abstract]
-    acs = device_manager.get_device_by_type(ACS)  # type:ignore[type-abstract]
-    default_ra_mtu_value = get_parameter_values(ra_param, acs, board)[0]["value"]
-    yield pcap_file, lan, ra_param, default_ra_mtu_value, board, acs
-    if bf_context.spv_success:  # type: ignore[attr-defined]
-        bf_logger.log_step("Teardown: Setting ra mtu value to default")
-        set_parameter_values([{ra_param: default_ra_mtu_value}], acs, board)
+    assert tr069_data_model.is_writable(
+        ra_param
+    ), f"{ra_param} is not writable in {tr069_data_model.version}"
+    default_ra_mtu_value = tr069_restore.save(ra_param)[ra_param]
+    # ICMPv6 on the LAN is captured for the whole session, tests slice it
+    capture = capture_services.get(lan, lan.iface_dut, bpf_filter("icmp6"))
+    start = capture.now()
+    yield pcap_file, lan, ra_param, default_ra_mtu_value, cpe, acs, capture
     if bf_context.pcap_started:  # type: ignore[attr-defined]
         bf_logger.log_step(
             "Teardown: Copying pcap to results folder in case of testcase failure"
         )
+        if not bf_context.success:  # type: ignore[attr-defined]
+            capture.slice(pcap_file, start, capture.now(), _RA_FILTER)
         copy_pcap_to_artifacts(pcap_file, lan, bf_context.success)  # type: ignore[attr-defined]
 
 
@@ -63,17 +73,17 @@ def setup_teardown(
     }
 )
 def test_MVX_TST_106953(
-    setup_teardown: tuple[str, LAN, str, str, CPE, ACS],  # pylint: disable=redefined-outer-name
+    setup_teardown: tuple[str, LAN, str, str, CPE, ACS, CaptureService],  # pylint: disable=redefined-outer-name
     bf_logger: TestLogger,
     bf_context: ContextStorage,
+    tr069_restore: ParameterRestorer,
 ) -> None:
     """MTU path announcement in IPv6 RA messages.
 
     The purpose of this testcase is to verify that the MTU path
     announcement must be present in IPv6 RAs.
     """
-    pcap_file, lan, ra_param, default_ra_mtu_value, board, acs = setup_teardown
-    option_list_to_match = []
+    pcap_file, lan, ra_param, default_ra_mtu_value, board, acs, capture = setup_teardown
 
     def _generate_random_no() -> int:
         random_no = secrets.choice(range(1280, 1500))
@@ -83,40 +93,41 @@ def test_MVX_TST_106953(
             return_value = random_no
         return return_value
 
-    bf_logger.log_step("Step1: Make sure to start the packet capture on LAN side")
-    with lan.tcpdump_capture(fname=pcap_file, interface=lan.iface_dut):
-        bf_context.pcap_started = True  # type: ignore[attr-defined]
+    bf_logger.log_step(
+        "Step1: Make sure the packet capture on LAN side is running - handled by "
+        "the session-long capture service"
+    )
+    start = capture.now()
+    bf_context.pcap_started = True  # type: ignore[attr-defined]
 
-        bf_logger.log_step(
-            f"Step2: Execute SPV on {ra_param} with valid value within range 1280-1500"
-        )
-        ra_value = _generate_random_no()
-        assert set_parameter_values([{ra_param: ra_value}], acs, board) in [
-            0,
-            1,
-        ], f"SPV unsuccessful in setting {ra_param} to {ra_value}"
-        bf_context.spv_success = True  # type: ignore[attr-defined]
-        time.sleep(10)
+    bf_logger.log_step(
+        f"Step2: Execute SPV on {ra_param} with valid value within range 1280-1500"
+    )
+    ra_value = _generate_random_no()
+    assert tr069_restore.set_parameter_values([{ra_param: ra_value}]) in [
+        0,
+        1,
+    ], f"SPV unsuccessful in setting {ra_param} to {ra_value}"
 
-        bf_logger.log_step(f"Step3: Execute GPV on {ra_param}")
-        assert (
-            get_parameter_values(ra_param, acs, board)[0]["value"] == ra_value
-        ), f"GPV on {ra_param} didn't returned value set in step2"
-        time.sleep(180)
+    bf_logger.log_step(f"Step3: Execute GPV on {ra_param}")
+    assert wait_for_parameter_value(
+        ra_param, ra_value, acs, board, timeout=30
+    ), f"GPV on {ra_param} didn't returned value set in step2"
+    # solicit an RA instead of waiting up to MaxRtrAdvInterval for one
+    assert solicit_router_advertisement(
+        lan, lambda ra: ra.mtu == ra_value, timeout=180
+    ), f"No Router Advertisement with MTU {ra_value} answered the solicitations"
+    capture.slice(pcap_file, start, capture.now(), _RA_FILTER)
 
     bf_logger.log_step(
         "Step4: Check from the packet capture that the configured MTU path "
         "announcement is present in IPv6 Router Advertisement message"
     )
-    output_lan = parse_icmp_trace(lan, pcap_file, "-V -Y 'icmpv6.type == 134'")
+    advertisements = load_ra_trace(lan, pcap_file)
     assert (
-        output_lan
+        advertisements
     ), "Router Advertisement packets are not found in pcap data captured on lan"
-    option_list_to_match = [
-        options.strip() if isinstance(options, str) else options
-        for options in output_lan
-    ]
-    assert (
-        f"ICMPv6 Option (MTU : {ra_value})" in option_list_to_match
+    assert advertisements.find(
+        mtu=ra_value
     ), "Configured MTU is not present in IPv6 Router Advertisement message"
     bf_context.success = True  # type: ignore[attr-defined]
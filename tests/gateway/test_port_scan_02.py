@@ -3,7 +3,6 @@
 from typing import Any
 
 import pytest
-from boardfarm3.lib.device_manager import DeviceManager
 from boardfarm3.templates.cpe import CPE
 from boardfarm3.templates.wan import WAN
 from boardfarm3.use_cases.networking import create_tcp_udp_session
@@ -21,7 +20,8 @@ from pytest_boardfarm3.lib import TestLogger
     }
 )
 def test_IPv4RG_Mode_Port_scan_eRouter_WAN_IP_from_WAN(
-    device_manager: DeviceManager,
+    wan: WAN,
+    cpe: CPE,
     bf_logger: TestLogger,
 ) -> None:
     """[SEC] PortScan - IPv4RG Mode - Port scan eRouter WAN IP from WAN.
@@ -29,8 +29,6 @@ def test_IPv4RG_Mode_Port_scan_eRouter_WAN_IP_from_WAN(
     The objective of this test case is to verify that None of the ports should be open
     by default on Erouter WAN IP when tried from WAN Client in IPv4 mode.
     """
-    wan = device_manager.get_device_by_type(WAN)  # type:ignore[type-abstract]
-    board = device_manager.get_device_by_type(CPE)  # type:ignore[type-abstract]
 
     def _output_validation(nmap_output: dict[str, Any]) -> None:
         tcp_port_state = nmap_output["nmaprun"]["host"]["ports"]["port"][0]["state"][
@@ -46,7 +44,7 @@ def test_IPv4RG_Mode_Port_scan_eRouter_WAN_IP_from_WAN(
         "Step 1:  Run nmap to erouter WAN IP from WAN Client and verify that "
         "no ports are open. "
     )
-    nmap_output = create_tcp_udp_session(wan, board, "ipv4", 65535, 4, timeout=30)
+    nmap_output = create_tcp_udp_session(wan, cpe, "ipv4", 65535, 4, timeout=30)
     assert "Nmap done" in str(nmap_output), "NMAP is not successful"
     assert "1 IP address (1 host up)" in str(
         nmap_output
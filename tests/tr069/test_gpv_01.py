@@ -6,50 +6,66 @@ import pytest
 from boardfarm3.lib.device_manager import DeviceManager
 from boardfarm3.templates.acs import ACS
 from boardfarm3.templates.cpe import CPE
-from boardfarm3.use_cases.tr069 import (
-    get_ccsptr069_pid,
-    get_parameter_values,
-    set_parameter_values,
-)
-from pytest_boardfarm3.boardfarm_fixtures import ContextStorage
+from boardfarm3.use_cases.tr069 import get_ccsptr069_pid, get_parameter_values
 from pytest_boardfarm3.lib.test_logger import TestLogger
 
+from lib.teardown import TeardownRegistry
+from lib.tr069.fanout import fan_out, get_parameter_values_all
+from lib.tr069.restore import ParameterRestorer
+from lib.tr069.snapshot import get_parameter_snapshot
+
+DNS_PARAM = "Device.DNS.Diagnostics.NSLookupDiagnostics.NumberOfRepetitions"
+ENV_REQ = {
+    "environment_def": {
+        "board": {
+            "lan_clients": [{}],
+            "eRouter_Provisioning_mode": ["dual", "ipv4", "ipv6"],
+        },
+        "tr-069": {},
+    }
+}
+
 
 @pytest.fixture()
 def setup_teardown(
-    bf_context: ContextStorage,
+    cpe: CPE,
+    acs: ACS,
+) -> tuple[str, CPE, ACS]:
+    """Test setup."""
+    return DNS_PARAM, cpe, acs
+
+
+@pytest.fixture(scope="module")
+def boards(device_manager: DeviceManager) -> dict[str, CPE]:
+    """Every CPE of the testbed by device name."""
+    return device_manager.get_devices_by_type(CPE)  # type:ignore[type-abstract]
+
+
+@pytest.fixture()
+def fleet_restore(
+    boards: dict[str, CPE],  # pylint: disable=redefined-outer-name
+    acs: ACS,
     bf_logger: TestLogger,
-    device_manager: DeviceManager,
-) -> Iterator[tuple[str, CPE, ACS]]:
-    """Test setup and teardown."""
-    bf_context.spv_success = False  # type: ignore[attr-defined]
-    board = device_manager.get_device_by_type(CPE)  # type:ignore[type-abstract]
-    acs = device_manager.get_device_by_type(ACS)  # type:ignore[type-abstract]
-    dns_param = "Device.DNS.Diagnostics.NSLookupDiagnostics.NumberOfRepetitions"
-    default_value = get_parameter_values(dns_param, acs, board)[0]["value"]
-
-    yield dns_param, board, acs
-
-    if bf_context.spv_success:  # type: ignore[attr-defined]
-        bf_logger.log_step(f"Teardown: Set {dns_param} value to default")
-        set_parameter_values([{dns_param: default_value}], acs, board)
-
-
-@pytest.mark.env_req(
-    {
-        "environment_def": {
-            "board": {
-                "lan_clients": [{}],
-                "eRouter_Provisioning_mode": ["dual", "ipv4", "ipv6"],
-            },
-            "tr-069": {},
-        }
-    }
-)
+    teardown_actions: TeardownRegistry,
+) -> Iterator[dict[str, ParameterRestorer]]:
+    """Restore the parameters set on every CPE, one SPV per CPE in teardown."""
+    restorers = {name: ParameterRestorer(acs, board) for name, board in boards.items()}
+
+    yield restorers
+
+    if changed := [name for name, restorer in restorers.items() if restorer.saved]:
+        bf_logger.log_step(f"Teardown: Restore {DNS_PARAM} on {', '.join(changed)}")
+    for name in changed:
+        teardown_actions.register(
+            f"restore TR-069 parameters on {name}", restorers[name].restore, name
+        )
+
+
+@pytest.mark.env_req(ENV_REQ)
 def test_MVX_TST_104413(
     setup_teardown: tuple[str, CPE, ACS],  # pylint: disable=redefined-outer-name
     bf_logger: TestLogger,
-    bf_context: ContextStorage,
+    tr069_restore: ParameterRestorer,
 ) -> None:
     """GetParameterValues RPC on "Device." object."""
     dns_param, board, acs = setup_teardown
@@ -65,15 +81,58 @@ def test_MVX_TST_104413(
         f"Step 3: Execute SPV RPC by providing parameter name as: {dns_param} and "
         "value as 4"
     )
-    assert set_parameter_values([{dns_param: dns_value}], acs, board) in [
+    assert tr069_restore.set_parameter_values([{dns_param: dns_value}]) in [
         0,
         1,
     ], f"Failed to set {dns_param} value to 4"
-    bf_context.spv_success = True  # type: ignore[attr-defined]
 
     bf_logger.log_step(
         f"Step 4: Execute GPV RPC by providing parameter name as: {dns_param}"
     )
     assert (
-        get_parameter_values(dns_param, acs, board)[0]["value"] == dns_value
+        get_parameter_snapshot(dns_param, acs, board)[dns_param] == dns_value
     ), "GPV is unsuccessful and did not returned value as 4"
+
+
+@pytest.mark.env_req(ENV_REQ)
+def test_gpv_all_boards(
+    boards: dict[str, CPE],  # pylint: disable=redefined-outer-name
+    acs: ACS,
+    bf_logger: TestLogger,
+) -> None:
+    """GPV on "Device.WiFi." on all CPEs concurrently."""
+    bf_logger.log_step(f"Step 1: Perform GPV on Device.WiFi. on {len(boards)} CPEs")
+    results = get_parameter_values_all("Device.WiFi.", acs, boards)
+    assert all(
+        result and result.value for result in results.values()
+    ), f"GPV is unsuccessful on {[name for name, res in results.items() if not res]}"
+
+
+@pytest.mark.env_req(ENV_REQ)
+@pytest.mark.parametrize("dns_value", [2, 4])
+def test_spv_all_boards(
+    boards: dict[str, CPE],  # pylint: disable=redefined-outer-name
+    acs: ACS,
+    bf_logger: TestLogger,
+    fleet_restore: dict[str, ParameterRestorer],  # pylint: disable=redefined-outer-name
+    dns_value: int,
+) -> None:
+    """SPV and GPV of one parameter on all CPEs concurrently."""
+    bf_logger.log_step(
+        f"Step 1: Execute SPV RPC with {DNS_PARAM} = {dns_value} on every CPE"
+    )
+    results = fan_out(
+        lambda board: fleet_restore[board.device_name].set_parameter_values(
+            [{DNS_PARAM: dns_value}]
+        ),
+        boards,
+    )
+    assert all(
+        result and result.value in [0, 1] for result in results.values()
+    ), f"Failed to set {DNS_PARAM} to {dns_value}: {results}"
+
+    bf_logger.log_step(f"Step 2: Execute GPV RPC with {DNS_PARAM} on every CPE")
+    results = get_parameter_values_all(DNS_PARAM, acs, boards)
+    assert all(
+        result and result.value[DNS_PARAM] == dns_value for result in results.values()
+    ), f"GPV did not return {dns_value}: {results}"
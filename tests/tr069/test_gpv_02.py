@@ -1,38 +1,23 @@
 """[SCMv3]: GetParameterValues RPC on "Device." object."""
 
-from collections.abc import Iterator
-
 import pytest
-from boardfarm3.lib.device_manager import DeviceManager
 from boardfarm3.templates.acs import ACS
 from boardfarm3.templates.cpe import CPE
-from boardfarm3.use_cases.tr069 import (
-    get_ccsptr069_pid,
-    get_parameter_values,
-    set_parameter_values,
-)
-from pytest_boardfarm3.boardfarm_fixtures import ContextStorage
+from boardfarm3.use_cases.tr069 import get_ccsptr069_pid, get_parameter_values
 from pytest_boardfarm3.lib.test_logger import TestLogger
 
+from lib.tr069.restore import ParameterRestorer
+from lib.tr069.snapshot import get_parameter_snapshot
+
 
 @pytest.fixture()
 def setup_teardown(
-    bf_context: ContextStorage,
-    bf_logger: TestLogger,
-    device_manager: DeviceManager,
-) -> Iterator[tuple[str, CPE, ACS]]:
-    """Test setup and teardown."""
-    bf_context.spv_success = False  # type: ignore[attr-defined]
-    board = device_manager.get_device_by_type(CPE)  # type:ignore[type-abstract]
-    acs = device_manager.get_device_by_type(ACS)  # type:ignore[type-abstract]
+    cpe: CPE,
+    acs: ACS,
+) -> tuple[str, CPE, ACS]:
+    """Test setup."""
     dns_param = "Device.DNS.Diagnostics.NSLookupDiagnostics.NumberOfRepetitions"
-    default_value = get_parameter_values(dns_param, acs, board)[0]["value"]
-
-    yield dns_param, board, acs
-
-    if bf_context.spv_success:  # type: ignore[attr-defined]
-        bf_logger.log_step(f"Teardown: Set {dns_param} value to default")
-        set_parameter_values([{dns_param: default_value}], acs, board)
+    return dns_param, cpe, acs
 
 
 @pytest.mark.env_req(
@@ -46,7 +31,7 @@ def setup_teardown(
 def test_MVX_TST_105789(
     setup_teardown: tuple[str, CPE, ACS],  # pylint: disable=redefined-outer-name
     bf_logger: TestLogger,
-    bf_context: ContextStorage,
+    tr069_restore: ParameterRestorer,
 ) -> None:
     """[SCMv3]: GetParameterValues RPC on "Device." object."""
     dns_param, board, acs = setup_teardown
@@ -62,15 +47,14 @@ def test_MVX_TST_105789(
         f"Step 3: Execute SPV RPC by providing parameter name as: {dns_param} and "
         "value as 4"
     )
-    assert set_parameter_values([{dns_param: dns_value}], acs, board) in [
+    assert tr069_restore.set_parameter_values([{dns_param: dns_value}]) in [
         0,
         1,
     ], f"Failed to set {dns_param} value to 4"
-    bf_context.spv_success = True  # type: ignore[attr-defined]
 
     bf_logger.log_step(
         f"Step 4: Execute GPV RPC by providing parameter name as: {dns_param}"
     )
     assert (
-        get_parameter_values(dns_param, acs, board)[0]["value"] == dns_value
+        get_parameter_snapshot(dns_param, acs, board)[dns_param] == dns_value
     ), "GPV is unsuccessful and did not returned value as 4"
@@ -1,54 +1,46 @@
 """MVX_TST-113353."""
 
-from collections.abc import Iterator
+import time
+from collections.abc import Callable, Iterator
 
 import pytest
-from boardfarm3.exceptions import TeardownError
-from boardfarm3.lib.device_manager import DeviceManager
-from boardfarm3.lib.utils import retry, retry_on_exception
 from boardfarm3.templates.acs import ACS
 from boardfarm3.templates.cpe.cpe import CPE
-from boardfarm3.use_cases.cpe import get_cpe_provisioning_mode
 from boardfarm3.use_cases.erouter import verify_erouter_ip_address
 from boardfarm3.use_cases.online_usecases import (
     is_board_online_after_reset,
     power_cycle,
 )
-from boardfarm3.use_cases.tr069 import (
-    get_parameter_values,
-    is_dut_online_on_acs,
-)
+from boardfarm3.use_cases.tr069 import get_parameter_values
 from pytest_boardfarm3.lib.test_logger import TestLogger
 from pytest_boardfarm3.lib.utils import ContextStorage
 
+from lib.context import BoardContext
+from lib.tr069.wait import wait_for_acs_registration
+
 
 @pytest.fixture()
 def setup_teardown(
     bf_context: ContextStorage,
-    device_manager: DeviceManager,
+    acs: ACS,
     bf_logger: TestLogger,
+    board_context: BoardContext,
 ) -> Iterator[tuple[str, CPE, ACS]]:
     """Test fixture."""
     bf_context.check_after_reboot = False  # type: ignore[attr-defined]
-    board = device_manager.get_device_by_type(CPE)  # type:ignore[type-abstract]
-    acs = device_manager.get_device_by_type(ACS)  # type:ignore[type-abstract]
-    mode = get_cpe_provisioning_mode(board=board)
+    mode = board_context.facts.mode
 
-    yield mode, board, acs
+    yield mode, board_context.cpe, acs
 
     if bf_context.check_after_reboot:  # type: ignore[attr-defined]
         bf_logger.log_step(
-            "Teardown: Rebooting as the DUT was not online after reboot in test step."
+            "Teardown: Probing the DUT health as it may not be online after "
+            "reboot in test step, recovering only what is missing."
         )
-        power_cycle(board)
-        if not retry_on_exception(is_board_online_after_reset, (), 5, 15):
-            msg = "Board not online after reboot in teardown"
-            raise TeardownError(msg)
-        if not verify_erouter_ip_address(mode=mode, board=board, retry=9):
-            msg = f"erouter does not get ip in required mode {mode}"
-            raise TeardownError(msg)
+        board_context.register_recovery(mode, acs)
 
 
+@pytest.mark.board_cost("reboot")
 @pytest.mark.env_req(
     {
         "environment_def": {
@@ -64,6 +56,8 @@ def test_MVX_TST_113353(
     setup_teardown: tuple[str, CPE, ACS],  # pylint: disable=redefined-outer-name
     bf_logger: TestLogger,
     bf_context: ContextStorage,
+    record_property: Callable[[str, object], None],
+    board_context: BoardContext,
 ) -> None:
     """ACS connectivity after performing reboot on the CPE."""
     mode, board, acs = setup_teardown
@@ -80,17 +74,23 @@ def test_MVX_TST_113353(
         "Step2: Perform a reboot on the CPE and wait till CPE comes online"
     )
     bf_context.check_after_reboot = True  # type: ignore[attr-defined]
-    power_cycle(board)
-    assert is_board_online_after_reset(), "Board is not online after reset"
+    reboot_time = time.monotonic()
+    with board_context.telemetry.phase("power_cycle"):
+        power_cycle(board)
+    with board_context.telemetry.phase("is_board_online_after_reset") as outcome:
+        online = outcome.ok = is_board_online_after_reset()
+    assert online, "Board is not online after reset"
     bf_context.check_after_reboot = False  # type: ignore[attr-defined]
-    assert verify_erouter_ip_address(
-        mode=mode, board=board, retry=9
+    assert board_context.retrier.call(
+        "erouter ip address",
+        lambda: verify_erouter_ip_address(mode=mode, board=board, retry=1),
+        timeout=180,
     ), f"erouter didn't get erouter ip for {mode}"
 
     bf_logger.log_step("Step3: Verify the DUT registration status on the ACS")
-    assert retry(
-        is_dut_online_on_acs, 6, acs, board
-    ), "DUT is not online on ACS after reboot"
+    registration = wait_for_acs_registration(acs, board, since=reboot_time)
+    record_property("acs_registration_latency", registration.elapsed)
+    assert registration, "DUT is not online on ACS after reboot"
 
     bf_logger.log_step(
         f"Step4: Verify ACS Connectivity by performing GPV RPC on {param}"
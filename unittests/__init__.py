@@ -0,0 +1 @@
+"""Unit tests of the shared test library, run without boardfarm devices."""
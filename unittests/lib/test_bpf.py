@@ -0,0 +1,74 @@
+"""Unit tests of the tcpdump capture filter builder."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from lib.bpf import ROUTER_ADVERTISEMENT, ROUTER_SOLICITATION, bpf_filter, erouter_hosts
+
+ADDRESSES = SimpleNamespace(
+    ipv4="10.1.0.2", ipv6="2001:db8::2", link_local_ipv6="fe80::2"
+)
+DHCPV6_PORTS = (546, 547)
+
+
+def test_protocol_ports_and_family() -> None:
+    """The family leads unless an ICMP protocol already implies it."""
+    assert bpf_filter("udp", ports=DHCPV6_PORTS, mode="ipv6") == (
+        "ip6 and udp and (port 546 or port 547)"
+    )
+    assert bpf_filter("tcp", ports=[7547, 7547]) == "tcp and port 7547"
+    assert bpf_filter("icmp6", mode="ipv6") == "icmp6"
+    assert not bpf_filter()
+
+
+def test_icmp6_types() -> None:
+    """ICMPv6 types match the byte after the fixed IPv6 header."""
+    assert (
+        bpf_filter("icmp6", icmp6_types=(ROUTER_SOLICITATION, ROUTER_ADVERTISEMENT))
+        == "icmp6 and (ip6[40] == 133 or ip6[40] == 134)"
+    )
+
+
+def test_hosts_of_the_other_family_are_dropped() -> None:
+    """Only the addresses of the captured family end up in the filter."""
+    hosts = erouter_hosts(ADDRESSES, "dual")  # type: ignore[arg-type]
+
+    assert bpf_filter("tcp", hosts=hosts) == (
+        "tcp and (host 10.1.0.2 or host 2001:db8::2)"
+    )
+    assert bpf_filter("tcp", hosts=hosts, mode="ipv4") == "ip and tcp and host 10.1.0.2"
+    assert bpf_filter("icmp6", hosts=[*hosts, None]) == "icmp6 and host 2001:db8::2"
+
+
+@pytest.mark.parametrize(
+    ("protocol", "kwargs"),
+    [
+        ("icmp6", {"mode": "ipv4"}),
+        ("icmp", {"mode": "ipv6"}),
+        ("udp", {"icmp6_types": [ROUTER_ADVERTISEMENT]}),
+        ("tcp", {"hosts": ["10.1.0.2"], "mode": "ipv6"}),
+    ],
+)
+def test_filters_never_matching_are_rejected(
+    protocol: str, kwargs: dict[str, object]
+) -> None:
+    """A filter that would capture nothing raises instead."""
+    with pytest.raises(ValueError, match=r"\w"):
+        bpf_filter(protocol, **kwargs)  # type: ignore[arg-type]
+
+
+def test_erouter_hosts_by_mode() -> None:
+    """The addresses follow the provisioning mode, link-local on request."""
+    assert erouter_hosts(ADDRESSES, "ipv4") == ["10.1.0.2"]  # type: ignore[arg-type]
+    assert erouter_hosts(ADDRESSES, "ipv6", link_local=True) == [  # type: ignore[arg-type]
+        "2001:db8::2",
+        "fe80::2",
+    ]
+    assert (
+        erouter_hosts(
+            SimpleNamespace(ipv4=None, ipv6=None, link_local_ipv6=None),  # type: ignore[arg-type]
+            "dual",
+        )
+        == []
+    )
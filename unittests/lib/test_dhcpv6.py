@@ -0,0 +1,63 @@
+"""Unit tests of the DHCPv6 trace index against nested_lookup scans."""
+
+from nested_lookup import nested_lookup
+
+from benchmarks.bench_dhcpv6_index import synthetic_trace
+from lib.dhcpv6 import (
+    ADVERTISE,
+    IA_PD,
+    REPLY,
+    REQUEST,
+    SOLICIT,
+    Dhcpv6Index,
+    index_fields,
+)
+
+CPE_PEER = "fe80::1"
+BOOTS = 2
+CLIENTS = 3
+
+
+def test_index_fields_matches_nested_lookup() -> None:
+    """Every key has the values nested_lookup returns, in the same order."""
+    for packet in synthetic_trace(1, 1):
+        fields = index_fields(packet.dhcpv6_packet)
+
+        assert fields
+        for key, values in fields.items():
+            assert values == nested_lookup(key, packet.dhcpv6_packet), key
+
+
+def test_exchange_and_messages_of_a_peer() -> None:
+    """The index returns what the per-test scans returned."""
+    trace = synthetic_trace(BOOTS, CLIENTS)
+    index = Dhcpv6Index(trace)  # type: ignore[arg-type]
+
+    scanned = [
+        packet
+        for packet in trace
+        if CPE_PEER in nested_lookup("dhcpv6.peeraddr", packet.dhcpv6_packet)
+    ]
+    assert [message.trace for message in index.exchange(CPE_PEER)] == scanned
+    solicits = index.messages(CPE_PEER, SOLICIT)
+    assert len(solicits) == BOOTS
+    assert all(message.peer == CPE_PEER for message in solicits)
+    assert len(index.messages(None, ADVERTISE)) == BOOTS * CLIENTS
+    assert all(message.ia_pd for message in index.exchange(CPE_PEER))
+    assert all(
+        message.lookup(IA_PD) == nested_lookup(IA_PD, message.packet)
+        for message in index.all
+    )
+
+
+def test_transaction_groups_the_four_messages() -> None:
+    """Solicit to Reply of one client and boot share a transaction id."""
+    index = Dhcpv6Index(synthetic_trace(BOOTS, CLIENTS))  # type: ignore[arg-type]
+
+    last_reply = index.messages(CPE_PEER, REPLY)[-1]
+    assert [message.msg_type for message in index.transaction(last_reply.xid)] == [
+        SOLICIT,
+        ADVERTISE,
+        REQUEST,
+        REPLY,
+    ]
@@ -0,0 +1,37 @@
+"""Unit tests of the console milestone waiter."""
+
+import pexpect
+
+from lib.milestones import MilestoneWaiter, boot_milestones
+
+BOOT_LOG = "echo 'CM-STATUS: OPERATIONAL'; sleep 0.2; echo 'CcspTr069PaSsp started'"
+
+
+def _console(script: str) -> pexpect.spawn:
+    return pexpect.spawn("sh", ["-c", script], encoding="utf-8")
+
+
+def test_boot_milestones_are_timed_in_order() -> None:
+    """Both boot milestones are reached, each with its line and time."""
+    reached: list[str] = []
+    waiter = MilestoneWaiter(
+        _console(BOOT_LOG), boot_milestones(callback=lambda t: reached.append(t.name))
+    )
+
+    timings = waiter.wait(timeout=10)
+
+    assert reached == ["cm_operational", "tr069_started"]
+    assert timings["cm_operational"].line == "CM-STATUS: OPERATIONAL"
+    assert timings["tr069_started"].elapsed > timings["cm_operational"].elapsed
+
+
+def test_closed_console_ends_the_wait() -> None:
+    """The milestones reached before the console closed are returned."""
+    waiter = MilestoneWaiter(
+        _console("echo 'CM-STATUS: OPERATIONAL'"), boot_milestones()
+    )
+
+    timings = waiter.wait(timeout=10)
+
+    assert timings["cm_operational"].reached
+    assert not timings["tr069_started"].reached
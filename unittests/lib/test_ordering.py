@@ -0,0 +1,23 @@
+"""Unit tests of the board cost test ordering."""
+
+from lib.ordering import TRANSITION_COST, TestCost, estimate, order
+
+NONE = TestCost("none")
+REBOOT = TestCost("reboot")
+RESET = TestCost("reset")
+SHARED_RESET = TestCost("reset", "dhcpv6_reset_capture")
+
+
+def test_read_only_tests_run_first_across_the_session() -> None:
+    """Cost decides the order, equal tests keep the collection order."""
+    costs = [REBOOT, NONE, SHARED_RESET, RESET, NONE, SHARED_RESET, REBOOT]
+
+    assert order(costs) == [1, 4, 0, 6, 3, 2, 5]
+
+
+def test_shared_reset_is_counted_once() -> None:
+    """Tests resetting through the same fixture pay for one reset."""
+    transitions, seconds = estimate([SHARED_RESET, NONE, SHARED_RESET, REBOOT])
+
+    assert transitions == len([SHARED_RESET, REBOOT])
+    assert seconds == TRANSITION_COST["reset"] + TRANSITION_COST["reboot"]
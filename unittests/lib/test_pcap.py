@@ -0,0 +1,59 @@
+"""Unit tests of the pcap reader and the TCP reassembler."""
+
+from lib.pcap import TcpReassembler, read_packets, tcp_segment
+from unittests.packets import SYN, pcap, tcp_packet
+
+CPE = ("10.1.0.2", 40000)
+OTHER_CPE = ("10.1.0.3", 40000)
+ACS = ("10.1.0.1", 7547)
+
+
+def _feed(reassembler: TcpReassembler, packet: bytes) -> bytes:
+    segment = tcp_segment(packet)
+    assert segment is not None
+    return reassembler.feed(segment)
+
+
+def test_read_packets_returns_timestamps_and_network_layer() -> None:
+    """The records come back with their timestamp from the IP header on."""
+    packets = [(1000.5, tcp_packet(CPE, ACS, 1, b"a")), (1001.25, b"\x60" + bytes(39))]
+
+    assert list(read_packets(pcap(packets))) == packets
+
+
+def test_reassembles_out_of_order_and_retransmitted_segments() -> None:
+    """Held segments are released in order and resent bytes are dropped."""
+    tcp = TcpReassembler()
+    _feed(tcp, tcp_packet(CPE, ACS, 99, flags=SYN))
+
+    assert _feed(tcp, tcp_packet(CPE, ACS, 105, b"world")) == b""
+    assert _feed(tcp, tcp_packet(CPE, ACS, 100, b"hello")) == b"helloworld"
+    assert _feed(tcp, tcp_packet(CPE, ACS, 100, b"helloworld!")) == b"!"
+
+
+def test_session_ids_are_not_reused_after_a_new_syn() -> None:
+    """A connection reusing a 4-tuple gets an id no other connection had."""
+    tcp = TcpReassembler()
+    _feed(tcp, tcp_packet(CPE, ACS, 0, flags=SYN))
+    first = tcp.session((CPE, ACS))
+    _feed(tcp, tcp_packet(OTHER_CPE, ACS, 0, flags=SYN))
+    other = tcp.session((OTHER_CPE, ACS))
+    _feed(tcp, tcp_packet(CPE, ACS, 500, flags=SYN))
+    reused = tcp.session((CPE, ACS))
+
+    assert first != other
+    assert reused not in (first, other)
+    assert tcp.session((ACS, CPE)) == reused
+
+
+def test_gap_never_filled_is_skipped() -> None:
+    """Segments piling up behind a missed segment are released eventually."""
+    tcp = TcpReassembler()
+    _feed(tcp, tcp_packet(CPE, ACS, 0, flags=SYN))
+    received = b""
+    # the segment at seq 1 was not captured
+    for seq in range(2, 2000):
+        received += _feed(tcp, tcp_packet(CPE, ACS, seq, b"x"))
+
+    assert received
+    assert received == b"x" * len(received)
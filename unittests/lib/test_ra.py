@@ -0,0 +1,149 @@
+"""Unit tests of the Router Advertisement decoding, from a pcap and rdisc6."""
+
+import struct
+from ipaddress import IPv6Address, IPv6Network
+
+from lib.ra import RaTrace, parse_rdisc6, router_advertisement
+from unittests.packets import ip_packet, pcap, tcp_packet
+
+ROUTER = "fe80::1"
+ALL_NODES = "ff02::1"
+MAC = "00:10:18:00:00:01"
+MTU = 1400
+PREFIX = IPv6Network("2001:db8:1::/64")
+DNS = IPv6Address("2001:db8::53")
+ROUTER_LIFETIME = 1800
+VALID_LIFETIME = 86400
+PREFERRED_LIFETIME = 14400
+DNS_LIFETIME = 600
+
+RDISC6_OUTPUT = f"""\
+Soliciting ff02::2 (ff02::2) on eth1...
+
+Hop limit                 :           64 (      0x40)
+Stateful address conf.    :           No
+Stateful other conf.      :          Yes
+Mobile home agent         :           No
+Router preference         :       medium
+Neighbor discovery proxy  :           No
+Router lifetime           :         1800 (0x00000708) seconds
+Reachable time            :  unspecified (0x00000000)
+Retransmit time           :  unspecified (0x00000000)
+ Source link-layer address: {MAC}
+ MTU                      :         {MTU} bytes (valid)
+ Prefix                   : {PREFIX}
+  On-link                 :          Yes
+  Autonomous address conf.:          Yes
+  Valid time              :        86400 (0x00015180) seconds
+  Pref. time              :        14400 (0x00003840) seconds
+ Recursive DNS server     : {DNS}
+  DNS server lifetime     :          600 (0x00000258) seconds
+ from {ROUTER}
+"""
+
+
+def _ra_packet(mtu: int | None = MTU, source: str = ROUTER) -> bytes:
+    # Other configuration flag set, medium preference
+    body = struct.pack("!BBHBBHII", 134, 0, 0, 64, 0x40, ROUTER_LIFETIME, 0, 0)
+    body += struct.pack("!BB6s", 1, 1, bytes.fromhex(MAC.replace(":", "")))
+    if mtu is not None:
+        body += struct.pack("!BBHI", 5, 1, 0, mtu)
+    body += struct.pack(
+        "!BBBBIII16s",
+        3,
+        4,
+        PREFIX.prefixlen,
+        0xC0,
+        VALID_LIFETIME,
+        PREFERRED_LIFETIME,
+        0,
+        PREFIX.network_address.packed,
+    )
+    body += struct.pack("!BBHI16s", 25, 3, 0, DNS_LIFETIME, DNS.packed)
+    return ip_packet(source, ALL_NODES, 58, body)
+
+
+def test_decodes_header_and_options() -> None:
+    """Flags, lifetimes and every known option end up in the record."""
+    ra = router_advertisement(1.0, _ra_packet())
+
+    assert ra is not None
+    assert (ra.source, ra.destination) == (ROUTER, ALL_NODES)
+    assert (ra.managed, ra.other, ra.preference) == (False, True, "medium")
+    assert ra.router_lifetime == ROUTER_LIFETIME
+    assert ra.mtu == MTU
+    assert ra.source_link_address == MAC
+    assert len(ra.prefixes) == 1
+    prefix = ra.prefixes[0]
+    assert prefix.prefix == PREFIX
+    assert prefix.on_link
+    assert prefix.autonomous
+    assert (prefix.valid_lifetime, prefix.preferred_lifetime) == (
+        VALID_LIFETIME,
+        PREFERRED_LIFETIME,
+    )
+    assert ra.rdnss == [DNS]
+    assert ra.rdnss_lifetime == DNS_LIFETIME
+
+
+def test_other_packets_are_not_advertisements() -> None:
+    """TCP and other ICMPv6 messages are skipped."""
+    solicitation = ip_packet(ROUTER, "ff02::2", 58, struct.pack("!BBHI", 133, 0, 0, 0))
+
+    assert router_advertisement(1.0, solicitation) is None
+    assert router_advertisement(1.0, tcp_packet((ROUTER, 1), (ALL_NODES, 2), 0)) is None
+
+
+def test_trace_from_pcap_finds_by_mtu_and_time() -> None:
+    """RAs are indexed by MTU and their intervals are per router."""
+    trace = RaTrace.from_pcap(
+        pcap(
+            [
+                (100.0, _ra_packet(mtu=None)),
+                (110.0, _ra_packet()),
+                (115.0, _ra_packet(source="fe80::2")),
+                (130.0, _ra_packet()),
+            ]
+        )
+    )
+
+    assert [ra.timestamp for ra in trace.find(mtu=MTU, source=ROUTER)] == [
+        110.0,
+        130.0,
+    ]
+    assert trace.all_carry_mtu(MTU, after=100.0)
+    assert not trace.all_carry_mtu(MTU)
+    assert trace.intervals(ROUTER) == [10.0, 20.0]
+
+
+def test_parse_rdisc6_matches_the_wire_decode() -> None:
+    """The rdisc6 report gives the same RA fields as the packet."""
+    ra = parse_rdisc6(RDISC6_OUTPUT, 5.0)
+    wire = router_advertisement(5.0, _ra_packet())
+
+    assert ra is not None
+    assert wire is not None
+    assert ra.source == ROUTER
+    assert ra.destination == ""
+    for name in (
+        "hop_limit",
+        "managed",
+        "other",
+        "preference",
+        "router_lifetime",
+        "reachable_time",
+        "retrans_timer",
+        "mtu",
+        "source_link_address",
+        "prefixes",
+        "rdnss",
+        "rdnss_lifetime",
+    ):
+        assert getattr(ra, name) == getattr(wire, name), name
+
+
+def test_parse_rdisc6_without_answer() -> None:
+    """No RA is built when rdisc6 timed out."""
+    output = "Soliciting ff02::2 (ff02::2) on eth1...\nTimed out.\nNo response.\n"
+
+    assert parse_rdisc6(output, 5.0) is None
@@ -0,0 +1,94 @@
+"""Unit tests of the teardown action graph."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from boardfarm3.exceptions import TeardownError
+
+from lib.teardown import TeardownRegistry
+
+# long enough for a second action on the same device to start if it could
+ACTION_TIME = 0.05
+
+
+def _fail() -> None:
+    msg = "boom"
+    raise RuntimeError(msg)
+
+
+def test_dependencies_run_first_and_others_concurrently() -> None:
+    """Declared order holds, unregistered dependencies count as done."""
+    order: list[str] = []
+    both_running = threading.Barrier(2, timeout=5)
+    teardown = TeardownRegistry()
+    teardown.register("restore", lambda: order.append("restore"), "cpe", ["recover"])
+    teardown.register("recover", lambda: order.append("recover"), "cpe", ["missing"])
+    # deadlocks on the barrier unless both run at the same time
+    teardown.register("copy pcap", both_running.wait, "provisioner")
+    teardown.register("copy logs", both_running.wait, "acs")
+
+    teardown.run()
+
+    assert order == ["recover", "restore"]
+    assert not teardown.actions
+
+
+def test_actions_on_one_device_do_not_overlap() -> None:
+    """Only one action at a time works on a device."""
+    active: list[str] = []
+    overlaps: list[list[str]] = []
+
+    def action(name: str) -> None:
+        active.append(name)
+        if len(active) > 1:
+            overlaps.append(list(active))
+        time.sleep(ACTION_TIME)
+        active.remove(name)
+
+    teardown = TeardownRegistry()
+    for name in ("a", "b", "c"):
+        teardown.register(name, lambda name=name: action(name), "cpe")  # type: ignore[misc]
+
+    teardown.run()
+
+    assert not overlaps
+
+
+def test_failure_skips_dependents_transitively() -> None:
+    """Actions behind a failed one are skipped, not reported as a cycle."""
+    ran: list[str] = []
+    teardown = TeardownRegistry()
+    teardown.register("b", _fail)
+    teardown.register("c", lambda: ran.append("c"), after=["a"])
+    teardown.register("a", lambda: ran.append("a"), after=["b"])
+    teardown.register("d", lambda: ran.append("d"))
+
+    with pytest.raises(TeardownError) as error:
+        teardown.run()
+
+    assert ran == ["d"]
+    assert "c: skipped, a failed" in str(error.value)
+    assert "a: skipped, b failed" in str(error.value)
+    assert "cycle" not in str(error.value)
+
+
+def test_cycle_is_reported() -> None:
+    """Actions waiting on each other are skipped as a cycle."""
+    teardown = TeardownRegistry()
+    teardown.register("a", lambda: None, after=["b"])
+    teardown.register("b", lambda: None, after=["a"])
+
+    with pytest.raises(TeardownError, match="a: skipped, dependency cycle"):
+        teardown.run()
+
+
+def test_duplicate_name_is_rejected() -> None:
+    """Names are unique, they are what ``after`` refers to."""
+    teardown = TeardownRegistry()
+    teardown.register("a", lambda: None)
+
+    with pytest.raises(ValueError, match="already registered"):
+        teardown.register("a", lambda: None)
@@ -0,0 +1 @@
+"""Unit tests of the lib.tr069 package."""
@@ -0,0 +1,82 @@
+"""Unit tests of the cached TR-181 data model."""
+
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from lib.tr069.datamodel import CACHE_KEY, load_data_model
+
+NAMES = {
+    "Device.Hosts.Host.1.IPAddress": False,
+    "Device.Hosts.Host.2.IPAddress": False,
+    "Device.DNS.Client.Server.1.Server": True,
+}
+
+
+class _Cache(dict):
+    """Stand-in for the pytest cache."""
+
+    def get(self, key: str, default: Any) -> Any:  # noqa: ANN401
+        """Return the cached value or the default."""
+        return super().get(key, default)
+
+    def set(self, key: str, value: Any) -> None:  # noqa: ANN401
+        """Store a value."""
+        self[key] = value
+
+
+class _ACS:
+    """ACS answering the identity GPV and the data-model GPN."""
+
+    def __init__(self, model_name: str, version: str) -> None:
+        self.identity = {
+            "Device.DeviceInfo.ProductClass": "RDKB",
+            "Device.DeviceInfo.ModelName": model_name,
+            "Device.DeviceInfo.SoftwareVersion": version,
+        }
+        self.gpn_paths: list[str] = []
+
+    def GPV(self, params: list[str], **_: object) -> list[dict[str, str]]:  # pylint: disable=invalid-name
+        """Return the identity parameters."""
+        return [{"key": name, "value": self.identity[name]} for name in params]
+
+    def GPN(self, path: str, **_: object) -> list[dict[str, str]]:  # pylint: disable=invalid-name
+        """Return every name and record the call."""
+        self.gpn_paths.append(path)
+        return [{"key": name, "value": str(flag)} for name, flag in NAMES.items()]
+
+
+BOARD = SimpleNamespace(sw=SimpleNamespace(tr69_cpe_id="A-RDKB-1"))
+
+
+def test_cached_model_keeps_schema_only() -> None:
+    """The cache holds {i} names, a cached model cannot list instances."""
+    cache, acs = _Cache(), _ACS("TG3482", "7.1")
+
+    live = load_data_model(acs, BOARD, cache)
+    cached = load_data_model(acs, BOARD, cache)
+
+    assert acs.gpn_paths == ["Device."]
+    assert list(cache) == [f"{CACHE_KEY}/RDKB-TG3482"]
+    assert live.instances("Device.Hosts.Host.") == [1, 2]
+    assert cached.is_writable("Device.DNS.Client.Server.3.Server")
+    assert "Device.Hosts.Host.{i}.IPAddress" in cached
+    with pytest.raises(ValueError, match="not cached"):
+        cached.instances("Device.Hosts.Host.")
+
+
+def test_cache_entry_per_model_and_version() -> None:
+    """Another model or firmware does not reuse the cached names."""
+    cache = _Cache()
+    load_data_model(_ACS("TG3482", "7.1"), BOARD, cache)
+
+    other_model, other_version = _ACS("CGM4331", "7.1"), _ACS("TG3482", "7.2")
+    load_data_model(other_model, BOARD, cache)
+    load_data_model(other_version, BOARD, cache)
+
+    assert other_model.gpn_paths == other_version.gpn_paths == ["Device."]
+    assert sorted(cache) == [
+        f"{CACHE_KEY}/RDKB-CGM4331",
+        f"{CACHE_KEY}/RDKB-TG3482",
+    ]
@@ -0,0 +1,41 @@
+"""Unit tests of the Inform watcher."""
+
+from types import SimpleNamespace
+
+from lib.tr069.inform import InformWatcher
+from lib.tr069.trace import CwmpRecord
+
+CPE = ("10.1.0.2", 40000)
+OTHER_CPE = ("10.1.0.3", 40000)
+ACS = ("10.1.0.1", 7547)
+
+
+def _record(rpc: str, session: int, serial: str = "") -> CwmpRecord:
+    device_id = {"OUI": "0000BF", "ProductClass": "Unit", "SerialNumber": serial}
+    return CwmpRecord(
+        rpc,
+        10.0 + session,
+        session,
+        CPE if serial == "UNIT0001" else OTHER_CPE,
+        ACS,
+        event_codes=["1 BOOT"] if rpc == "Inform" else [],
+        device_id=device_id if rpc == "Inform" else {},
+    )
+
+
+def test_informs_of_other_cpes_are_ignored() -> None:
+    """Only the boot Inform of the CPE under test is returned."""
+    watcher = InformWatcher(
+        SimpleNamespace(console=None), "acs.pcap", cpe_id="0000BF-Unit-UNIT0001"
+    )
+    watcher.records += [
+        _record("Inform", 1, "UNIT0002"),
+        _record("InformResponse", 1),
+        _record("Inform", 2, "UNIT0001"),
+        _record("InformResponse", 2),
+    ]
+
+    inform = watcher.wait_for_event("1 BOOT", timeout=0, answered=True)
+
+    assert inform is not None
+    assert inform.session == 2  # noqa: PLR2004
@@ -0,0 +1,23 @@
+"""Unit tests of the GPV parameter snapshot."""
+
+from lib.tr069.snapshot import ParameterSnapshot
+
+RESPONSE = [
+    {"key": "Device.Hosts.Host.1.Active", "value": "1", "type": "xsd:boolean"},
+    {"key": "Device.Hosts.Host.1.LeaseTimeRemaining", "value": "-1", "type": "xsd:int"},
+    {"key": "Device.Hosts.Host.1.X_Count", "value": "42", "type": "xsd:unsignedInt"},
+    {"key": "Device.Hosts.Host.1.PhysAddress", "value": "00:11:22:33:44:55"},
+]
+
+
+def test_values_are_converted_by_type() -> None:
+    """Booleans and integers are typed, untyped values stay strings."""
+    host = ParameterSnapshot.from_gpv_response(RESPONSE).subtree(  # type: ignore[arg-type]
+        "Device.Hosts.Host.1."
+    )
+
+    assert host["Active"] is True
+    assert host["LeaseTimeRemaining"] == -1
+    assert host["X_Count"] == 42  # noqa: PLR2004
+    assert host["PhysAddress"] == "00:11:22:33:44:55"
+    assert host.get_type("X_Count") == "xsd:unsignedInt"
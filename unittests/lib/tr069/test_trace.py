@@ -0,0 +1,85 @@
+"""Unit tests of the CWMP record extraction from captured ACS traffic."""
+
+from lib.tr069.cwmp import build_envelope, build_inform, build_inform_response
+from lib.tr069.trace import CwmpTrace
+from unittests.packets import SYN, pcap, tcp_packet
+
+CPE = ("10.1.0.2", 40000)
+ACS = ("10.1.0.1", 7547)
+DEVICE_ID = {
+    "Manufacturer": "Boardfarm",
+    "OUI": "0000BF",
+    "ProductClass": "Unit",
+    "SerialNumber": "UNIT0001",
+}
+# capture time of the segment completing the boot Inform
+BOOT_COMPLETE = 10.2
+
+
+def _inform(event_code: str) -> bytes:
+    return build_envelope(build_inform(DEVICE_ID, [event_code], []), "1")
+
+
+def _boot_then_periodic() -> CwmpTrace:
+    boot, periodic = _inform("1 BOOT"), _inform("2 PERIODIC")
+    response = build_envelope(build_inform_response(), "1")
+    return CwmpTrace.from_pcap(
+        pcap(
+            [
+                (10.0, tcp_packet(CPE, ACS, 0, flags=SYN)),
+                (10.1, tcp_packet(CPE, ACS, 1, boot[:50])),
+                (BOOT_COMPLETE, tcp_packet(CPE, ACS, 51, boot[50:])),
+                (10.3, tcp_packet(ACS, CPE, 1, response)),
+                # a new connection from the same CPE port, never answered
+                (20.0, tcp_packet(CPE, ACS, 1000, flags=SYN)),
+                (20.1, tcp_packet(CPE, ACS, 1001, periodic)),
+            ]
+        )
+    )
+
+
+def test_envelope_split_over_segments_is_recorded_once_complete() -> None:
+    """The Inform is stamped with the time of its last segment."""
+    trace = _boot_then_periodic()
+
+    (boot,) = trace.find("Inform", event_code="1 BOOT")
+    assert boot.timestamp == BOOT_COMPLETE
+    assert boot.device_id["SerialNumber"] == DEVICE_ID["SerialNumber"]
+    assert [record.rpc for record in trace] == ["Inform", "InformResponse", "Inform"]
+
+
+def test_reused_connection_is_a_new_session() -> None:
+    """The InformResponse of the first connection is not credited to the second."""
+    trace = _boot_then_periodic()
+
+    (boot,) = trace.find(event_code="1 BOOT")
+    (periodic,) = trace.find(event_code="2 PERIODIC")
+    assert [record.rpc for record in trace.session(boot.session)] == [
+        "Inform",
+        "InformResponse",
+    ]
+    assert [record.rpc for record in trace.session(periodic.session)] == ["Inform"]
+
+
+def test_find_bisects_the_time_window() -> None:
+    """Only the records strictly inside the window are returned."""
+    trace = _boot_then_periodic()
+
+    assert [record.rpc for record in trace.find(after=BOOT_COMPLETE, before=20.1)] == [
+        "InformResponse"
+    ]
+
+
+def test_envelope_end_tag_split_over_segments() -> None:
+    """An end tag cut by a segment boundary still completes the envelope."""
+    boot = _inform("1 BOOT")
+    chunks = [boot[:40], boot[40:-6], boot[-6:-3], boot[-3:]]
+    packets = [(1.0, tcp_packet(CPE, ACS, 0, flags=SYN))]
+    seq = 1
+    for offset, chunk in enumerate(chunks):
+        packets.append((2.0 + offset, tcp_packet(CPE, ACS, seq, chunk)))
+        seq += len(chunk)
+
+    (record,) = CwmpTrace.from_pcap(pcap(packets))
+    assert record.event_codes == ["1 BOOT"]
+    assert record.timestamp == 1.0 + len(chunks)
@@ -0,0 +1,97 @@
+"""Build packets and pcap files for the unit tests."""
+
+from __future__ import annotations
+
+import io
+import struct
+from ipaddress import IPv4Address, IPv6Address, ip_address
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+SYN = 0x02
+PSH_ACK = 0x18
+# raw IP, the packet starts at the network header
+_LINKTYPE_RAW = 101
+
+
+def ip_packet(src: str, dst: str, protocol: int, payload: bytes) -> bytes:
+    """Prepend an IPv4 or IPv6 header, by the address family, to a payload.
+
+    :param src: source address
+    :type src: str
+    :param dst: destination address
+    :type dst: str
+    :param protocol: IP protocol / next header number
+    :type protocol: int
+    :param payload: transport header and data
+    :type payload: bytes
+    :return: packet bytes from the IP header on
+    :rtype: bytes
+    """
+    source, destination = ip_address(src), ip_address(dst)
+    if isinstance(source, IPv4Address):
+        header = struct.pack(
+            "!BBHHHBBH4s4s",
+            0x45,
+            0,
+            20 + len(payload),
+            0,
+            0,
+            64,
+            protocol,
+            0,
+            source.packed,
+            destination.packed,
+        )
+        return header + payload
+    header = struct.pack("!IHBB", 6 << 28, len(payload), protocol, 255)
+    return (
+        header + IPv6Address(source).packed + IPv6Address(destination).packed + payload
+    )
+
+
+def tcp_packet(  # pylint: disable=too-many-arguments
+    src: tuple[str, int],
+    dst: tuple[str, int],
+    seq: int,
+    payload: bytes = b"",
+    flags: int = PSH_ACK,
+) -> bytes:
+    """Build a TCP packet.
+
+    :param src: source address and port
+    :type src: tuple[str, int]
+    :param dst: destination address and port
+    :type dst: tuple[str, int]
+    :param seq: sequence number of the first payload byte
+    :type seq: int
+    :param payload: TCP payload, defaults to none
+    :type payload: bytes
+    :param flags: TCP flags, defaults to PSH/ACK
+    :type flags: int
+    :return: packet bytes from the IP header on
+    :rtype: bytes
+    """
+    header = struct.pack("!HHIIBBHHH", src[1], dst[1], seq, 0, 5 << 4, flags, 0, 0, 0)
+    return ip_packet(src[0], dst[0], 6, header + payload)
+
+
+def pcap(packets: Iterable[tuple[float, bytes]]) -> io.BytesIO:
+    """Write packets to an in-memory raw IP pcap file.
+
+    :param packets: capture timestamp and bytes of every packet
+    :type packets: Iterable[tuple[float, bytes]]
+    :return: the pcap file, positioned at its start
+    :rtype: io.BytesIO
+    """
+    out = io.BytesIO()
+    out.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, _LINKTYPE_RAW))
+    for timestamp, data in packets:
+        seconds = int(timestamp)
+        micros = round((timestamp - seconds) * 1e6)
+        out.write(struct.pack("<IIII", seconds, micros, len(data), len(data)))
+        out.write(data)
+    out.seek(0)
+    return out